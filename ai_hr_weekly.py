@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+统一命令行入口
+  scrape          抓取36氪/知乎/订阅源（--sources 选择来源）并更新站点
+  curate          添加精选文章并更新站点（--news 用 hr_news_scraper_real 的新闻集更新 ai_hr_weekly.html）
+  render          由存档重新生成数据文件、页面和 feed.xml 并发布，只改写有变化的输出（不联网）
+  validate-links  标记只指向首页的泛链接；--check 时实际请求每个链接
+  export          只导出数据文件（json / search / shards / feed）
+  daemon          常驻运行，按计划抓取各来源
+各子命令在执行时才导入需要的模块：render/export 不加载 requests、bs4 和抓取器，冷启动更快。
+用法：python ai_hr_weekly.py <子命令> [-h]
+"""
+
+import argparse
+import sys
+
+from publish import PAGES
+
+# 与 auto_update_articles.SOURCES 一致（这里不导入抓取器）
+SOURCES = ('36kr', 'zhihu', 'feeds')
+EXPORTS = ('json', 'search', 'shards', 'feed')
+
+
+def run_scraper(scraper, **kwargs):
+    scraper.run(**kwargs)
+    return 0 if scraper.metrics.ok else 1
+
+
+def cmd_scrape(args):
+    from auto_update_articles import RealArticleScraper
+    scraper = RealArticleScraper(profile=args.profile, check_links=args.check_links, dry_run=args.dry_run)
+    return run_scraper(scraper, curated=args.curated, sources=args.sources)
+
+
+def cmd_curate(args):
+    if args.news:
+        from hr_news_scraper_real import RealHRNewsScraper
+        scraper = RealHRNewsScraper(profile=args.profile, check_links=args.check_links, dry_run=args.dry_run)
+        return run_scraper(scraper)
+    from auto_update_articles import RealArticleScraper
+    scraper = RealArticleScraper(profile=args.profile, check_links=args.check_links, dry_run=args.dry_run)
+    return run_scraper(scraper)
+
+
+def open_store(dry_run):
+    """打开存档；试运行时只读打开并复制到内存"""
+    from article_store import ArticleStore
+    return ArticleStore(read_only=dry_run)
+
+
+def cmd_render(args):
+    from build_graph import BUILD_STATUS, site_graph
+    store = open_store(args.dry_run)
+    failed = False
+    try:
+        for page in args.pages:
+            graph = site_graph(store, page, dry_run=args.dry_run)
+            try:
+                results = graph.run()
+            finally:
+                graph.save()
+            for name, status, detail in results:
+                failed |= status == 'failed'
+                tag, label = BUILD_STATUS[status]
+                print(f"  {tag} {name} {label}" + (f"：{detail}" if detail else ''))
+    finally:
+        store.close()
+    return 1 if failed else 0
+
+
+def cmd_validate_links(args):
+    from auto_update_articles import RealArticleScraper
+    # 不是试运行：检查结果要写回链接缓存，下次只复查过期的链接
+    scraper = RealArticleScraper(check_links=args.check)
+    try:
+        scraper.validate_links()
+    finally:
+        report_file = scraper.close()
+    print(f"[INFO] 运行报告: {report_file}")
+    return 0
+
+
+def cmd_export(args):
+    import feeds
+    import search_index
+    import week_shards
+    from week_index import week_label
+    store = open_store(False)
+    try:
+        for kind in args.only or EXPORTS:
+            if kind == 'json':
+                written = store.export_json('hr_news_data.json', force=True)
+                print(f"  {'[OK]' if written else '[SKIP]'} hr_news_data.json" + ('' if written else ' 未变化'))
+            elif kind == 'search':
+                count = search_index.write_index(store)
+                print(f"  [OK] {search_index.INDEX_FILE}：{count} 篇")
+            elif kind == 'shards':
+                written = week_shards.export_shards(store, 'data')
+                print(f"  [OK] data/：改写 {written} 个分片")
+            else:
+                latest = week_shards.latest_week(store)
+                written = feeds.write_feed(store.query(week=latest))
+                print(f"  {'[OK]' if written else '[SKIP]'} {feeds.FEED_FILE}：最新一周 {week_label(latest)}"
+                      + ('' if written else '，未变化'))
+    finally:
+        store.close()
+    return 0
+
+
+def cmd_daemon(args):
+    from auto_update_articles import RealArticleScraper
+    from daemon import UpdateDaemon
+    scraper = RealArticleScraper(profile=args.profile, dry_run=args.dry_run)
+    UpdateDaemon(scraper, port=args.port).run()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ai-hr-weekly', description='AI在HR领域的每周应用 - 站点更新工具')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--dry-run', action='store_true', help='只报告哪些输出会重新生成，不写文件')
+    runner = argparse.ArgumentParser(add_help=False, parents=[common])
+    runner.add_argument('--profile', action='store_true', help='对热点阶段做 cProfile/tracemalloc 采样')
+    runner.add_argument('--check-links', action='store_true', help='更新后检查所有文章链接')
+
+    scrape = commands.add_parser('scrape', parents=[runner], help='抓取来源并更新站点')
+    scrape.add_argument('--sources', nargs='+', choices=SOURCES, default=list(SOURCES), help='要抓取的来源')
+    scrape.add_argument('--curated', action='store_true', help='同时添加精选文章')
+    scrape.set_defaults(func=cmd_scrape)
+
+    curate = commands.add_parser('curate', parents=[runner], help='添加精选文章并更新站点')
+    curate.add_argument('--news', action='store_true', help='使用新闻集（更新 ai_hr_weekly.html）')
+    curate.set_defaults(func=cmd_curate)
+
+    render = commands.add_parser('render', parents=[common], help='由存档重新生成并发布站点')
+    render.add_argument('pages', nargs='*', default=list(PAGES), help='要渲染的页面')
+    render.set_defaults(func=cmd_render)
+
+    links = commands.add_parser('validate-links', help='检查存档中的文章链接')
+    links.add_argument('--check', action='store_true', help='实际请求每个链接（否则只标记泛链接）')
+    links.set_defaults(func=cmd_validate_links)
+
+    export = commands.add_parser('export', help='只导出数据文件')
+    export.add_argument('--only', nargs='+', choices=EXPORTS, help='只导出这几种（默认全部）')
+    export.set_defaults(func=cmd_export)
+
+    daemon = commands.add_parser('daemon', parents=[common], help='常驻运行，按计划抓取')
+    daemon.add_argument('--profile', action='store_true', help='对热点阶段做 cProfile/tracemalloc 采样')
+    daemon.add_argument('--port', type=int, default=8787, help='/healthz 和 /metrics 的端口')
+    daemon.set_defaults(func=cmd_daemon)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
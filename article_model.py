@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的文章记录
+Article：带 __slots__ 的单篇文章，分类/来源/周/日期这类重复很多的字段做字符串驻留（sys.intern），
+  全库只保留一份；同时支持 article['title'] / article.get('title')，现有按字典访问的代码可直接使用，
+  与现有JSON格式（hr_news_data.json 中的字典）可无损互转。
+排序、按周筛选、分类计数等批量操作由存档（article_store 的 SQLite 查询和 time_index()）完成
+"""
+
+import sys
+
+FIELDS = ('title', 'description', 'category', 'source', 'link', 'week', 'date')
+# 低基数字段，在 Article 中驻留
+CODED_FIELDS = ('category', 'source', 'week', 'date')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class Article:
+    """单篇文章；JSON中多出来的字段放在 extra 里，转回字典时原样保留"""
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, title, description='', category='', source='', link='', week='', date='', extra=None):
+        self.title = title
+        self.description = description
+        self.category = _intern(category)
+        self.source = _intern(source)
+        self.link = link
+        self.week = _intern(week)
+        self.date = _intern(date)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {k: v for k, v in data.items() if k not in FIELDS} or None
+        return cls(*(data.get(field) for field in FIELDS), extra=extra)
+
+    def to_dict(self):
+        """转回JSON字典，字段顺序与原格式一致"""
+        data = {field: getattr(self, field) for field in FIELDS}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key, default=None):
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in FIELDS:
+            setattr(self, key, _intern(value) if key in CODED_FIELDS else value)
+        else:
+            self.extra = dict(self.extra or {}, **{key: value})
+
+    def __eq__(self, other):
+        if isinstance(other, Article):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Article({self.title!r}, category={self.category!r}, week={self.week!r})"
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量文章库
+以 key 为主键在SQLite中upsert，保留所有周的数据（文章的周和日期以首次收录为准）；
+网站使用的 hr_news_data.json 只是从库中导出的结果。
+key 通常就是 link：同一链接的标题变了按更正处理，更新那一行。
+多篇文章共用一个网站首页链接时按 (链接, 标题) 区分，key 为链接加标题哈希，发布的 link 仍是原链接。
+周的查询、分组、排序和区间查询都用整数列 iso_week（ISO年*100+周，由 week 文字算出），
+week 文字只是导出给页面的显示字段；touched_weeks 和 weeks() 给出的是 WeekKey（无法识别的周为 None）。
+旧库和导入的旧JSON按日期重算ISO周。
+每周的内容哈希存在 week_digests 表里，只在该周有写入时重算；导出的JSON和搜索索引按周缓存片段（week_outputs），
+没变的周直接拼接缓存，不再重新序列化、切词整个存档
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import textwrap
+import time
+from urllib.parse import quote
+
+from link_checker import is_generic_root
+from site_renderer import write_atomic
+from week_index import TimeIndex, WeekKey, date_week, week_code, week_ordinal
+
+FIELDS = ('title', 'description', 'category', 'source', 'link', 'week', 'date')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    source TEXT,
+    week TEXT,
+    iso_week INTEGER,
+    date TEXT,
+    first_seen REAL,
+    updated_at REAL
+);
+"""
+
+# 旧库先补上 iso_week 列再建索引；按 week 文字建的旧索引不再使用
+INDEXES = """
+DROP INDEX IF EXISTS idx_articles_week_category;
+DROP INDEX IF EXISTS idx_articles_category_week;
+DROP INDEX IF EXISTS idx_articles_iso_week;
+CREATE INDEX IF NOT EXISTS idx_articles_iso_week_category ON articles(iso_week, category);
+CREATE INDEX IF NOT EXISTS idx_articles_category_iso_week ON articles(category, iso_week);
+CREATE INDEX IF NOT EXISTS idx_articles_link ON articles(link);
+"""
+
+# 按周（WeekKey.code）保存的内容哈希和导出片段；片段的 digest 是生成时该周的哈希加上生成代码的版本
+WEEK_CACHE = """
+CREATE TABLE IF NOT EXISTS week_digests (
+    week TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS week_outputs (
+    week TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (week, kind)
+);
+"""
+
+# 已存档的文章只更新内容字段（包括更正的标题）：周和日期保持首次收录时的值
+# （精选文章每次运行都会重新添加，不能把旧文章挪到本周）
+UPSERT = """
+INSERT INTO articles (key, link, title, description, category, source, week, iso_week, date, first_seen, updated_at)
+VALUES (:key, :link, :title, :description, :category, :source, :week, :iso_week, :date, :now, :now)
+ON CONFLICT(key) DO UPDATE SET
+    title = excluded.title,
+    description = excluded.description,
+    category = excluded.category,
+    source = excluded.source,
+    updated_at = excluded.updated_at
+WHERE articles.title IS NOT excluded.title
+   OR articles.description IS NOT excluded.description
+   OR articles.category IS NOT excluded.category
+   OR articles.source IS NOT excluded.source
+"""
+
+# 旧库以 link 为主键：重建成以 key 为主键的表（列顺序与 SCHEMA 一致）
+REKEY = """
+ALTER TABLE articles RENAME TO articles_by_link;
+{schema}
+INSERT OR IGNORE INTO articles
+SELECT article_key(link, title), published_link(link), title, description, category, source,
+       week, iso_week, date, first_seen, updated_at
+FROM articles_by_link;
+DROP TABLE articles_by_link;
+"""
+
+
+def article_key(link, title):
+    """存档主键：普通链接就是链接本身；网站首页链接被多篇文章共用，加上标题哈希区分"""
+    if not is_generic_root(link):
+        return link
+    digest = hashlib.sha1((title or '').encode('utf-8')).hexdigest()[:8]
+    return f"{link}#{digest}"
+
+
+def published_link(link):
+    """去掉旧版本存档写进首页链接的标题哈希片段（#后8位十六进制）"""
+    base, _, fragment = link.partition('#')
+    if len(fragment) == 8 and is_generic_root(base) and all(c in '0123456789abcdef' for c in fragment):
+        return base
+    return link
+
+
+def article_digest(rows):
+    """文章集合的规范化哈希：rows 为按 FIELDS 顺序的元组；去掉首尾空白、None 视为空串、按链接排序，
+    与存档里的插入顺序和首次发现时间无关"""
+    link = FIELDS.index('link')
+    normalized = sorted((tuple((value or '').strip() for value in row) for row in rows),
+                        key=lambda row: (row[link], row))
+    h = hashlib.sha256()
+    for row in normalized:
+        h.update('\x1f'.join(row).encode('utf-8'))
+        h.update(b'\x1e')
+    return h.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(path):
+    """生成代码文件的哈希，作为按周缓存片段的版本：改了生成逻辑，旧片段就不再命中"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def json_fragment(articles):
+    """一周文章在 json.dumps(全部, indent=2) 中的那一段（不含外层方括号和周之间的逗号）"""
+    return ',\n'.join(textwrap.indent(json.dumps(article, ensure_ascii=False, indent=2), '  ')
+                       for article in articles)
+
+
+def legacy_week(week, day):
+    """旧数据的 (周文字, 周序号)：旧的周文字按 (日期 - 1月1日).days // 7 算，与ISO周不一定一致，
+    有日期时按日期重算，没有日期才按周文字"""
+    key = date_week(day)
+    if key is None:
+        return week, week_ordinal(week)
+    return key.label, key.ordinal
+
+
+class ArticleStore:
+    """文章存档，两个脚本共用。
+    read_only=True（--dry-run 用）时只读打开磁盘上的存档并复制到内存，之后的写入都不落盘；
+    存档文件不存在时不创建，而是在内存中从 seed_json 导入"""
+
+    def __init__(self, path='hr_news_archive.db', seed_json='hr_news_data.json', read_only=False):
+        self.path = path
+        if read_only:
+            self.conn = sqlite3.connect(':memory:')
+            if os.path.exists(path):
+                # 先复制再建表和迁移，旧库的迁移也只发生在内存副本上
+                source = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+                try:
+                    source.backup(self.conn)
+                finally:
+                    source.close()
+        else:
+            self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self._rekey()
+        self.conn.executescript(INDEXES)
+        self.conn.executescript(WEEK_CACHE)
+        self._backfill_digests()
+        self.dirty = False
+        self.touched_weeks = set()
+        self._time_index = None
+        # 最近一次 upsert 中标题被更正的文章
+        self.retitled = []
+
+        # 首次使用时导入已发布的JSON，避免丢失历史周
+        if seed_json and os.path.exists(seed_json) and self.count() == 0:
+            with open(seed_json, 'r', encoding='utf-8') as f:
+                articles = json.load(f)
+            self.upsert([dict(article, week=legacy_week(article.get('week'), article.get('date'))[0])
+                         for article in articles])
+
+    def _migrate(self):
+        """旧库没有 iso_week 列：补上并回填，周文字一并按日期改成ISO周"""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(articles)')}
+        if 'iso_week' in columns:
+            return
+        with self.conn:
+            self.conn.execute('ALTER TABLE articles ADD COLUMN iso_week INTEGER')
+            # 一次 UPDATE 扫一遍表；SET 中的 week 都是更新前的值
+            self.conn.create_function('legacy_label', 2, lambda week, day: legacy_week(week, day)[0])
+            self.conn.create_function('legacy_ordinal', 2, lambda week, day: legacy_week(week, day)[1])
+            self.conn.execute('UPDATE articles SET week = legacy_label(week, date), '
+                              'iso_week = legacy_ordinal(week, date)')
+
+    def _rekey(self):
+        """旧库以 link 为主键：改成 key 主键，首页链接按标题区分，发布的 link 去掉旧的哈希片段"""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(articles)')}
+        if 'key' in columns:
+            return
+        self.conn.create_function('article_key', 2, lambda link, title: article_key(published_link(link), title))
+        self.conn.create_function('published_link', 1, published_link)
+        # executescript 自己提交；中途失败时旧表还在 articles_by_link 里
+        self.conn.executescript('BEGIN;' + REKEY.format(schema=SCHEMA) + 'COMMIT;')
+
+    def _refresh_digests(self, weeks):
+        """重算这些周（WeekKey / None）的内容哈希"""
+        for key in weeks:
+            self.conn.execute('INSERT OR REPLACE INTO week_digests (week, digest) VALUES (?, ?)',
+                              (week_code(key), article_digest(self.rows(week=week_code(key)))))
+
+    def _backfill_digests(self):
+        """旧库还没有每周的哈希：补上缺的周（只在第一次打开时扫描这些周）"""
+        stored = {row[0] for row in self.conn.execute('SELECT week FROM week_digests')}
+        missing = [key for key in self.weeks() if week_code(key) not in stored]
+        if missing:
+            with self.conn:
+                self._refresh_digests(missing)
+
+    def count(self):
+        """文章总数"""
+        return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def upsert(self, articles):
+        """按 key（见 article_key）插入或更新，返回 (新增数, 更新数)；内容相同的文章不产生写入。
+        同一链接换了标题按更正处理，记入 self.retitled"""
+        self.retitled = []
+        rows = [dict({field: article.get(field) for field in FIELDS},
+                     key=article_key(article['link'], article.get('title')))
+                for article in articles if article.get('link')]
+        if not rows:
+            return 0, 0
+
+        # 只查本批文章，开销与新文章数量成正比
+        keys = list(dict.fromkeys(row['key'] for row in rows))
+        existing = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            existing.update((key, (WeekKey.from_ordinal(iso_week), title)) for key, iso_week, title in self.conn.execute(
+                f'SELECT key, iso_week, title FROM articles WHERE key IN ({placeholders})', chunk))
+
+        now = time.time()
+        ordinals = {}
+        written = set()
+        inserted = updated = 0
+        with self.conn:
+            for row in rows:
+                known = existing.get(row['key'])
+                week = row['week']
+                if week not in ordinals:
+                    ordinals[week] = week_ordinal(week)
+                before = self.conn.total_changes
+                self.conn.execute(UPSERT, dict(row, iso_week=ordinals[week], now=now))
+                if self.conn.total_changes == before:
+                    continue
+                # 记录受影响的周：更新的文章留在原来的周
+                if known is not None:
+                    if known[1] != row['title']:
+                        self.retitled.append({'link': row['link'], 'archived': known[1], 'title': row['title']})
+                    written.add(known[0])
+                    existing[row['key']] = (known[0], row['title'])
+                    updated += 1
+                else:
+                    key = WeekKey.from_ordinal(ordinals[week])
+                    written.add(key)
+                    existing[row['key']] = (key, row['title'])
+                    inserted += 1
+            self._refresh_digests(written)
+
+        self.touched_weeks |= written
+        if inserted or updated:
+            self.dirty = True
+            self._time_index = None
+        return inserted, updated
+
+    def retitle_report(self):
+        """标题更正的文本行"""
+        return [f"  [TITLE] {c['archived']} -> {c['title']} ({c['link']})" for c in self.retitled]
+
+    def lookup(self, links):
+        """按链接取已存档的文章，返回 {link: 文章}"""
+        links = list(dict.fromkeys(links))
+        found = {}
+        for i in range(0, len(links), 500):
+            chunk = links[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT {', '.join(FIELDS)} FROM articles WHERE link IN ({placeholders})", chunk)
+            found.update((row['link'], dict(row)) for row in rows)
+        return found
+
+    @staticmethod
+    def _week_clause(week):
+        """单周条件：WeekKey、显示文字或 code；无法识别的（如 'unknown'）查 iso_week 为空的文章"""
+        key = WeekKey.parse(week)
+        if key is None:
+            return 'iso_week IS NULL', ()
+        return 'iso_week = ?', (key.ordinal,)
+
+    def rows(self, week=None):
+        """逐行返回 FIELDS 顺序的元组（不建字典），用于计算内容哈希"""
+        sql = f"SELECT {', '.join(FIELDS)} FROM articles"
+        if week is not None:
+            clause, params = self._week_clause(week)
+            return self.conn.execute(f'{sql} WHERE {clause}', params)
+        return self.conn.execute(sql)
+
+    def query(self, week=None, category=None, weeks=None):
+        """按周/分类查询；week 见 _week_clause，weeks 为 (起始周, 结束周) 闭区间，端点是 WeekKey 或显示文字，
+        都按周序号比较。排序最后按 key（唯一）定序：同一次运行的 first_seen 相同，全表和单周查询的顺序必须一致，
+        搜索索引的周内位置才能对上周分片"""
+        clauses, params = [], []
+        if week is not None:
+            clause, week_params = self._week_clause(week)
+            clauses.append(clause)
+            params.extend(week_params)
+        if weeks is not None:
+            start, end = (WeekKey.parse(w) for w in weeks)
+            if start is None or end is None:
+                raise ValueError(f"无法识别的周区间: {weeks!r}")
+            clauses.append('iso_week BETWEEN ? AND ?')
+            params.extend((start.ordinal, end.ordinal))
+        if category is not None:
+            clauses.append('category = ?')
+            params.append(category)
+        where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        sql = f"SELECT {', '.join(FIELDS)} FROM articles {where} ORDER BY iso_week DESC, category DESC, first_seen, key"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def weeks(self):
+        """所有已存档的周（WeekKey），从新到旧；有无法识别周的文章时最后是 None"""
+        return [WeekKey.from_ordinal(r[0]) for r in self.conn.execute(
+            'SELECT DISTINCT iso_week FROM articles ORDER BY iso_week DESC')]
+
+    def time_index(self):
+        """按周分区的计数（一次分组查询，不读文章正文）；结果缓存到下一次有写入的 upsert"""
+        if self._time_index is None:
+            index = TimeIndex()
+            sql = ('SELECT iso_week, category, source, MIN(date), COUNT(*) FROM articles '
+                   'GROUP BY iso_week, category, source')
+            for ordinal, category, source, date, n in self.conn.execute(sql):
+                index.add(WeekKey.from_ordinal(ordinal), category, source, date, n)
+            self._time_index = index
+        return self._time_index
+
+    def digest(self, week=None):
+        """文章内容的规范化哈希（见 article_digest），由 week_digests 合成，不扫描文章表；
+        week 给定时只取那一周"""
+        if week is not None:
+            row = self.conn.execute('SELECT digest FROM week_digests WHERE week = ?',
+                                    (week_code(WeekKey.parse(week)),)).fetchone()
+            return row[0] if row else article_digest(())
+        h = hashlib.sha256()
+        for code, digest in self.conn.execute('SELECT week, digest FROM week_digests ORDER BY week'):
+            h.update(f"{code}:{digest}\n".encode('utf-8'))
+        return h.hexdigest()[:16]
+
+    def week_output(self, week, kind, build, version=''):
+        """按周缓存的导出片段：该周的哈希和 version 都没变时直接返回缓存，
+        否则用 build(该周文章) 重新生成并保存"""
+        code = week_code(WeekKey.parse(week))
+        digest = f"{self.digest(code)}:{version}"
+        row = self.conn.execute('SELECT digest, content FROM week_outputs WHERE week = ? AND kind = ?',
+                                (code, kind)).fetchone()
+        if row and row[0] == digest:
+            return row[1]
+        content = build(self.query(week=code))
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO week_outputs (week, kind, digest, content) VALUES (?, ?, ?, ?)',
+                              (code, kind, digest, content))
+        return content
+
+    def export_json(self, filename='hr_news_data.json', force=False):
+        """导出网站使用的JSON（与 json.dumps(query(), indent=2) 相同）；只重新序列化有变化的周。
+        库没有变化或内容相同时跳过，返回是否写入"""
+        if not (self.dirty or force or not os.path.exists(filename)):
+            return False
+        version = code_version(__file__)
+        parts = [part for part in (self.week_output(key, 'json', json_fragment, version) for key in self.weeks())
+                 if part]
+        written = write_atomic(filename, '[\n' + ',\n'.join(parts) + '\n]' if parts else '[]')
+        self.dirty = False
+        return written
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正文提取和摘要
+正文：基于标准库 HTMLParser，按块级元素切段，统计每段的字数、标点和链接文字占比
+  （readability 的文字密度思路）。链接密集或太短的段落（导航、页脚、相关推荐）不计分，
+  class/id 像评论、侧栏的容器降权，像正文的加权；段落得分累加到父容器（祖父容器记一半），
+  取得分最高的容器里的段落作为正文
+摘要：TextRank —— 句子为节点，两句的词（中文二元组、英文单词）重叠度为边权，迭代求
+  PageRank，取得分最高的几句按原文顺序拼接
+两步都是CPU密集的，批量页面用进程池处理（summarize_pages）；常驻模式整个进程共用一个进程池
+"""
+
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from search_index import tokenize
+
+BLOCK_TAGS = {'html', 'body', 'main', 'article', 'section', 'div', 'p', 'td', 'li', 'ul', 'ol',
+              'blockquote', 'pre', 'dd', 'dl', 'table', 'tr', 'tbody',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'nav', 'header', 'footer',
+             'aside', 'form', 'button', 'select', 'iframe'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'source', 'track', 'wbr'}
+NEGATIVE = re.compile(r'comment|footer|sidebar|side-bar|related|recommend|share|nav|menu|banner|'
+                      r'advert|\bad\b|login|copyright|breadcrumb|tag', re.I)
+POSITIVE = re.compile(r'article|content|post|body|text|main|entry|detail|rich', re.I)
+CLASS_WEIGHT = 25
+MIN_PARAGRAPH = 10       # 少于这么多字的段落不计分
+MAX_LINK_DENSITY = 0.5   # 链接文字占比超过一半的段落视为导航
+_PUNCT = re.compile(r'[，,、；;。！？!?]')
+_SENTENCE_END = re.compile(r'(?<=[。！？!?；;])|(?<=[.])\s+|\n+')
+_SPACE = re.compile(r'[ \t\r\f\v　\xa0]+')
+
+
+class _Node:
+    __slots__ = ('tag', 'parent', 'weight', 'text', 'link_chars', 'score')
+
+    def __init__(self, tag, parent, weight):
+        self.tag = tag
+        self.parent = parent
+        self.weight = weight
+        self.text = []
+        self.link_chars = 0
+        self.score = 0.0
+
+
+class BlockParser(HTMLParser):
+    """把页面切成块级节点，记录每个节点自己的文字（不含子块）和链接文字量"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.nodes = [_Node('root', None, 0)]
+        self.stack = []      # 打开的元素：(标签, 节点下标或 None)
+        self.skipping = 0
+        self.in_link = 0
+
+    def _current(self):
+        for _, index in reversed(self.stack):
+            if index is not None:
+                return index
+        return 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br' and not self.skipping:
+                self.nodes[self._current()].text.append('\n')
+            return
+        index = None
+        if tag in SKIP_TAGS:
+            self.skipping += 1
+        elif tag == 'a':
+            self.in_link += 1
+        elif tag in BLOCK_TAGS:
+            attrs = dict(attrs)
+            names = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+            weight = 0
+            if NEGATIVE.search(names):
+                weight -= CLASS_WEIGHT
+            if POSITIVE.search(names):
+                weight += CLASS_WEIGHT
+            index = len(self.nodes)
+            self.nodes.append(_Node(tag, self._current(), weight))
+        self.stack.append((tag, index))
+
+    def handle_endtag(self, tag):
+        # 容忍未闭合的标签：弹出到最近的同名元素为止
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                for name, _ in self.stack[i:]:
+                    if name in SKIP_TAGS:
+                        self.skipping -= 1
+                    elif name == 'a':
+                        self.in_link -= 1
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self.skipping:
+            return
+        node = self.nodes[self._current()]
+        node.text.append(data)
+        if self.in_link:
+            node.link_chars += len(data.strip())
+
+
+def _clean(parts):
+    return '\n'.join(line.strip() for line in _SPACE.sub(' ', ''.join(parts)).split('\n') if line.strip())
+
+
+def extract_main_text(html):
+    """提取正文（段落间用换行分隔）；找不到像正文的容器时返回空字符串"""
+    parser = BlockParser()
+    parser.feed(html)
+    parser.close()
+    nodes = parser.nodes
+
+    paragraphs = []
+    for index, node in enumerate(nodes):
+        if node.tag in HEADING_TAGS:
+            continue
+        text = _clean(node.text)
+        if len(text) < MIN_PARAGRAPH or node.link_chars / len(text) > MAX_LINK_DENSITY:
+            continue
+        paragraphs.append((index, text))
+        score = 1 + len(_PUNCT.findall(text)) + min(len(text) / 100, 3)
+        parent = node.parent
+        if parent is not None:
+            nodes[parent].score += score
+            grandparent = nodes[parent].parent
+            if grandparent is not None:
+                nodes[grandparent].score += score / 2
+    if not paragraphs:
+        return ''
+
+    candidates = [i for i, node in enumerate(nodes) if node.score > 0]
+    best = max(candidates, key=lambda i: nodes[i].score + nodes[i].weight)
+
+    def inside(index):
+        while index is not None:
+            if index == best:
+                return True
+            index = nodes[index].parent
+        return False
+
+    return '\n'.join(text for index, text in paragraphs if inside(index))
+
+
+def split_sentences(text, min_chars=6):
+    sentences = (s.strip() for s in _SENTENCE_END.split(text))
+    return [s for s in sentences if len(s) >= min_chars]
+
+
+def textrank(sentences, damping=0.85, iterations=50, tolerance=1e-4):
+    """句子的 TextRank 得分；边权为 |A∩B| / (log|A| + log|B|)"""
+    tokens = [set(tokenize(s)) for s in sentences]
+    n = len(sentences)
+    weights = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            overlap = len(tokens[i] & tokens[j])
+            if overlap:
+                norm = math.log(len(tokens[i]) + 1) + math.log(len(tokens[j]) + 1)
+                weights[i][j] = weights[j][i] = overlap / norm
+    out = [sum(row) for row in weights]
+
+    scores = [1.0] * n
+    for _ in range(iterations):
+        new = [(1 - damping) + damping * sum(weights[j][i] / out[j] * scores[j]
+                                             for j in range(n) if weights[j][i])
+               for i in range(n)]
+        delta = max(abs(a - b) for a, b in zip(new, scores))
+        scores = new
+        if delta < tolerance:
+            break
+    return scores
+
+
+def summarize(text, max_sentences=2, max_chars=120, max_input=80):
+    """抽取式摘要：得分最高的句子按原文顺序拼接，截断到 max_chars 字；只看前 max_input 句"""
+    sentences = split_sentences(text)[:max_input]
+    if not sentences:
+        return ''
+    scores = textrank(sentences)
+    top = sorted(sorted(range(len(sentences)), key=lambda i: -scores[i])[:max_sentences])
+    summary = ''.join(sentences[i] for i in top)
+    return summary if len(summary) <= max_chars else summary[:max_chars - 1] + '…'
+
+
+def summarize_page(html):
+    """一个页面：提取正文并生成摘要，返回 (正文字数, 摘要)"""
+    text = extract_main_text(html)
+    return len(text), summarize(text)
+
+
+def summarize_pages(pages, max_workers=None, inline_below=4, pool=None):
+    """批量处理页面，按输入顺序返回 [(正文字数, 摘要)]。
+
+    页面分批（chunksize）发给进程池，每个工作进程一次处理一批，减少进程间往返；
+    页面很少时直接在当前进程处理，省掉启动进程池的开销。
+    pool 为调用方持有的进程池（常驻模式各轮复用，见 SummaryPool）；不传时临时建一个，用完关闭。
+    """
+    pages = list(pages)
+    workers = (pool.max_workers if pool is not None else max_workers) or os.cpu_count() or 1
+    if workers == 1 or len(pages) < inline_below:
+        return [summarize_page(html) for html in pages]
+    chunksize = max(1, math.ceil(len(pages) / (workers * 4)))
+    if pool is not None:
+        return list(pool.executor().map(summarize_page, pages, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(summarize_page, pages, chunksize=chunksize))
+
+
+class SummaryPool:
+    """常驻进程共用的摘要进程池：第一次需要时才启动工作进程，之后各轮复用，close() 时关闭"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -2,139 +2,347 @@
 # -*- coding: utf-8 -*-
 """
 AI+HR真实文章自动抓取器
-从真实网站抓取AI在HR领域的应用文章
+从真实网站抓取AI在HR领域的应用文章。
+requests、摘要和相关度打分等较重的模块在第一次联网/打分时才导入，只加精选文章时不加载
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-from datetime import datetime
-import time
-import re
+import argparse
+import io
+from urllib.parse import urljoin, urlsplit
+
+from article_model import Article
+from article_store import ArticleStore
+from build_graph import BUILD_STATUS, site_graph
+from classifier import default_classifier
+from dedup import Deduplicator
+from feeds import FeedState, iter_entries
+from host_health import CircuitOpenError, HostHealth
+from html_extract import extract_links
+from http_cache import HTTPCache
+from link_checker import LinkChecker, flag_links
+from run_metrics import RunMetrics
+from week_index import week_info
+
+# 搜索页只有标题，正文摘要生成之前先用的占位描述
+DESC_36KR = '探讨AI技术在人力资源领域的创新应用和实践案例'
+DESC_ZHIHU = '分享AI技术在HR领域的应用经验和见解'
+DESC_FEED = '来自订阅源的AI+HR相关文章'
+PLACEHOLDERS = {DESC_36KR, DESC_ZHIHU, DESC_FEED}
+# 订阅源摘要超过这个长度时用抽取式摘要压缩
+MAX_DESCRIPTION = 120
+
+# RSS/Atom 订阅源：比抓搜索页便宜得多，也不依赖页面结构
+FEEDS = [
+    ('36氪 RSS', 'https://36kr.com/feed'),
+    ('HR Dive', 'https://www.hrdive.com/feeds/news/'),
+]
+
+# 每个搜索页最多取的候选数；按相关度打分后每个 (来源, 周, 分类) 只保留 TOP_K 篇
+MAX_CANDIDATES = 30
+TOP_K = 3
+# 指标里的来源标签
+SOURCE_LABELS = {'36氪': '36kr', '知乎': 'zhihu'}
+
+# 可抓取的来源（scrape 的 sources 参数）
+SOURCES = ('36kr', 'zhihu', 'feeds')
+
 
 class RealArticleScraper:
-    def __init__(self):
+    def __init__(self, profile=False, report_dir='reports', check_links=False, dry_run=False):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9',
         }
         self.articles = []
+        self.candidates = []  # 本次从搜索页解析出的候选，等待按相关度筛选
+        self.scraped = []  # 筛选后保留的新文章，等待抓正文生成摘要
+        # --dry-run：在存档的内存副本上运行，只报告哪些输出会变化，不写任何生成的文件；
+        # 缓存、主机健康和链接缓存只读，运行报告照常写到 report_dir
+        self.dry_run = dry_run
+        self.store = ArticleStore(read_only=dry_run)
+        self.classifier = default_classifier
+        self.scorer = None  # 第一次打分时创建，之后复用
+        self.summary_pool = None  # 常驻模式由 UpdateDaemon 提供、各轮共用的摘要进程池
+        self.dedup = Deduplicator(self.store, placeholders=PLACEHOLDERS)
+        # 搜索页每周变化不大，36氪/知乎在1小时内直接用缓存，超时后发条件请求
+        self.cache = HTTPCache(ttl_overrides={'www.36kr.com': 3600, 'www.zhihu.com': 3600}, read_only=dry_run)
+        # 各阶段耗时、请求和过滤计数，运行结束写到 report_dir（JSON + Prometheus）
+        self.metrics = RunMetrics('auto_update', profile=profile)
+        self.report_dir = report_dir
+        # 被封或故障的来源连续失败后熔断，冷却期内（跨运行）直接跳过
+        self.health = HostHealth(read_only=dry_run)
+        self._fetcher = None
+        # 链接检查要请求每篇文章的链接，默认关闭（--check-links 打开）；泛链接标记总会做
+        self.check_links = check_links
+        # 各订阅源上次读到的最新条目时间，只取之后发布的条目
+        self.feed_state = FeedState()
+
+    @property
+    def fetcher(self):
+        """抓取引擎（连接池）在第一次联网时才创建"""
+        if self._fetcher is None:
+            from fetch_engine import FetchEngine
+            self._fetcher = FetchEngine(headers=self.headers, cache=self.cache, metrics=self.metrics,
+                                        health=self.health)
+        return self._fetcher
 
     def get_week_info(self):
-        """获取当前周信息"""
-        now = datetime.now()
-        start = datetime(now.year, 1, 1)
-        diff = (now - start).days
-        week_num = diff // 7 + 1
-        return f"{now.year}年第{week_num}周", now.strftime('%Y年%m月%d日')
+        """获取当前周信息（ISO周，与 hr_news_scraper_real 相同）"""
+        return week_info()
 
     def categorize(self, title, desc=''):
-        """智能分类"""
-        content = (title + ' ' + desc).lower()
-
-        if any(kw in content for kw in ['薪酬', '福利', '绩效', '激励', '工资']):
-            return '薪酬福利'
-        elif any(kw in content for kw in ['招聘', '面试', '人才', '培训', '学习', '离职', '继任']):
-            return '人才发展'
-        elif any(kw in content for kw in ['组织', '架构', '变革', '效能', 'od']):
-            return '组织发展'
-        elif any(kw in content for kw in ['文化', '价值观', '员工体验', '雇主品牌']):
-            return '企业文化'
-        elif any(kw in content for kw in ['ssc', '共享服务', 'rpa', '自动化', '流程']):
-            return 'SSC'
-        else:
-            return '人才发展'
+        """智能分类（关键词表见 classifier.CATEGORY_KEYWORDS）"""
+        return self.classifier.categorize(title, desc)
+
+    def targets_36kr(self):
+        """36氪搜索目标"""
+        search_terms = ['人工智能 HR', 'AI 人力资源', 'ChatGPT HR']
+        return [(f"搜索'{term}'", f"https://www.36kr.com/search/articles/{term}", self.parse_36kr)
+                for term in search_terms]
+
+    def targets_zhihu(self):
+        """知乎搜索目标"""
+        return [('知乎搜索', "https://www.zhihu.com/search?q=AI+HR+人力资源", self.parse_zhihu)]
+
+    def targets_feeds(self):
+        """RSS/Atom 订阅源目标"""
+        return [(label, url, self.parse_feed) for label, url in FEEDS]
+
+    def fetch_and_parse(self, targets):
+        """并发抓取所有目标，再逐个解析；返回抓取或解析失败的URL"""
+        failed = []
+        with self.metrics.span('fetch'):
+            results = self.fetcher.fetch_all([url for _, url, _ in targets])
+        for (label, _, parse), (url, response, error) in zip(targets, results):
+            source = urlsplit(url).netloc
+            if isinstance(error, CircuitOpenError):
+                self.metrics.inc('fetch_skipped_total', source=source)
+                print(f"  [SKIP] {label}: {error}")
+                failed.append(url)
+                continue
+            if error is not None:
+                self.metrics.inc('fetch_failures_total', source=source)
+                print(f"  [FAIL] {label}失败: {error}")
+                failed.append(url)
+                continue
+            if response.status_code == 200:
+                try:
+                    with self.metrics.span('parse', hot=True, source=source):
+                        parse(url, response)
+                except Exception as e:
+                    self.metrics.inc('parse_failures_total', source=source)
+                    print(f"  [FAIL] 解析{label}失败: {e}")
+                    failed.append(url)
+            else:
+                print(f"  [FAIL] {label}返回 {response.status_code}")
+                failed.append(url)
+        self.select_relevant()
+        self.summarize_articles()
+        return failed
+
+    def select_relevant(self):
+        """所有候选一起按标题和描述打分（占位描述不参与），每个 (来源, 周, 分类) 保留得分最高的 TOP_K 篇"""
+        candidates, self.candidates = self.candidates, []
+        if not candidates:
+            return
+        from relevance import RelevanceScorer, top_k
+        if self.scorer is None:
+            self.scorer = RelevanceScorer(self.classifier)
+        with self.metrics.span('score', hot=True):
+            scores, _ = self.scorer.score([article['title'] for article in candidates],
+                                          ['' if article['description'] in PLACEHOLDERS else article['description']
+                                           for article in candidates])
+            keep = top_k(candidates, scores, TOP_K,
+                         group=lambda article: (article['source'], article['week'], article['category']))
+        for i in sorted(keep):
+            article = candidates[i]
+            self.articles.append(article)
+            self.scraped.append(article)
+            source = SOURCE_LABELS.get(article['source'], article['source'])
+            self.metrics.inc('articles_accepted_total', source=source)
+            print(f"  [OK] 找到: {article['title'][:30]}... (相关度 {scores[i]:.1f})")
+        self.metrics.inc('candidates_dropped_total', len(candidates) - len(keep))
+        print(f"  [OK] 候选 {len(candidates)} 篇，按相关度保留 {len(keep)} 篇")
+
+    def summarize_articles(self):
+        """抓取新文章的正文页，用抽取式摘要替换占位描述，并按标题+摘要重新分类"""
+        scraped, self.scraped = self.scraped, []
+        archived = self.store.lookup(article['link'] for article in scraped)
+        pending = []
+        for article in scraped:
+            known = archived.get(article['link'])
+            if article['description'] not in PLACEHOLDERS:
+                # 订阅源自带摘要，不用再抓正文
+                continue
+            if known and known['description'] not in PLACEHOLDERS:
+                # 存档里已有摘要，沿用，不再抓正文
+                article['description'] = known['description']
+                article['category'] = known['category']
+            else:
+                pending.append(article)
+        if not pending:
+            return
+        from article_summary import summarize_pages
+
+        print(f"\n[*] Summarizing {len(pending)} articles...")
+        with self.metrics.span('fetch_body'):
+            results = self.fetcher.fetch_all([article['link'] for article in pending])
+        cache = self.fetcher.cache
+        summaries, pages, targets = {}, [], []
+        for article, (url, response, error) in zip(pending, results):
+            if error is not None or response.status_code != 200:
+                self.metrics.inc('body_fetch_failures_total', source=urlsplit(url).netloc)
+                print(f"  [FAIL] 正文抓取失败: {article['title'][:30]}")
+                continue
+            # 未变化的正文页直接复用上次的摘要
+            from_cache = cache is not None and getattr(response, 'from_cache', False)
+            derived = cache.get_derived(url) if from_cache else None
+            if derived is not None:
+                summaries[url] = derived
+            else:
+                pages.append(response.text)
+                targets.append(url)
+
+        # 正文提取和TextRank是CPU密集的，批量交给进程池
+        with self.metrics.span('summarize', hot=True):
+            for url, (_, summary) in zip(targets, summarize_pages(pages, pool=self.summary_pool)):
+                summaries[url] = summary
+                if cache is not None:
+                    cache.set_derived(url, summary)
+
+        done = 0
+        for article in pending:
+            summary = summaries.get(article['link'])
+            if summary:
+                article['description'] = summary
+                article['category'] = self.categorize(article['title'], summary)
+                done += 1
+        self.metrics.inc('articles_summarized_total', done)
+        print(f"  [OK] 生成摘要 {done}/{len(pending)} 篇，解析正文页 {len(pages)} 个")
+
+    def cached_extract(self, url, response, extract):
+        """未变化的页面（缓存命中或304）直接复用上次的解析结果"""
+        cache = self.fetcher.cache
+        if cache is not None and getattr(response, 'from_cache', False):
+            candidates = cache.get_derived(url)
+            if candidates is not None:
+                return candidates
+        candidates = extract(response.text)
+        if cache is not None:
+            cache.set_derived(url, candidates)
+        return candidates
+
+    def extract_36kr(self, html):
+        """从36氪搜索结果页提取 [标题, 链接] 候选，够 MAX_CANDIDATES 个就停止解析"""
+        def accept(title, href):
+            if title and len(title) > 10 and ('ai' in title.lower() or '人工智能' in title):
+                if not href.startswith('http'):
+                    href = 'https://www.36kr.com' + href
+                return [title, href]
+            self.metrics.inc('titles_rejected_total', source='36kr')
+
+        return extract_links(html, accept, limit=MAX_CANDIDATES, tags=('a',))
+
+    def parse_36kr(self, url, response):
+        """解析36氪搜索结果页"""
+        week, date = self.get_week_info()
+
+        for title, href in self.cached_extract(url, response, self.extract_36kr):
+            self.candidates.append(Article(
+                title=title,
+                description=DESC_36KR,
+                category=self.categorize(title),
+                source='36氪',
+                link=href,
+                week=week,
+                date=date
+            ))
+            self.metrics.inc('candidates_total', source='36kr')
+
+    def extract_zhihu(self, html):
+        """从知乎搜索结果页的标题和链接中提取 [标题, 链接] 候选，够 MAX_CANDIDATES 个就停止解析"""
+        def accept(title, href):
+            if title and len(title) > 15 and any(kw in title for kw in ['AI', '人工智能', 'HR', '人力资源']):
+                if not href.startswith('http'):
+                    href = 'https://www.zhihu.com' + href
+                return [title, href]
+            self.metrics.inc('titles_rejected_total', source='zhihu')
+
+        return extract_links(html, accept, limit=MAX_CANDIDATES, tags=('h2', 'a'))
+
+    def parse_zhihu(self, url, response):
+        """解析知乎搜索结果页"""
+        week, date = self.get_week_info()
+
+        for title, href in self.cached_extract(url, response, self.extract_zhihu):
+            self.candidates.append(Article(
+                title=title,
+                description=DESC_ZHIHU,
+                category=self.categorize(title),
+                source='知乎',
+                link=href,
+                week=week,
+                date=date
+            ))
+            self.metrics.inc('candidates_total', source='zhihu')
+
+    def parse_feed(self, url, response):
+        """解析RSS/Atom订阅源，只取上次运行之后发布的AI相关条目"""
+        from article_summary import summarize
+        week, date = self.get_week_info()
+        source = urlsplit(url).netloc
+        newest = oldest = None
+        count = 0
+        for entry in iter_entries(io.BytesIO(response.content), since=self.feed_state.since(url),
+                                  limit=MAX_CANDIDATES):
+            count += 1
+            published = entry['published']
+            if published is not None:
+                newest = published if newest is None else max(newest, published)
+                oldest = published if oldest is None else min(oldest, published)
+            title, text = entry['title'], entry['summary']
+            if not self.classifier.is_ai_related(title + ' ' + text):
+                self.metrics.inc('titles_rejected_total', source=source)
+                continue
+            description = summarize(text) if len(text) > MAX_DESCRIPTION else text
+            self.candidates.append(Article(
+                title=title,
+                description=description or DESC_FEED,
+                category=self.categorize(title, description),
+                source=entry['source'] or source,
+                link=urljoin(url, entry['link']),
+                week=week,
+                date=date
+            ))
+            self.metrics.inc('candidates_total', source=source)
+        # 读满上限时订阅源里可能还有没读到的新条目，水位不能直接推进到最新
+        self.feed_state.update(url, newest, oldest, truncated=count >= MAX_CANDIDATES)
 
     def scrape_36kr(self):
         """抓取36氪HR相关文章"""
         print("\n[*] Searching 36kr...")
-        try:
-            # 36氪搜索页面
-            search_terms = ['人工智能 HR', 'AI 人力资源', 'ChatGPT HR']
-
-            for term in search_terms:
-                try:
-                    url = f"https://www.36kr.com/search/articles/{term}"
-                    response = requests.get(url, headers=self.headers, timeout=10)
-
-                    if response.status_code == 200:
-                        # 简单提取（36氪可能需要更复杂的解析）
-                        soup = BeautifulSoup(response.text, 'html.parser')
-
-                        # 尝试查找文章链接
-                        links = soup.find_all('a', href=True)
-                        week, date = self.get_week_info()
-
-                        for link in links[:3]:  # 只取前3个
-                            title = link.get_text().strip()
-                            href = link['href']
-
-                            if title and len(title) > 10 and ('ai' in title.lower() or '人工智能' in title):
-                                if not href.startswith('http'):
-                                    href = 'https://www.36kr.com' + href
-
-                                self.articles.append({
-                                    'title': title,
-                                    'description': '探讨AI技术在人力资源领域的创新应用和实践案例',
-                                    'category': self.categorize(title),
-                                    'source': '36氪',
-                                    'link': href,
-                                    'week': week,
-                                    'date': date
-                                })
-                                print(f"  [OK] 找到: {title[:30]}...")
-
-                        time.sleep(2)
-                except Exception as e:
-                    print(f"  [FAIL] 搜索'{term}'失败: {e}")
-                    continue
-
-        except Exception as e:
-            print(f"  [FAIL] 抓取失败: {e}")
+        self.fetch_and_parse(self.targets_36kr())
 
     def scrape_zhihu(self):
         """尝试抓取知乎相关内容"""
         print("\n[*] Searching Zhihu...")
-        try:
-            search_url = "https://www.zhihu.com/search?q=AI+HR+人力资源"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+        self.fetch_and_parse(self.targets_zhihu())
 
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                week, date = self.get_week_info()
-
-                # 查找标题
-                titles = soup.find_all(['h2', 'a'], limit=20)
-                count = 0
-
-                for elem in titles:
-                    if count >= 3:
-                        break
-
-                    title = elem.get_text().strip()
-                    link_elem = elem if elem.name == 'a' else elem.find('a')
-
-                    if link_elem and link_elem.get('href'):
-                        href = link_elem['href']
-                        if not href.startswith('http'):
-                            href = 'https://www.zhihu.com' + href
-
-                        if title and len(title) > 15 and any(kw in title for kw in ['AI', '人工智能', 'HR', '人力资源']):
-                            self.articles.append({
-                                'title': title,
-                                'description': '分享AI技术在HR领域的应用经验和见解',
-                                'category': self.categorize(title),
-                                'source': '知乎',
-                                'link': href,
-                                'week': week,
-                                'date': date
-                            })
-                            print(f"  [OK] 找到: {title[:30]}...")
-                            count += 1
-
-        except Exception as e:
-            print(f"  [FAIL] 抓取失败: {e}")
+    def scrape_feeds(self):
+        """读取RSS/Atom订阅源"""
+        print("\n[*] Reading feeds...")
+        self.fetch_and_parse(self.targets_feeds())
+
+    def scrape(self, sources=SOURCES):
+        """选中的来源一起并发抓取，耗时约等于最慢的一个请求"""
+        targets = {'36kr': self.targets_36kr, 'zhihu': self.targets_zhihu, 'feeds': self.targets_feeds}
+        print(f"\n[*] Searching {' + '.join(sources)}...")
+        return self.fetch_and_parse([target for name in sources for target in targets[name]()])
+
+    def scrape_all(self):
+        """所有来源一起并发抓取"""
+        return self.scrape(SOURCES)
 
     def add_curated_articles(self):
         """添加精选的真实文章（手动策划的高质量内容）"""
@@ -252,61 +460,140 @@ class RealArticleScraper:
             }
         ]
 
-        self.articles.extend(curated)
+        self.articles.extend(Article.from_dict(item) for item in curated)
+        self.metrics.inc('articles_accepted_total', len(curated), source='curated')
         print(f"  [OK] 已添加 {len(curated)} 篇精选文章")
 
     def save_and_update(self):
         """保存数据并更新HTML"""
         print("\n[*] Saving data...")
 
-        # 保存JSON
-        with open('hr_news_data.json', 'w', encoding='utf-8') as f:
-            json.dump(self.articles, f, ensure_ascii=False, indent=2)
-        print(f"  [OK] 已保存 {len(self.articles)} 篇文章到 hr_news_data.json")
-
-        # 更新HTML文件中的嵌入数据
+        # 近似重复的文章（换了链接的同一篇报道）先并入已有文章
+        with self.metrics.span('dedup'):
+            self.articles, duplicates = self.dedup.filter(self.articles)
+        self.metrics.inc('duplicates_merged_total', len(duplicates))
+        if duplicates:
+            print(f"  [OK] 去重合并 {len(duplicates)} 篇:")
+            for line in self.dedup.report(duplicates):
+                print(line)
+
+        # 增量写入存档
+        with self.metrics.span('save', hot=True):
+            inserted, updated = self.store.upsert(self.articles)
+            self.dedup.add(self.articles)
+        print(f"  [OK] 新增 {inserted} 篇，更新 {updated} 篇，存档共 {self.store.count()} 篇")
+        self.metrics.inc('articles_inserted_total', inserted)
+        self.metrics.inc('articles_updated_total', updated)
+        if self.store.retitled:
+            print(f"  [INFO] 更正了 {len(self.store.retitled)} 篇的标题:")
+            for line in self.store.retitle_report():
+                print(line)
+        self.metrics.inc('articles_retitled_total', len(self.store.retitled))
+
+        # 由存档生成JSON、搜索索引、周分片和页面并发布；只重新生成输入有变化的输出
+        graph = site_graph(self.store, 'index.html', dry_run=self.dry_run, metrics=self.metrics)
         try:
-            with open('index.html', 'r', encoding='utf-8') as f:
-                html_content = f.read()
-
-            # 替换 defaultData
-            data_str = json.dumps(self.articles, ensure_ascii=False, indent=10)
-            pattern = r'const defaultData = \[.*?\];'
-            new_data = f'const defaultData = {data_str};'
-
-            new_html = re.sub(pattern, new_data, html_content, flags=re.DOTALL)
-
-            with open('index.html', 'w', encoding='utf-8') as f:
-                f.write(new_html)
-
-            print("  [OK] 已更新 index.html")
-
-        except Exception as e:
-            print(f"  [WARN] 更新HTML失败: {e}")
+            results = graph.run()
+        finally:
+            graph.save()
+        for name, status, detail in results:
+            if status == 'failed':
+                self.metrics.fail()
+            tag, label = BUILD_STATUS[status]
+            print(f"  {tag} {name} {label}" + (f"：{detail}" if detail else ''))
+
+    def validate_links(self):
+        """检查存档中的文章链接，失效、不通和只指向网站首页的写入运行报告"""
+        articles = self.store.query()
+        results = None
+        if self.check_links:
+            print("\n[*] Checking links...")
+            checker = LinkChecker(headers=self.headers, metrics=self.metrics, read_only=self.dry_run)
+            try:
+                with self.metrics.span('links'):
+                    results = checker.check_all(article['link'] for article in articles)
+            finally:
+                checker.close()
+            print(f"  {checker.summary()}")
+
+        flagged = flag_links(articles, results)
+        self.metrics.attach('links', flagged)
+        labels = {'generic': '泛链接（网站首页）', 'dead': '失效链接',
+                  'unreachable': '无法访问', 'redirected_to_root': '被重定向到首页'}
+        for reason, items in flagged.items():
+            self.metrics.inc('links_flagged_total', len(items), reason=reason)
+            if items:
+                print(f"  [WARN] {labels[reason]} {len(items)} 篇:")
+                for item in items[:5]:
+                    status = f" ({item['status']})" if item.get('status') else ''
+                    print(f"    {item['title'][:30]} -> {item['link']}{status}")
+                if len(items) > 5:
+                    print(f"    ... 另有 {len(items) - 5} 篇，见运行报告")
+
+    def close(self):
+        """关闭连接和存档，写出运行报告，返回报告路径"""
+        if self._fetcher is not None:
+            self._fetcher.close()
+        else:
+            self.cache.save()
+            self.health.save()
+        self.store.close()
+        return self.metrics.write(self.report_dir)
 
-    def run(self):
-        """运行爬虫"""
+    def run(self, curated=True, sources=()):
+        """运行爬虫：curated 添加精选文章，sources 为要抓取的来源（见 SOURCES）"""
         print("="*60)
         print("AI+HR Article Auto-Updater")
         print("="*60)
 
-        # 添加精选文章（这些是真实存在的HR网站链接）
-        self.add_curated_articles()
-
-        # 尝试抓取更多文章（可能会失败，因为网站可能有反爬虫）
-        # self.scrape_36kr()
-        # self.scrape_zhihu()
-
-        # 保存并更新
-        self.save_and_update()
+        try:
+            # 添加精选文章（这些是真实存在的HR网站链接）
+            if curated:
+                self.add_curated_articles()
+
+            # 抓取更多文章（可能会失败，因为网站可能有反爬虫）；默认只用精选文章
+            if sources:
+                self.scrape(sources)
+
+            # 保存并更新
+            self.save_and_update()
+            if not self.dry_run:
+                self.feed_state.save()
+            self.validate_links()
+        except Exception:
+            self.metrics.fail()
+            raise
+        finally:
+            report_file = self.close()
 
         print("\n" + "="*60)
-        print("[DONE] Website updated successfully!")
+        if self.dry_run:
+            print("[DONE] Dry run finished, only the run report was written")
+        elif not self.metrics.ok:
+            print("[DONE] Finished with errors, some outputs were not updated (see the run report)")
+        else:
+            print("[DONE] Website updated successfully!")
         print(f"[INFO] Total articles: {len(self.articles)}")
+        print(self.cache.report())
+        print(self.health.report())
+        print(self.metrics.summary())
+        print(f"[INFO] 运行报告: {report_file}")
         print("[INFO] You can now visit your website to see the updates")
         print("="*60)
 
 
 if __name__ == '__main__':
-    scraper = RealArticleScraper()
-    scraper.run()
+    parser = argparse.ArgumentParser(description='AI+HR Article Auto-Updater')
+    parser.add_argument('--dry-run', action='store_true', help='只报告哪些输出会重新生成，不写文件')
+    parser.add_argument('--check-links', action='store_true', help='检查所有文章链接（会请求每个外部站点）')
+    parser.add_argument('--profile', action='store_true', help='对热点阶段做 cProfile/tracemalloc 采样')
+    parser.add_argument('--daemon', action='store_true', help='常驻运行，按计划抓取各来源并增量更新')
+    parser.add_argument('--port', type=int, default=8787, help='常驻模式下 /healthz 和 /metrics 的端口')
+    args = parser.parse_args()
+
+    scraper = RealArticleScraper(profile=args.profile, check_links=args.check_links, dry_run=args.dry_run)
+    if args.daemon:
+        from daemon import UpdateDaemon
+        UpdateDaemon(scraper, port=args.port).run()
+    else:
+        scraper.run()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章内存基准：普通字典列表 vs Article(__slots__ + 驻留) 列表
+从 corpus.py 缓存的JSON语料构建（与读取 hr_news_data.json 的方式相同），每种表示在独立子进程中运行，
+记录构建后保留的内存（tracemalloc）、构建峰值，以及排序、按周筛选、分类计数的耗时。
+用法：python benchmarks/bench_articles.py [文章数，默认1000000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_model import Article  # noqa: E402
+from corpus import CACHE_DIR, load_articles  # noqa: E402
+from week_index import sort_key  # noqa: E402
+
+IMPLS = ['dict', 'slots']
+
+
+def build(impl, path):
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    if impl == 'dict':
+        return raw
+    return [Article.from_dict(item) for item in raw]
+
+
+def operations(impl, data):
+    """与存档相同的排序（周、分类降序）、取最新一周、分类计数"""
+    timings = {}
+    start = time.perf_counter()
+    order = sorted(data, key=lambda a: (sort_key(a['week']), a['category']), reverse=True)
+    timings['sort'] = time.perf_counter() - start
+
+    latest = order[0]['week']
+    start = time.perf_counter()
+    week = [a for a in data if a['week'] == latest]
+    timings['filter_week'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counts = Counter(a['category'] for a in data)
+    timings['category_counts'] = time.perf_counter() - start
+    return timings, len(week), sum(counts.values())
+
+
+def run_one(impl, n):
+    load_articles(n)  # 确保缓存存在，生成过程不计入
+    path = os.path.join(CACHE_DIR, f"articles-{n}-42.json")
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build(impl, path)
+    build_seconds = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings, week_count, total = operations(impl, data)
+    return {
+        'impl': impl,
+        'n': n,
+        'retained_mb': round(current / 1024 / 1024, 1),
+        'peak_mb': round(peak / 1024 / 1024, 1),
+        'bytes_per_article': round(current / n),
+        'build_seconds': round(build_seconds, 2),
+        **{k: round(v, 3) for k, v in timings.items()},
+        'week_items': week_count,
+        'counted': total,
+    }
+
+
+def check_roundtrip(n=2000):
+    """转换必须无损：字典 -> Article -> 字典 与原数据完全一致（含字段顺序）"""
+    raw = load_articles(n)
+    assert [Article.from_dict(item).to_dict() for item in raw] == raw
+    assert [list(Article.from_dict(item).to_dict()) for item in raw] == [list(item) for item in raw]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章内存基准：普通字典列表 vs Article(__slots__ + 驻留) 列表')
+    parser.add_argument('n', nargs='?', type=int, default=1000000, help='文章数')
+    parser.add_argument('--one', nargs=2, metavar=('IMPL', 'N'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        print(json.dumps(run_one(args.one[0], int(args.one[1]))))
+        return
+
+    n = args.n
+    check_roundtrip()
+    load_articles(n)
+    print(f"文章数 {n:,}（往返转换无损校验通过）")
+    print(f"{'实现':<8}{'保留MB':>9}{'峰值MB':>9}{'字节/篇':>9}{'构建(s)':>9}"
+          f"{'排序(s)':>9}{'筛选周(s)':>11}{'分类计数(s)':>12}")
+    for impl in IMPLS:
+        out = subprocess.run([sys.executable, __file__, '--one', impl, str(n)], capture_output=True, text=True)
+        if out.returncode != 0:
+            error = out.stderr.strip().splitlines() or [f"退出码 {out.returncode}"]
+            print(f"{impl:<8} 失败: {error[-1]}")
+            continue
+        r = json.loads(out.stdout)
+        print(f"{r['impl']:<8}{r['retained_mb']:>9}{r['peak_mb']:>9}{r['bytes_per_article']:>9}"
+              f"{r['build_seconds']:>9}{r['sort']:>9}{r['filter_week']:>11}{r['category_counts']:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分类器基准：旧的 any() 逐关键词扫描 vs 共享的 KeywordClassifier（短文本与长正文两组）
+KeywordClassifier 的结果与逐关键词扫描的参考实现（同一张表、英文按完整单词）逐篇比对，不一致时以非零退出
+用法：python benchmarks/bench_classifier.py [文章数]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import KeywordClassifier  # noqa: E402
+from corpus import make_corpus  # noqa: E402
+
+# 原 RealArticleScraper.categorize
+def legacy_categorize(title, desc=''):
+    content = (title + ' ' + desc).lower()
+    if any(kw in content for kw in ['薪酬', '福利', '绩效', '激励', '工资']):
+        return '薪酬福利'
+    elif any(kw in content for kw in ['招聘', '面试', '人才', '培训', '学习', '离职', '继任']):
+        return '人才发展'
+    elif any(kw in content for kw in ['组织', '架构', '变革', '效能', 'od']):
+        return '组织发展'
+    elif any(kw in content for kw in ['文化', '价值观', '员工体验', '雇主品牌']):
+        return '企业文化'
+    elif any(kw in content for kw in ['ssc', '共享服务', 'rpa', '自动化', '流程']):
+        return 'SSC'
+    else:
+        return '人才发展'
+
+
+# 原 RealHRNewsScraper.categorize_content / is_ai_related
+LEGACY_CATEGORY_KEYWORDS = {
+    '薪酬福利': ['薪酬', '福利', '绩效', '激励', '工资', '奖金'],
+    '人才发展': ['培训', '学习', '发展', '晋升', '招聘', '人才'],
+    '组织发展': ['组织', '架构', '变革', '转型', '数字化'],
+    '企业文化': ['文化', '价值观', '员工体验', '雇主品牌'],
+    'SSC': ['共享服务', 'SSC', 'HRSSC', '自助服务']
+}
+LEGACY_AI_KEYWORDS = ['AI', '人工智能', '机器学习', '自动化', 'ChatGPT',
+                      'GPT', '算法', '智能', '大数据', 'RPA']
+
+
+def legacy_categorize_content(title, description=''):
+    content = (title + ' ' + description).lower()
+    for category, keywords in LEGACY_CATEGORY_KEYWORDS.items():
+        if any(keyword in content for keyword in keywords):
+            return category
+    return '人才发展'
+
+
+def legacy_is_ai_related(text):
+    return any(keyword in text for keyword in LEGACY_AI_KEYWORDS)
+
+
+def legacy_with_keywords(title, desc, vocab):
+    """旧写法要得到 classify 的三项信息：分类、AI判断，再对每个关键词扫一遍得到命中列表"""
+    content = (title + ' ' + desc).lower()
+    return (legacy_categorize_content(title, desc), legacy_is_ai_related(title + ' ' + desc),
+            [kw for kw in vocab if kw in content])
+
+
+def reference_classify(clf, title, desc=''):
+    """参考实现：对每个关键词做一次子串查找，英文关键词两侧不能紧挨英文字母"""
+    content = (title + ' ' + desc).lower()
+    keywords = []
+    for kw in clf.vocab:
+        if kw not in clf.ascii:
+            if kw in content:
+                keywords.append(kw)
+            continue
+        pos = content.find(kw)
+        while pos != -1:
+            if not ('a' <= content[pos - 1:pos] <= 'z' or 'a' <= content[pos + len(kw):pos + len(kw) + 1] <= 'z'):
+                keywords.append(kw)
+                break
+            pos = content.find(kw, pos + 1)
+    category = next((c for c, kws in clf.table if any(kw in keywords for kw in kws)), clf.default)
+    return category, any(kw in clf.ai_set for kw in keywords), set(keywords)
+
+
+# (文本, 期望分类, 期望AI相关)
+CASES = [
+    ('AI驱动的组织发展', '组织发展', True),     # '发展' 不再把组织类文章归到人才发展
+    ('绩效能力模型', '薪酬福利', False),        # '效能' 与 '绩效' 重叠，仍算命中
+    ('Thai market model', '人才发展', False),  # 'ai' / 'od' 只按完整单词匹配
+    ('HRSSC 与 ChatGPT', 'SSC', True),
+    ('Model OD转型', '组织发展', False),         # 大写英文原文直接搜索，不先转小写
+    ('人工智能 招聘', '人才发展', True),
+]
+
+
+def verify(clf, corpus):
+    """逐篇比对分类、AI相关和命中关键词集合，返回是否全部一致"""
+    ok = True
+    for text, category, ai in CASES:
+        result = clf.classify(text)
+        passed = (result.category, result.ai_related) == (category, ai) == reference_classify(clf, text)[:2]
+        passed &= clf.categorize(text) == category and clf.is_ai_related(text) == ai
+        ok &= passed
+        print(f"  {'[OK]' if passed else '[FAIL]'} {text} -> {result.category}, AI={result.ai_related}")
+    mismatched = 0
+    for (title, desc), result in zip(corpus, clf.classify_many(corpus)):
+        expected = reference_classify(clf, title, desc)
+        if (result.category, result.ai_related, set(result.keywords)) != expected \
+                or clf.categorize(title, desc) != expected[0] or clf.is_ai_related(title + ' ' + desc) != expected[1]:
+            mismatched += 1
+    print(f"  {'[OK]' if not mismatched else '[FAIL]'} 语料 {len(corpus)} 篇与参考实现不一致 {mismatched} 篇")
+    return ok and not mismatched
+
+
+def timed(fn, repeat=3):
+    """取多次运行中最快的一次，减少单次抖动"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(label, corpus, clf):
+    n = len(corpus)
+    # 旧流程每篇要分别调用分类和AI判断，且拿不到命中关键词
+    auto_time, _ = timed(lambda: [legacy_categorize(t, d) for t, d in corpus])
+    legacy_time, _ = timed(lambda: [(legacy_categorize_content(t, d), legacy_is_ai_related(t + ' ' + d))
+                                    for t, d in corpus])
+    legacy_kw_time, _ = timed(lambda: [legacy_with_keywords(t, d, clf.vocab) for t, d in corpus])
+    reference_time, _ = timed(lambda: [reference_classify(clf, t, d) for t, d in corpus])
+    fast_time, _ = timed(lambda: [(clf.categorize(t, d), clf.is_ai_related(t + ' ' + d)) for t, d in corpus])
+    single_time, _ = timed(lambda: [clf.classify(t, d) for t, d in corpus])
+    batch_time, results = timed(lambda: clf.classify_many(corpus))
+
+    avg_len = sum(len(t) + len(d) for t, d in corpus) / n
+    print(f"\n[{label}] 文章数: {n}，平均长度 {avg_len:.0f} 字")
+    print(f"{'实现':<46}{'总耗时(s)':>12}{'篇/秒':>14}")
+    for name, seconds in [('旧 categorize（仅分类）', auto_time),
+                          ('旧 categorize_content + is_ai_related', legacy_time),
+                          ('旧写法：分类 + AI判断 + 命中关键词列表', legacy_kw_time),
+                          ('逐关键词扫描（参考实现，英文按单词）', reference_time),
+                          ('KeywordClassifier categorize + is_ai_related', fast_time),
+                          ('KeywordClassifier.classify', single_time),
+                          ('KeywordClassifier.classify_many', batch_time)]:
+        print(f"{name:<46}{seconds:>12.3f}{n / seconds:>14,.0f}")
+    ai = sum(r.ai_related for r in results)
+    print(f"AI相关: {ai}/{n}")
+    return verify(clf, corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分类器基准：旧的 any() 逐关键词扫描 vs 共享的 KeywordClassifier（短文本与长正文两组）')
+    parser.add_argument('n', nargs='?', type=int, default=20000, help='文章数')
+    args = parser.parse_args()
+
+    n = args.n
+
+    start = time.perf_counter()
+    clf = KeywordClassifier()
+    print(f"编译耗时 {(time.perf_counter() - start) * 1000:.1f} ms，关键词 {len(clf.vocab)} 个")
+
+    ok = run('标题+摘要', make_corpus(n), clf)
+    ok &= run('标题+正文', make_corpus(max(n // 20, 1), sentences=(150, 250)), clf)
+    print('[OK] 校验通过' if ok else '[FAIL] 校验失败')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
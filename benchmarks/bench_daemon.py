@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻模式基准
+对桩服务器的订阅源比较两种刷新方式的延迟：
+  冷启动   每次刷新起一个新进程（导入 requests/bs4、建分类表、开新连接、打开存档）
+  常驻     同一个 UpdateDaemon 反复 run_cycle（连接池、缓存、分类器、存档都是热的）
+第一次刷新有新文章（写存档并增量生成输出），之后订阅源未变化（304，不写任何文件）。
+同时校验调度器的抖动范围和 /healthz、/metrics 接口。
+用法：python benchmarks/bench_daemon.py [刷新次数]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import start_stub_server  # noqa: E402
+
+LAST_RUN = '2026-10-05T00:00:00+08:00'
+INTERVALS = {'feeds': 1800, '36kr': 21600}
+
+
+def prepare(tmp, url):
+    """临时工作目录：页面模板、已发布的数据，以及上次运行的订阅源状态"""
+    for name in ('index.html', 'hr_news_data.json'):
+        shutil.copy(os.path.join(ROOT, name), tmp)
+    with open(os.path.join(tmp, '.feed_state.json'), 'w', encoding='utf-8') as f:
+        json.dump({url: LAST_RUN}, f)
+
+
+def cold_refresh(url):
+    """冷启动进程里执行的一次刷新（与常驻模式的 run_cycle 做同样的事）"""
+    import auto_update_articles
+    auto_update_articles.FEEDS = [('桩订阅源', url)]
+    scraper = auto_update_articles.RealArticleScraper()
+    try:
+        scraper.fetch_and_parse(scraper.targets_feeds())
+        if scraper.articles:
+            scraper.save_and_update()
+            scraper.feed_state.save()
+    finally:
+        scraper.fetcher.close()
+        scraper.store.close()
+
+
+def verify_scheduler():
+    from daemon import Scheduler
+    rng = random.Random(1)
+    scheduler = Scheduler(INTERVALS, jitter=0.1, now=0, rng=rng)
+    ok = all(0 <= due <= 60 for due, _ in scheduler.queue)
+    runs = {name: [] for name in INTERVALS}
+    now = 0
+    while now < 7 * 86400:
+        now = scheduler.next_due()
+        for name in scheduler.pop_due(now):
+            runs[name].append(now)
+    for name, times in runs.items():
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        ok &= all(0.9 * INTERVALS[name] <= gap <= 1.1 * INTERVALS[name] for gap in gaps)
+        ok &= len(set(round(gap) for gap in gaps)) > 1  # 确实有抖动
+    print(f"{'[OK]' if ok else '[FAIL]'} 调度器：一周内 " +
+          '，'.join(f"{name} 运行 {len(times)} 次" for name, times in runs.items()) + "，间隔都在 ±10% 内")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='常驻模式基准')
+    parser.add_argument('rounds', nargs='?', type=int, default=5, help='刷新次数')
+    args = parser.parse_args()
+
+    rounds = args.rounds
+    ok = verify_scheduler()
+    server, base = start_stub_server()
+    url = base + '/feed'
+    cwd = os.getcwd()
+    cold, warm = [], []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            prepare(tmp, url)
+            here = os.path.dirname(os.path.abspath(__file__))
+            script = (f"import sys; sys.path[:0] = [{ROOT!r}, {here!r}]; "
+                      f"import bench_daemon; bench_daemon.cold_refresh({url!r})")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, '-c', script], cwd=tmp, check=True, stdout=subprocess.DEVNULL)
+                cold.append(time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            prepare(tmp, url)
+            os.chdir(tmp)
+            start = time.perf_counter()
+            import auto_update_articles
+            from daemon import UpdateDaemon
+            auto_update_articles.FEEDS = [('桩订阅源', url)]
+            scraper = auto_update_articles.RealArticleScraper()
+            # 真实的刷新间隔是几十分钟，令牌桶总是满的；这里连续刷新，放开限速以免测到等待令牌的时间
+            scraper.fetcher.rate = 1000
+            daemon = UpdateDaemon(scraper, schedule={'feeds': ('targets_feeds', 1800)}, port=0)
+            port = daemon.start_server()
+            startup = time.perf_counter() - start
+            stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+            try:
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    daemon.run_cycle(['feeds'])
+                    warm.append(time.perf_counter() - start)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+
+            health = requests.get(f"http://127.0.0.1:{port}/healthz", timeout=5)
+            metrics = requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+            status = health.json()
+            ok &= health.status_code == 200 and status['cycles'] == rounds and status['articles'] == 3
+            ok &= 'stage="cycle"' in metrics.text
+            print(f"{'[OK]' if ok else '[FAIL]'} /healthz {health.status_code}（{status['cycles']} 轮，"
+                  f"{status['articles']} 篇），/metrics {len(metrics.text.splitlines())} 行")
+
+            # 来源长时间没有成功抓取时健康检查应报告失败
+            daemon.sources['feeds']['last_ok'] = time.time() - 4 * 1800
+            stale = requests.get(f"http://127.0.0.1:{port}/healthz", timeout=5)
+            ok &= stale.status_code == 503
+            print(f"{'[OK]' if stale.status_code == 503 else '[FAIL]'} 来源过期时 /healthz {stale.status_code}")
+            daemon.server.shutdown()
+            scraper.fetcher.close()
+            scraper.store.close()
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+    print(f"\n{rounds} 次刷新（第1次有3篇新文章，之后订阅源304），常驻进程启动 {startup:.2f}s")
+    print(f"{'方式':<10}{'第1次(s)':>10}{'之后平均(s)':>12}")
+    for label, times in (('冷启动', cold), ('常驻', warm)):
+        rest = times[1:] or times
+        print(f"{label:<10}{times[0]:>10.3f}{sum(rest) / len(rest):>12.3f}")
+    print('[OK] 校验通过' if ok else '[FAIL] 校验失败')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
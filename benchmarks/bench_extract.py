@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索结果页解析基准：完整 BeautifulSoup 树 vs html_extract 流式提前结束
+用 fixtures/36kr_search.html 加上重复的信息流块拼成多MB页面，每种实现在独立子进程中运行，
+分别记录解析耗时、tracemalloc 峰值和进程RSS增量。
+用法：python benchmarks/bench_extract.py [页面MB数]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT)
+
+
+def build_page(size_mb):
+    """把信息流块填到 <!-- FEED --> 处，直到页面达到 size_mb"""
+    with open(os.path.join(FIXTURES, '36kr_search.html'), encoding='utf-8') as f:
+        page = f.read()
+    with open(os.path.join(FIXTURES, 'feed_item.html'), encoding='utf-8') as f:
+        item = f.read()
+    repeat = max(1, int(size_mb * 1024 * 1024 / len(item.encode('utf-8'))))
+    return page.replace('<!-- FEED -->', item * repeat)
+
+
+def accept(title, href):
+    if title and len(title) > 10 and ('ai' in title.lower() or '人工智能' in title):
+        return [title, href]
+
+
+def parse_bs4(html):
+    """原 scrape_36kr 的写法"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    links = soup.find_all('a', href=True)
+    return [c for c in (accept(link.get_text().strip(), link['href']) for link in links[:3]) if c]
+
+
+def parse_stream(html):
+    from html_extract import extract_links
+    return extract_links(html, accept, limit=3, tags=('a',))
+
+
+def parse_stream_full(html):
+    """不提前结束，解析整页，用来看内存是否随页面增长"""
+    from html_extract import extract_links
+    return extract_links(html, accept, limit=float('inf'), tags=('a',))
+
+
+IMPLS = {'bs4': parse_bs4, 'stream': parse_stream, 'stream_full': parse_stream_full}
+# 计时前先导入各实现用到的模块，导入开销不计入解析
+PRELOAD = {'bs4': 'bs4', 'stream': 'html_extract', 'stream_full': 'html_extract'}
+
+
+def run_one(impl, size_mb):
+    html = build_page(size_mb)
+    parse = IMPLS[impl]
+    importlib.import_module(PRELOAD[impl])
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    found = parse(html)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'impl': impl,
+        'page_mb': round(len(html.encode('utf-8')) / 1024 / 1024, 2),
+        'seconds': round(elapsed, 4),
+        'tracemalloc_peak_mb': round(peak / 1024 / 1024, 2),
+        'rss_delta_mb': round((rss_after - rss_before) / 1024, 2),
+        'found': len(found),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='搜索结果页解析基准：完整 BeautifulSoup 树 vs html_extract 流式提前结束')
+    parser.add_argument('size', nargs='?', type=float, help='页面MB数，默认依次跑 1 和 5')
+    parser.add_argument('--one', nargs=2, metavar=('IMPL', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        print(json.dumps(run_one(args.one[0], float(args.one[1]))))
+        return
+
+    sizes = [args.size] if args.size is not None else [1, 5]
+    print(f"{'实现':<12}{'页面MB':>8}{'耗时(s)':>10}{'内存峰值MB':>12}{'RSS增量MB':>12}{'候选数':>8}")
+    for size in sizes:
+        for impl in IMPLS:
+            out = subprocess.run([sys.executable, __file__, '--one', impl, str(size)],
+                                 capture_output=True, text=True)
+            if out.returncode != 0:
+                print(f"{impl:<12}{size:>8} 失败: {out.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(out.stdout)
+            print(f"{r['impl']:<12}{r['page_mb']:>8}{r['seconds']:>10}{r['tracemalloc_peak_mb']:>12}"
+                  f"{r['rss_delta_mb']:>12}{r['found']:>8}")
+
+
+if __name__ == '__main__':
+    main()
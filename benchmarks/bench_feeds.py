@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSS/Atom 订阅源基准
+先对桩服务器校验整条链路：首次读取只取上次运行之后的AI相关条目，再次读取走304且不产出条目；
+生成的 feed.xml 能被自己读回。再对合成的大订阅源比较整棵树解析与 iter_entries
+流式解析的耗时和内存峰值，以及遇到旧条目提前停止的效果。
+用法：python benchmarks/bench_feeds.py [条目数]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import auto_update_articles  # noqa: E402
+from feeds import _entry, iter_entries, render_feed  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+# fixtures/feed.xml 里上次运行之后发布的AI相关条目
+EXPECTED = ['/article/feed-1', '/article/feed-2', '/article/feed-4']
+LAST_RUN = '2026-10-05T00:00:00+08:00'
+
+
+def read_feed(url):
+    """在当前目录（临时目录）里跑一遍抓取器的订阅源流程，返回 (候选链接, 缓存统计)"""
+    scraper = auto_update_articles.RealArticleScraper(report_dir='reports')
+    scraper.feed_state.state.setdefault(url, LAST_RUN)
+    auto_update_articles.FEEDS = [('桩订阅源', url)]
+    try:
+        scraper.fetch_and_parse(scraper.targets_feeds())
+        scraper.feed_state.save()
+    finally:
+        scraper.fetcher.close()
+        scraper.store.close()
+    return [article['link'] for article in scraper.articles], dict(scraper.cache.stats)
+
+
+def verify():
+    server, base = start_stub_server()
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            first, _ = read_feed(base + '/feed')
+            second, stats = read_feed(base + '/feed')
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+    ok = first == [base + path for path in EXPECTED] and second == [] and stats['revalidated'] == 1
+    print(f"{'[OK]' if ok else '[FAIL]'} 首次读取 {len(first)} 篇（期望 {len(EXPECTED)}），"
+          f"再次读取 {len(second)} 篇，304重验证 {stats['revalidated']} 次")
+
+    articles = [{'title': f'AI招聘第{i}篇', 'link': f'https://example.com/{i}', 'description': '薪酬 & 绩效',
+                 'category': '人才发展', 'source': '示例', 'date': '2026年10月12日'} for i in range(3)]
+    back = list(iter_entries(io.BytesIO(render_feed(articles).encode('utf-8'))))
+    roundtrip = [(e['title'], e['link'], e['summary']) for e in back] == \
+        [(a['title'], a['link'], a['description']) for a in articles]
+    print(f"{'[OK]' if roundtrip else '[FAIL]'} feed.xml 读回 {len(back)} 篇，内容一致")
+    return ok and roundtrip
+
+
+def make_feed(n, atom=False):
+    """n 条、每小时一条、新到旧排列的订阅源"""
+    newest = datetime(2026, 10, 15, tzinfo=timezone.utc)
+    parts = []
+    for i in range(n):
+        when = newest - timedelta(hours=i)
+        body = f"<p>第{i}篇：企业用AI助手处理员工咨询，HR共享服务效率提升。</p>" * 4
+        if atom:
+            parts.append(f'<entry><title>AI+HR 第{i}篇</title><link href="https://example.com/{i}"/>'
+                         f'<updated>{when.isoformat()}</updated><summary type="html">'
+                         f'{body.replace("<", "&lt;")}</summary></entry>')
+        else:
+            parts.append(f'<item><title>AI+HR 第{i}篇</title><link>https://example.com/{i}</link>'
+                         f'<pubDate>{format_datetime(when)}</pubDate>'
+                         f'<description>{body.replace("<", "&lt;")}</description></item>')
+    if atom:
+        doc = '<feed xmlns="http://www.w3.org/2005/Atom"><title>合成</title>' + ''.join(parts) + '</feed>'
+    else:
+        doc = '<rss version="2.0"><channel><title>合成</title>' + ''.join(parts) + '</channel></rss>'
+    return doc.encode('utf-8'), newest
+
+
+def full_tree(data):
+    """整棵树解析后再逐条做同样的字段提取"""
+    root = ET.fromstring(data)
+    return sum(1 for item in root.iter('item') if _entry(item))
+
+
+def streamed(data, since=None):
+    return sum(1 for _ in iter_entries(io.BytesIO(data), since=since))
+
+
+def measure(label, fn, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<24}{elapsed:>10.3f}{peak / 1024 / 1024:>12.1f}{count:>10,}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RSS/Atom 订阅源基准')
+    parser.add_argument('n', nargs='?', type=int, default=20000, help='条目数')
+    args = parser.parse_args()
+
+    n = args.n
+    ok = verify()
+
+    rss, newest = make_feed(n)
+    atom, _ = make_feed(n, atom=True)
+    since = newest - timedelta(hours=n // 10)
+    print(f"\n{n:,} 条的订阅源（RSS {len(rss) / 1024 / 1024:.1f}MB）")
+    print(f"{'解析方式':<24}{'耗时(s)':>10}{'内存峰值(MB)':>12}{'条目':>10}")
+    counts = [
+        measure('RSS 整棵树', lambda: full_tree(rss), n),
+        measure('RSS iter_entries', lambda: streamed(rss), n),
+        measure('Atom iter_entries', lambda: streamed(atom), n),
+    ]
+    incremental = measure('RSS 只读最新10%', lambda: streamed(rss, since), n)
+    ok &= counts == [n] * 3 and incremental == n // 10
+    print('[OK] 各方式条目数一致' if ok else '[FAIL] 结果不一致')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
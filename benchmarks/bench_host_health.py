@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+故障来源的开销：没有主机健康跟踪 vs HostHealth（自适应超时 + 退避 + 熔断）
+桩服务器模拟两种坏来源：一直返回503的，以及挂起不响应的。每种场景连续模拟几次运行，
+每次运行像 scrape_36kr 一样请求3个搜索词；HostHealth 的状态文件在各次运行间保留，
+用来验证熔断能跨运行生效（冷却期内的运行几乎零开销）。
+用法：python benchmarks/bench_host_health.py [超时秒数] [运行次数]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_engine import FetchEngine  # noqa: E402
+from host_health import HostHealth  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+TERMS = ['人工智能 HR', 'AI 人力资源', 'ChatGPT HR']
+
+
+def simulate_run(base, path, timeout, state_file):
+    """一次运行：并发请求3个搜索词，返回 (耗时, 结果摘要)"""
+    health = HostHealth(state_file, max_timeout=timeout) if state_file else None
+    engine = FetchEngine(timeout=timeout, rate=100, burst=100, health=health)
+    start = time.perf_counter()
+    results = engine.fetch_all([f"{base}{path}?q={term}" for term in TERMS])
+    elapsed = time.perf_counter() - start
+    engine.close()
+    outcome = []
+    for _, response, error in results:
+        outcome.append(type(error).__name__ if error is not None else str(response.status_code))
+    return elapsed, ','.join(outcome), health
+
+
+def main():
+    parser = argparse.ArgumentParser(description='故障来源的开销：没有主机健康跟踪 vs HostHealth（自适应超时 + 退避 + 熔断）')
+    parser.add_argument('timeout', nargs='?', type=float, default=3.0, help='超时秒数')
+    parser.add_argument('runs', nargs='?', type=int, default=3, help='运行次数')
+    args = parser.parse_args()
+
+    timeout, runs = args.timeout, args.runs
+    server, base = start_stub_server(hang=timeout + 2)
+
+    print(f"超时 {timeout}s，每次运行 {len(TERMS)} 个请求，连续 {runs} 次运行")
+    print(f"{'场景':<10}{'实现':<14}{'运行':>4}{'耗时(s)':>10}  结果")
+    try:
+        for scenario, path in [('503', '/status/503'), ('挂起', '/hang')]:
+            for impl in ('无健康跟踪', 'HostHealth'):
+                with tempfile.TemporaryDirectory() as tmp:
+                    state_file = os.path.join(tmp, 'health.json') if impl == 'HostHealth' else None
+                    total = 0
+                    for run in range(1, runs + 1):
+                        elapsed, outcome, health = simulate_run(base, path, timeout, state_file)
+                        total += elapsed
+                        print(f"{scenario:<10}{impl:<14}{run:>4}{elapsed:>10.3f}  {outcome}")
+                    print(f"{'':<10}{'':<14}{'合计':>4}{total:>10.3f}"
+                          + (f"  {health.report()}" if health else ''))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+链接检查：对桩服务器校验各类链接的判定结果，并比较耗时
+  逐个 requests.head（不复用连接、不跟随重定向、没有缓存）
+  LinkChecker 首次运行（并发 + 连接复用）
+  LinkChecker 再次运行（TTL 缓存命中，不发请求）
+用法：python benchmarks/bench_links.py [链接数] [延迟秒数]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_engine import FetchEngine  # noqa: E402
+from link_checker import LinkChecker, flag_links  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+# (路径, 期望状态, 期望标记)
+CASES = [
+    ('/article/1', 'ok', None),
+    ('/', 'ok', 'generic'),
+    ('/status/404', 'dead', 'dead'),
+    ('/status/410', 'dead', 'dead'),
+    ('/redirect?to=/article/2', 'ok', None),
+    ('/redirect?to=/', 'ok', 'redirected_to_root'),
+    ('/nohead/3', 'ok', None),
+    ('/status/503', 'error', 'unreachable'),
+    ('/hang', 'error', 'unreachable'),
+]
+
+
+def make_checker(cache_path, timeout):
+    # 桩服务器只有一个主机，放宽单主机限速，只保留并发上限
+    engine = FetchEngine(timeout=timeout, max_workers=16, per_host=8, rate=1000, burst=1000)
+    return LinkChecker(engine=engine, cache_path=cache_path, timeout=timeout)
+
+
+def verify(base, timeout):
+    """逐类校验判定结果，返回是否全部符合预期"""
+    with tempfile.TemporaryDirectory() as tmp:
+        checker = make_checker(os.path.join(tmp, 'links.json'), timeout)
+        urls = [base + path for path, _, _ in CASES]
+        results = checker.check_all(urls)
+        checker.engine.close()
+    articles = [{'title': path, 'link': base + path} for path, _, _ in CASES]
+    flagged = flag_links(articles, results)
+    reasons = {item['link']: reason for reason, items in flagged.items() for item in items}
+
+    ok = True
+    for path, state, flag in CASES:
+        result = results[base + path]
+        passed = result['state'] == state and reasons.get(base + path) == flag
+        ok &= passed
+        print(f"  {'[OK]' if passed else '[FAIL]'} {path:<26}{result['state']:<7}"
+              f"{str(result['status']):<6}{reasons.get(base + path) or '-'}")
+    return ok
+
+
+def serial_head(urls, timeout):
+    start = time.perf_counter()
+    for url in urls:
+        try:
+            requests.head(url, timeout=timeout)
+        except requests.RequestException:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='链接检查：对桩服务器校验各类链接的判定结果，并比较耗时')
+    parser.add_argument('n', nargs='?', type=int, default=200, help='链接数')
+    parser.add_argument('delay', nargs='?', type=float, default=0.02, help='桩服务器的响应延迟（秒）')
+    args = parser.parse_args()
+
+    n, delay = args.n, args.delay
+    timeout = 1.0
+    server, base = start_stub_server(delay=delay, hang=timeout + 1)
+    try:
+        print("判定结果:")
+        ok = verify(base, timeout)
+
+        # 文章页要走 ROUTES 才有延迟，用 /search/articles/<i> 模拟 n 个不同的文章链接
+        urls = [f"{base}/search/articles/{i}" for i in range(n)]
+        print(f"\n{n} 个链接，服务器延迟 {delay}s")
+        print(f"{'实现':<22}{'耗时(s)':>10}")
+        print(f"{'逐个 requests.head':<22}{serial_head(urls, timeout):>10.3f}")
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, 'links.json')
+            for label in ('LinkChecker 首次', 'LinkChecker 缓存'):
+                checker = make_checker(cache_path, timeout)
+                start = time.perf_counter()
+                checker.check_all(urls)
+                elapsed = time.perf_counter() - start
+                checker.close()
+                checker.engine.close()
+                print(f"{label:<22}{elapsed:>10.3f}  {checker.summary()}")
+    finally:
+        server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流水线基准：抓取 -> 提取 -> 分类 -> 保存 -> 页面数据拼接，逐阶段计时
+  fetch     FetchEngine 并发请求本地桩服务器（stub_server.py，录制的36氪/知乎页面），不限速
+  extract   extract_36kr / extract_zhihu 解析录制页面
+  classify  categorize / categorize_content 共用的 default_classifier.categorize
+  save      保存路径（不含去重）：upsert + export_json + export_shards + write_index（临时目录），
+            另外记录构建图判断"有没有变化"所需的文章集合哈希（store.digest()）的耗时，
+            以及只新增一篇文章后重新导出JSON和索引（只重做那一周）的耗时
+  splice    render_page 把最新一周写进 index.html 的数据槽（临时副本）
+  dedup     Deduplicator.filter（默认不跑：合成语料词汇量小，几乎两两同桶，是去重的最坏情况）
+每个 (阶段, 规模) 在独立子进程中运行，记录耗时、吞吐量和进程RSS峰值，结果写成JSON；
+传入 --baseline 旧结果文件时逐项对比，慢于阈值的标记为回归。
+用法：
+  python benchmarks/bench_pipeline.py                       # 1k + 100k
+  python benchmarks/bench_pipeline.py --sizes 1k,100k,1m    # 完整规模
+  python benchmarks/bench_pipeline.py --baseline old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+STAGES = ['fetch', 'extract', 'classify', 'save', 'splice', 'dedup']
+DEFAULT_STAGES = ['fetch', 'extract', 'classify', 'save', 'splice']
+# 与语料规模无关的阶段只跑一次
+FIXED_SIZE = {'fetch': 'requests', 'extract': 'pages'}
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    for suffix, factor in (('k', 1000), ('m', 1000000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stage_fetch(n, args):
+    from fetch_engine import FetchEngine
+    from stub_server import start_stub_server
+
+    server, base = start_stub_server(delay=args.delay)
+    urls = [f"{base}/search/articles/AI{i}" if i % 4 else f"{base}/search?q=AI+HR&i={i}" for i in range(n)]
+    engine = FetchEngine(rate=1e9, burst=1e9, per_host=args.workers, max_workers=args.workers)
+    try:
+        start = time.perf_counter()
+        results = engine.fetch_all(urls)
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+        server.shutdown()
+    ok = sum(1 for _, r, e in results if e is None and r.status_code == 200)
+    downloaded = sum(len(r.content) for _, r, e in results if e is None)
+    return elapsed, {'ok': ok, 'bytes': downloaded, 'delay': args.delay, 'workers': args.workers}
+
+
+def stage_extract(n, args):
+    from auto_update_articles import RealArticleScraper
+
+    pages = []
+    for name in ('36kr_search.html', 'zhihu_search.html'):
+        with open(os.path.join(BENCH_DIR, 'fixtures', name), encoding='utf-8') as f:
+            pages.append(f.read())
+    from run_metrics import RunMetrics
+
+    scraper = RealArticleScraper.__new__(RealArticleScraper)  # 提取不需要存档和网络
+    scraper.metrics = RunMetrics('bench')
+    extractors = [scraper.extract_36kr, scraper.extract_zhihu]
+
+    start = time.perf_counter()
+    found = sum(len(extractors[i % 2](pages[i % 2])) for i in range(n))
+    return time.perf_counter() - start, {'candidates': found}
+
+
+def stage_classify(articles, args):
+    from classifier import default_classifier
+
+    categorize = default_classifier.categorize
+    start = time.perf_counter()
+    for article in articles:
+        categorize(article['title'], article['description'])
+    return time.perf_counter() - start, {}
+
+
+def stage_save(articles, args):
+    from article_store import ArticleStore
+    from search_index import write_index
+    from week_shards import export_shards
+
+    tmp = tempfile.mkdtemp(prefix='bench-save-')
+    details = {}
+    try:
+        start = time.perf_counter()
+        store = ArticleStore(os.path.join(tmp, 'archive.db'), seed_json=None)
+        t = time.perf_counter()
+        inserted, _ = store.upsert(articles)
+        details['upsert'] = round(time.perf_counter() - t, 4)
+        t = time.perf_counter()
+        store.export_json(os.path.join(tmp, 'hr_news_data.json'))
+        details['export_json'] = round(time.perf_counter() - t, 4)
+        t = time.perf_counter()
+        details['shards'] = export_shards(store, os.path.join(tmp, 'data'))
+        details['export_shards'] = round(time.perf_counter() - t, 4)
+        t = time.perf_counter()
+        write_index(store, os.path.join(tmp, 'search_index.json'))
+        details['write_index'] = round(time.perf_counter() - t, 4)
+        elapsed = time.perf_counter() - start
+        # 无变化的运行只需要这一步（不计入阶段耗时）
+        t = time.perf_counter()
+        store.digest()
+        details['article_digest'] = round(time.perf_counter() - t, 4)
+        t = time.perf_counter()
+        store.upsert([dict(articles[0], title=articles[0]['title'] + '（续）', link=articles[0]['link'] + '-next')])
+        store.export_json(os.path.join(tmp, 'hr_news_data.json'))
+        write_index(store, os.path.join(tmp, 'search_index.json'))
+        details['incremental_export'] = round(time.perf_counter() - t, 4)
+        details['inserted'] = inserted
+        details['json_mb'] = round(os.path.getsize(os.path.join(tmp, 'hr_news_data.json')) / 1024 / 1024, 2)
+        store.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return elapsed, details
+
+
+def stage_splice(articles, args):
+    from site_renderer import render_page
+
+    latest = [a for a in articles if a['week'] == articles[0]['week']]
+    tmp = tempfile.mkdtemp(prefix='bench-splice-')
+    try:
+        page = os.path.join(tmp, 'index.html')
+        shutil.copy(os.path.join(ROOT, 'index.html'), page)
+        start = time.perf_counter()
+        render_page(page, latest)
+        elapsed = time.perf_counter() - start
+        details = {'items': len(latest), 'page_kb': round(os.path.getsize(page) / 1024, 1)}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return elapsed, details
+
+
+def stage_dedup(articles, args):
+    from article_store import ArticleStore
+    from dedup import Deduplicator
+
+    tmp = tempfile.mkdtemp(prefix='bench-dedup-')
+    try:
+        dedup = Deduplicator(ArticleStore(os.path.join(tmp, 'archive.db'), seed_json=None))
+        start = time.perf_counter()
+        kept, duplicates = dedup.filter(articles)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return elapsed, {'duplicates': len(duplicates)}
+
+
+def run_one(stage, n, args):
+    """子进程内执行一个阶段；语料加载不计入耗时和内存增量"""
+    if stage in FIXED_SIZE:
+        data = n
+    else:
+        from corpus import load_articles
+        data = load_articles(n)
+    rss_before = rss_mb()
+    elapsed, details = globals()['stage_' + stage](data, args)
+    rss_after = rss_mb()
+    items = details.get('items', n)  # splice 只嵌入最新一周，吞吐量按实际写入的篇数算
+    return {
+        'stage': stage,
+        'size': n,
+        'unit': FIXED_SIZE.get(stage, 'articles'),
+        'seconds': round(elapsed, 4),
+        'throughput': round(items / elapsed, 1) if elapsed else None,
+        'rss_peak_mb': round(rss_after, 1),
+        'rss_delta_mb': round(rss_after - rss_before, 1),
+        'details': details,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """与旧结果逐项对比，返回回归项数"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+    regressions = 0
+    print(f"\n与基线对比 ({baseline_path})，阈值 +{threshold:.0%}")
+    for r in results:
+        old = baseline.get((r['stage'], r['size']))
+        if not old or not old['seconds']:
+            continue
+        change = r['seconds'] / old['seconds'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  [回归]'
+            regressions += 1
+        print(f"  {r['stage']:<10}{r['size']:>10}  {old['seconds']:>9.3f}s -> {r['seconds']:>9.3f}s  {change:+.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='抓取→分类→保存→渲染流水线基准')
+    parser.add_argument('--sizes', default='1k,100k', help='语料规模，逗号分隔，如 1k,100k,1m')
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"要跑的阶段，可选 {','.join(STAGES)}")
+    parser.add_argument('--requests', type=int, default=200, help='fetch 阶段的请求数')
+    parser.add_argument('--pages', type=int, default=2000, help='extract 阶段解析的页面数')
+    parser.add_argument('--delay', type=float, default=0.0, help='桩服务器模拟的响应延迟（秒）')
+    parser.add_argument('--workers', type=int, default=8, help='fetch 阶段的并发数')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results', 'pipeline.json'))
+    parser.add_argument('--baseline', help='对比用的旧结果文件')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定为回归的变慢比例')
+    parser.add_argument('--one', nargs=2, metavar=('STAGE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        print(json.dumps(run_one(args.one[0], int(args.one[1]), args)))
+        return
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"未知的阶段: {', '.join(sorted(unknown))}")
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+
+    jobs = []
+    for stage in stages:
+        if stage == 'fetch':
+            jobs.append((stage, args.requests))
+        elif stage == 'extract':
+            jobs.append((stage, args.pages))
+        else:
+            jobs.extend((stage, n) for n in sizes)
+
+    passthrough = ['--delay', str(args.delay), '--workers', str(args.workers)]
+    results = []
+    print(f"{'阶段':<10}{'规模':>10}{'耗时(s)':>10}{'吞吐量/s':>14}{'RSS峰值MB':>12}{'RSS增量MB':>12}")
+    for stage, n in jobs:
+        out = subprocess.run([sys.executable, __file__, '--one', stage, str(n)] + passthrough,
+                             capture_output=True, text=True, cwd=ROOT)
+        if out.returncode != 0:
+            error = out.stderr.strip().splitlines() or [f"退出码 {out.returncode}"]
+            print(f"{stage:<10}{n:>10} 失败: {error[-1]}")
+            continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        results.append(r)
+        print(f"{stage:<10}{n:>10}{r['seconds']:>10.3f}{r['throughput'] or 0:>14,.0f}"
+              f"{r['rss_peak_mb']:>12}{r['rss_delta_mb']:>12}")
+
+    report = {
+        'version': 1,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+相关度打分 + Top-K 基准
+逐篇计数打分 vs RelevanceScorer 批量打分（纯Python实现，装了 numpy 时再加 numpy 实现），
+以及每组全量排序取前K vs 堆选择。各实现的得分和选中结果必须一致。
+用法：python benchmarks/bench_relevance.py [候选数] [K]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import default_classifier  # noqa: E402
+from corpus import CATEGORIES, SOURCES, make_corpus  # noqa: E402
+from relevance import AI_WEIGHT, TITLE_WEIGHT, RelevanceScorer, np, top_k  # noqa: E402
+
+
+def naive_scores(corpus):
+    """逐篇计数（每个位置取最长的关键词，互不重叠），两遍（先算文档频率再打分）"""
+    vocab = default_classifier.vocab
+    row_of = {kw: k for k, kw in enumerate(vocab)}
+    pattern = default_classifier.pattern
+    tfs = []
+    df = [0] * len(vocab)
+    for title, desc in corpus:
+        row = {}
+        for weight, text in ((TITLE_WEIGHT, title.lower()), (1, desc.lower())):
+            for kw in pattern.findall(text):
+                row[row_of[kw]] = row.get(row_of[kw], 0) + weight
+        for k in row:
+            df[k] += 1
+        tfs.append(row)
+    n = len(corpus)
+    factor = [(AI_WEIGHT if kw in default_classifier.ai_set else 1.0) * (math.log((1 + n) / (1 + df[k])) + 1)
+              for k, kw in enumerate(vocab)]
+    return [sum(factor[k] * (1 + math.log(tf)) for k, tf in sorted(row.items())) for row in tfs]
+
+
+def sorted_top_k(groups, scores, k):
+    """每组全量排序后取前K"""
+    by_group = {}
+    for i, key in enumerate(groups):
+        by_group.setdefault(key, []).append(i)
+    selected = []
+    for indices in by_group.values():
+        selected.extend(sorted(indices, key=lambda i: (-scores[i], i))[:k])
+    return selected
+
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{elapsed:>10.3f}{n / elapsed:>14,.0f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='相关度打分 + Top-K 基准')
+    parser.add_argument('n', nargs='?', type=int, default=100000, help='候选数')
+    parser.add_argument('k', nargs='?', type=int, default=3, help='每组保留的篇数')
+    args = parser.parse_args()
+
+    n, k = args.n, args.k
+    corpus = make_corpus(n)
+    rng = random.Random(7)
+    groups = [(rng.choice(SOURCES), f"第{rng.randint(1, 52)}周", rng.choice(CATEGORIES)) for _ in range(n)]
+    titles = [title for title, _ in corpus]
+    descs = [desc for _, desc in corpus]
+
+    print(f"{n:,} 个候选（标题+描述），关键词 {len(default_classifier.vocab)} 个，"
+          f"numpy {'可用' if np is not None else '未安装'}")
+    print(f"{'打分':<22}{'耗时(s)':>10}{'篇/秒':>14}")
+    baseline = timed('逐篇计数（两遍）', lambda: naive_scores(corpus), n)
+    ok = True
+    scorers = [('批量 纯Python', RelevanceScorer(use_numpy=False))]
+    if np is not None:
+        scorers.append(('批量 numpy', RelevanceScorer()))
+    for label, scorer in scorers:
+        scores, _ = timed(label, lambda: scorer.score(titles, descs), n)
+        ok &= all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9) for a, b in zip(scores, baseline))
+
+    print(f"\n{'Top-K (K=%d)' % k:<22}{'耗时(s)':>10}{'篇/秒':>14}")
+    expected = timed('每组全量排序', lambda: sorted_top_k(groups, baseline, k), n)
+    chosen = timed('每组大小K的堆', lambda: top_k(groups, baseline, k, group=lambda key: key), n)
+    ok &= sorted(chosen) == sorted(expected)
+    print(f"  {len(set(groups)):,} 组，选中 {len(chosen):,} 篇")
+    print('[OK] 各实现结果一致' if ok else '[FAIL] 结果不一致')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
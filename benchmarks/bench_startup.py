@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行冷启动基准（python -X importtime）
+在临时目录里逐个运行 ai_hr_weekly.py 的子命令，解析 -X importtime 的输出：
+导入总耗时、最重的几个顶层模块，并检查 render/export/curate 没有加载 requests、bs4。
+第一行是以前每个脚本启动时都会付出的 requests + bs4 导入开销，作为对照。
+用法：python benchmarks/bench_startup.py [每条命令的运行次数]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPY = ['index.html', 'ai_hr_weekly.html', 'hr_news_data.json', 'search_index.json', 'feed.xml', 'data']
+NETWORK = ('requests', 'bs4', 'urllib3')
+
+# (说明, 命令行参数, 是否允许加载网络库)
+COMMANDS = [
+    ('import requests, bs4', ['-c', 'import requests, bs4'], True),
+    ('render --dry-run', ['ai_hr_weekly.py', 'render', '--dry-run'], False),
+    ('export --only feed', ['ai_hr_weekly.py', 'export', '--only', 'feed'], False),
+    ('curate --dry-run', ['ai_hr_weekly.py', 'curate', '--dry-run'], False),
+    ('scrape --dry-run', ['ai_hr_weekly.py', 'scrape', '--dry-run', '--sources', 'feeds'], True),
+]
+
+
+def parse_importtime(stderr):
+    """返回 ({模块: 累计微秒}（只含顶层）, 所有导入过的模块名集合)"""
+    top, seen = {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seen.add(name.strip())
+        if not name[1:].startswith(' '):
+            top[name.strip()] = int(cumulative)
+    return top, seen
+
+
+def run(tmp, args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=tmp, capture_output=True,
+                          text=True, timeout=120)
+    elapsed = time.perf_counter() - start
+    top, seen = parse_importtime(proc.stderr)
+    return elapsed, top, seen
+
+
+def main():
+    parser = argparse.ArgumentParser(description='命令行冷启动基准（python -X importtime）')
+    parser.add_argument('repeat', nargs='?', type=int, default=5, help='每条命令的运行次数')
+    args = parser.parse_args()
+
+    repeat = args.repeat
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in os.listdir(ROOT):
+            if name.endswith('.py'):
+                shutil.copy(os.path.join(ROOT, name), tmp)
+        for name in COPY:
+            src = os.path.join(ROOT, name)
+            if os.path.isdir(src):
+                shutil.copytree(src, os.path.join(tmp, name))
+            elif os.path.exists(src):
+                shutil.copy(src, tmp)
+
+        print(f"{'命令':<22}{'进程(ms)':>10}{'导入(ms)':>10}  最重的顶层模块")
+        for label, args, network_ok in COMMANDS:
+            runs = [run(tmp, args) for _ in range(repeat)]
+            wall = statistics.median(elapsed for elapsed, _, _ in runs)
+            imports = statistics.median(sum(top.values()) for _, top, _ in runs)
+            top, seen = runs[-1][1], runs[-1][2]
+            heavy = sorted(top.items(), key=lambda item: -item[1])[:3]
+            loaded = [module for module in NETWORK if module in seen]
+            if loaded and not network_ok:
+                ok = False
+            print(f"{label:<22}{wall * 1000:>10.0f}{imports / 1000:>10.1f}  "
+                  + '，'.join(f"{name} {us / 1000:.0f}" for name, us in heavy)
+                  + (f"  [网络库: {', '.join(loaded)}]" if loaded else ''))
+    print('[OK] render/export/curate 未加载网络库' if ok else '[FAIL] 不需要联网的命令加载了网络库')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正文提取 + TextRank 摘要基准
+先用 fixtures/article_page.html 校验正文提取（导航、侧栏、相关推荐、评论、页脚都应被去掉），
+再把合成正文填进同一个页面模板生成 n 个页面，比较逐页处理和 summarize_pages 进程池
+在不同工作进程数下的吞吐。进程池的收益与CPU核数成正比，单核机器上只能看到调度开销。
+用法：python benchmarks/bench_summary.py [页面数] [每页段落数]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from article_summary import extract_main_text, summarize, summarize_page, summarize_pages  # noqa: E402
+from classifier import default_classifier  # noqa: E402
+from corpus import make_text  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, 'benchmarks', 'fixtures', 'article_page.html')
+TITLE = 'AI面试官上岗一年：某互联网公司招聘流程改造复盘'
+# 不应出现在正文里的片段：导航、侧栏、相关推荐、评论、页脚
+NOISE = ['快讯', '热门文章', '相关推荐', '写得很好', '京ICP备', '作者：']
+
+
+def verify():
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    text = extract_main_text(html)
+    summary = summarize(text)
+    leaked = [noise for noise in NOISE if noise in text]
+    ok = text.count('\n') == 6 and not leaked and bool(summary)
+    print(f"{'[OK]' if ok else '[FAIL]'} 正文 {len(text)} 字，7 段，混入噪声: {leaked or '无'}")
+    print(f"  摘要: {summary}")
+    print(f"  分类: 只看标题 {default_classifier.categorize(TITLE)}，"
+          f"标题+摘要 {default_classifier.categorize(TITLE, summary)}")
+    return ok, html
+
+
+def build_pages(template, n, paragraphs, seed=42):
+    """把模板正文替换成合成段落"""
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(n):
+        body = ''.join('<p>' + '，'.join(make_text(rng, 8, 0.1) for _ in range(rng.randint(2, 4))) + '。</p>'
+                       for _ in range(paragraphs))
+        pages.append(re.sub(r'(<div class="articleDetailContent rich-text">).*?(</div>)',
+                            lambda m: m.group(1) + body + m.group(2), template, flags=re.S))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='正文提取 + TextRank 摘要基准')
+    parser.add_argument('n', nargs='?', type=int, default=400, help='页面数')
+    parser.add_argument('paragraphs', nargs='?', type=int, default=20, help='每页段落数')
+    args = parser.parse_args()
+
+    n, paragraphs = args.n, args.paragraphs
+    ok, template = verify()
+
+    pages = build_pages(template, n, paragraphs)
+    size = sum(len(page) for page in pages) / n / 1024
+    print(f"\n{n} 个页面，每页 {paragraphs} 段（约 {size:.0f}KB），CPU {os.cpu_count()} 核")
+    print(f"{'实现':<18}{'耗时(s)':>10}{'页/秒':>10}")
+
+    start = time.perf_counter()
+    baseline = [summarize_page(page) for page in pages]
+    elapsed = time.perf_counter() - start
+    print(f"{'逐页':<18}{elapsed:>10.3f}{n / elapsed:>10.1f}")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        results = summarize_pages(pages, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        ok &= results == baseline
+        print(f"{f'进程池 x{workers}':<18}{elapsed:>10.3f}{n / elapsed:>10.1f}")
+    print('[OK] 各实现结果一致' if ok else '[FAIL] 结果不一致')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
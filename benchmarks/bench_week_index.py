@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按周时间索引基准
+校验：ISO周跨年（2025-12-29 属于 2026年第1周）、旧的 days//7 算法与ISO周不一致的天数、
+第10周排在第9周之前（页面卡片、存档 weeks()）、旧库补 iso_week 列（有日期时按日期重算周）、按周区间查询跨年正确。
+计时：多年存档（corpus.make_articles，每周约200篇）上
+  取一周的计数     扫描全部文章并 Counter  vs  TimeIndex.get（O(1)）
+  一年的区间       逐篇比较周键           vs  TimeIndex.range（二分）
+  存档区间查询     读出全部再筛选          vs  query(weeks=...)（iso_week 索引）
+用法：python benchmarks/bench_week_index.py [文章数，默认104000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore  # noqa: E402
+from corpus import make_articles  # noqa: E402
+from site_renderer import render_cards  # noqa: E402
+from week_index import TimeIndex, WeekKey, sort_key, week_info, week_label  # noqa: E402
+
+
+def old_week_label(day):
+    """auto_update_articles 以前的算法：(今天 - 1月1日).days // 7 + 1"""
+    return f"{day.year}年第{(day - date(day.year, 1, 1)).days // 7 + 1}周"
+
+
+def check(ok, message):
+    print(f"{'[OK]' if ok else '[FAIL]'} {message}")
+    return ok
+
+
+def verify():
+    ok = True
+    boundary = [(date(2025, 12, 29), '2026年第1周'), (date(2027, 1, 1), '2026年第53周'),
+                (date(2026, 3, 2), '2026年第10周'), (date(2021, 1, 3), '2020年第53周')]
+    ok &= check(all(WeekKey.from_date(day).label == label for day, label in boundary),
+                '跨年日期按ISO周归属：' + '，'.join(f"{day} -> {label}" for day, label in boundary))
+    label, _ = week_info(datetime(2025, 12, 31, 9))
+    _, monday = week_info(datetime(2025, 12, 31, 9), week_start=True)
+    ok &= check(label == '2026年第1周' and monday == '2025年12月29日',
+                f"week_info(2025-12-31) -> {label}，本周一 {monday}")
+    days = [date(2026, 1, 1) + timedelta(days=i) for i in range(365)]
+    differ = sum(old_week_label(day) != WeekKey.from_date(day).label for day in days)
+    print(f"[INFO] 2026年有 {differ} 天旧算法（days//7）与ISO周不一致，两个脚本以前会写出不同的周")
+
+    weeks = ['2026年第9周', '2026年第10周', '2025年第52周', '未分类']
+    ok &= check(sorted(weeks, key=sort_key, reverse=True) == ['2026年第10周', '2026年第9周', '2025年第52周', '未分类'],
+                f"字符串排序 {sorted(weeks, reverse=True)[:2]}，按周键 {sorted(weeks, key=sort_key, reverse=True)[:2]}")
+    cards = render_cards([{'title': w, 'week': w, 'link': w} for w in weeks])
+    ok &= check(cards.index('2026年第10周') < cards.index('2026年第9周') < cards.index('未分类'),
+                '预渲染卡片按周序号从新到旧')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 旧库：没有 iso_week 列
+        path = os.path.join(tmp, 'old.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE articles (link TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, '
+                     'category TEXT, source TEXT, week TEXT, date TEXT, first_seen REAL, updated_at REAL)')
+        conn.executemany('INSERT INTO articles (link, title, category, source, week) VALUES (?, ?, ?, ?, ?)',
+                         [(f"https://x/{w}", w, 'SSC', '36氪', w) for w in weeks])
+        # 旧算法把 2026-03-02（ISO第10周的周一）记成第9周
+        day = date(2026, 3, 2)
+        conn.execute('INSERT INTO articles (link, title, category, source, week, date) VALUES (?, ?, ?, ?, ?, ?)',
+                     ('https://x/legacy', 'legacy', 'SSC', '36氪', old_week_label(day), day.strftime('%Y年%m月%d日')))
+        conn.commit()
+        conn.close()
+        store = ArticleStore(path, seed_json=None)
+        legacy = store.query(weeks=('2026年第10周', '2026年第10周'))
+        ok &= check(old_week_label(day) == '2026年第9周' and sorted(a['link'] for a in legacy)
+                    == ['https://x/2026年第10周', 'https://x/legacy'] and legacy[0]['week'] == '2026年第10周',
+                    f"旧库按日期重算周：{day} 的 {old_week_label(day)} -> {[a['week'] for a in legacy]}")
+        labels = [week_label(key) for key in store.weeks()]
+        ok &= check(labels == ['2026年第10周', '2026年第9周', '2025年第52周', '未分类'],
+                    f"旧库补 iso_week 后 weeks(): {labels}")
+        found = [a['week'] for a in store.query(weeks=('2025年第50周', '2026年第9周'))]
+        ok &= check(found == ['2026年第9周', '2025年第52周'], f"跨年区间查询 2025-W50..2026-W09: {found}")
+        index = store.time_index()
+        ok &= check(index.weeks() == ['2026年第10周', '2026年第9周', '2025年第52周'] and index.unknown == 1,
+                    f"time_index(): {len(index)} 周，无法识别 {index.unknown} 篇")
+        store.close()
+    return ok
+
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench(n):
+    articles = make_articles(n)
+    index_seconds, index = timed(lambda: TimeIndex.from_articles(articles), 1)
+    weeks = index.weeks()
+    target = weeks[len(weeks) // 2]
+    # 约一年的区间；周数不够时取能取到的最早/最近一周
+    start, end = (WeekKey.parse(weeks[min(i, len(weeks) - 1)]) for i in (60, 8))
+
+    ok = True
+    rows = []
+    scan, counts = timed(lambda: Counter(a['category'] for a in articles if a['week'] == target))
+    lookup, partition = timed(lambda: index.get(target).categories)
+    ok &= counts == partition
+    rows.append(('取一周的分类计数', scan, lookup))
+
+    scan, found = timed(lambda: [a for a in articles if start <= WeekKey.parse(a['week']) <= end])
+    ranged, partitions = timed(lambda: index.range(start, end))
+    ok &= len(found) == sum(p.count for p in partitions)
+    rows.append((f"{len(partitions)} 周的区间", scan, ranged))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArticleStore(os.path.join(tmp, 'bench.db'), seed_json=None)
+        store.upsert(articles)
+        scan, found = timed(lambda: [a for a in store.query() if start <= WeekKey.parse(a['week']) <= end], 1)
+        ranged, result = timed(lambda: store.query(weeks=(start, end)), 3)
+        ok &= len(found) == len(result) and store.weeks()[0].label == weeks[0]
+        rows.append(('存档区间查询', scan, ranged))
+        grouped, stored = timed(lambda: store.time_index(), 1)
+        ok &= stored.weeks() == weeks and stored.get(target).sources == index.get(target).sources
+        store.close()
+
+    print(f"\n{n} 篇，{len(weeks)} 周（{weeks[-1]} ~ {weeks[0]}）；"
+          f"TimeIndex 构建 {index_seconds * 1000:.0f}ms，存档分组构建 {grouped * 1000:.0f}ms")
+    print(f"{'操作':<20}{'扫描(ms)':>12}{'索引(ms)':>12}{'加速':>10}")
+    for label, before, after in rows:
+        print(f"{label:<20}{before * 1000:>12.3f}{after * 1000:>12.3f}{before / max(after, 1e-9):>9.0f}x")
+    return check(ok, '索引结果与全量扫描一致')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按周时间索引基准')
+    parser.add_argument('n', nargs='?', type=int, default=104000, help='文章数')
+    args = parser.parse_args()
+
+    n = args.n
+    ok = verify()
+    ok &= bench(n)
+    print('[OK] 校验通过' if ok else '[FAIL] 校验失败')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准用的合成语料（固定随机种子，结果可复现）
+make_corpus 生成 (标题, 描述) 供分类器基准使用；make_articles 生成完整的文章字典，
+按周分布，供整条流水线的保存/渲染阶段使用。大语料会缓存到 benchmarks/.cache/
+用法：python benchmarks/corpus.py 1000000   # 预先生成并缓存
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# 填充词与关键词分开抽样，关键词密度接近真实的标题和正文
+FILLER = ['如何', '帮助', '企业', '通过', '技术', '应用', '提升', '效率', '全面', '方式',
+          '正在', '改变', '实现', '科学', '精细化', '案例', '员工', '数据', '团队', '工具',
+          '模式', '策略', '经验', '研究', '报告', '市场', '行业', '增长', '创新', '管理',
+          '实践', '趋势', '平台', '系统', '未来', '领导力', 'People Analytics', 'HR', 'model']
+KEYWORDS = ['薪酬', '招聘', '组织', '文化', '共享服务', 'ChatGPT', 'AI', '人工智能', '绩效', 'RPA']
+
+SOURCES = ['36氪', '知乎', 'HRoot', 'SHRM', '三茅人力资源网', 'LinkedIn领英', '人力资源智享会']
+CATEGORIES = ['薪酬福利', '人才发展', '组织发展', '企业文化', 'SSC']
+
+
+def make_text(rng, words, density):
+    return ''.join(rng.choice(KEYWORDS) if rng.random() < density else rng.choice(FILLER)
+                   for _ in range(words))
+
+
+def make_corpus(n, sentences=(3, 6), seed=42):
+    """生成 n 条 (标题, 描述)；sentences 控制描述长度，长文本的关键词更稀疏"""
+    rng = random.Random(seed)
+    density = 0.2 if sentences[1] <= 10 else 0.02
+    corpus = []
+    for _ in range(n):
+        title = make_text(rng, rng.randint(4, 8), 0.3)
+        desc = '，'.join(make_text(rng, 6, density) for _ in range(rng.randint(*sentences)))
+        corpus.append((title, desc))
+    return corpus
+
+
+def week_count(n):
+    """每周约200篇，最多10年"""
+    return max(1, min(520, n // 200))
+
+
+def make_articles(n, seed=42):
+    """生成 n 篇文章，均匀分布在 week_count(n) 个连续的ISO周里（最新一周在 2026-W09）"""
+    rng = random.Random(seed)
+    weeks = []
+    monday = date(2026, 2, 23)
+    for i in range(week_count(n)):
+        day = monday - timedelta(weeks=i)
+        iso_year, iso_week, _ = day.isocalendar()
+        weeks.append((f"{iso_year}年第{iso_week}周", day.strftime('%Y年%m月%d日')))
+
+    articles = []
+    for (title, desc), i in zip(make_corpus(n, seed=seed), range(n)):
+        week, day = weeks[i % len(weeks)]
+        source = rng.choice(SOURCES)
+        articles.append({
+            'title': f"{title}（{i}）",
+            'description': desc,
+            'category': rng.choice(CATEGORIES),
+            'source': source,
+            'link': f"https://bench.example.com/{i}",
+            'week': week,
+            'date': day,
+        })
+    return articles
+
+
+def load_articles(n, seed=42):
+    """读取缓存的语料，没有则生成并缓存"""
+    path = os.path.join(CACHE_DIR, f"articles-{n}-{seed}.json")
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    articles = make_articles(n, seed)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(articles, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+    return articles
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='预先生成并缓存基准用的合成语料')
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000], help='文章数，可给多个')
+    for n in parser.parse_args().sizes:
+        print(f"{n}: {len(load_articles(n))} 篇")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地桩服务器：用 fixtures 里录制的页面冒充36氪/知乎搜索页，基准测试不访问外网
+  /search/articles/<关键词>  -> fixtures/36kr_search.html
+  /search?q=...             -> fixtures/zhihu_search.html
+  /status/<状态码>           -> 直接返回该状态码（429/503 时带 Retry-After: 0，?retry_after= 可指定），
+                               模拟被封或故障的来源
+  /hang                     -> 挂起 hang 秒且不响应，模拟无响应的来源
+  /sleep/<秒数>              -> 等待指定秒数后返回200（测试并发和结果顺序）
+  /redirect?to=<路径>        -> 302 重定向到该路径（链接检查用）
+  /nohead/...               -> HEAD 返回405，GET 正常返回（模拟不支持HEAD的站点）
+  /article/...              -> fixtures/article_page.html（文章正文页）
+  /feed                     -> fixtures/feed.xml（RSS，带 ETag，If-None-Match 匹配时返回304）
+  /                         -> 200 的首页
+支持 HEAD 请求（不带正文）。server.hits 按路径（含查询串）统计收到的请求次数。
+delay 参数模拟网络延迟（秒）。
+用法：python benchmarks/stub_server.py [端口] [延迟秒数]
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ROUTES = [
+    ('/article/', 'article_page.html'),
+    ('/feed', 'feed.xml'),
+    ('/search/articles/', '36kr_search.html'),
+    ('/search', 'zhihu_search.html'),
+]
+
+
+def load_pages():
+    pages = {}
+    for _, name in ROUTES:
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            pages[name] = f.read()
+    return pages
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    pages = {}
+    delay = 0
+    hang = 30
+
+    def _count(self):
+        with self.server.lock:
+            self.server.hits[self.path] += 1
+
+    def do_HEAD(self):
+        if self.path.startswith('/nohead'):
+            self._count()
+            self.send_error(405)
+            return
+        self.do_GET(head=True)
+
+    def _send_page(self, body, head):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_feed(self, body, head):
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def do_GET(self, head=False):
+        self._count()
+        if self.path.startswith('/redirect'):
+            target = parse_qs(urlsplit(self.path).query).get('to', ['/'])[0]
+            self.send_response(302)
+            self.send_header('Location', target)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/' or self.path.startswith('/nohead'):
+            self._send_page(b'<html><body>stub</body></html>', head)
+            return
+        if self.path.startswith('/status/'):
+            code = int(self.path.split('/')[2].split('?')[0])
+            retry_after = parse_qs(urlsplit(self.path).query).get('retry_after', ['0' if code in (429, 503) else None])[0]
+            self.send_response(code)
+            if retry_after is not None:
+                self.send_header('Retry-After', retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path.startswith('/sleep/'):
+            time.sleep(float(self.path.split('/')[2].split('?')[0]))
+            self._send_page(self.path.encode('utf-8'), head)
+            return
+        if self.path.startswith('/hang'):
+            time.sleep(self.hang)  # 客户端早已超时断开，不再写响应
+            self.close_connection = True
+            return
+        for prefix, name in ROUTES:
+            if self.path.startswith(prefix):
+                if self.delay:
+                    time.sleep(self.delay)
+                if name == 'feed.xml':
+                    self._send_feed(self.pages[name], head)
+                else:
+                    self._send_page(self.pages[name], head)
+                return
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, delay=0, hang=30):
+    """在后台线程启动服务器，返回 (server, base_url)；用完调用 server.shutdown()"""
+    handler = type('Handler', (StubHandler,), {'pages': load_pages(), 'delay': delay, 'hang': hang})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.hits = Counter()
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='本地桩服务器：用录制的页面冒充36氪/知乎搜索页')
+    parser.add_argument('port', nargs='?', type=int, default=8765, help='端口')
+    parser.add_argument('delay', nargs='?', type=float, default=0, help='模拟的响应延迟（秒）')
+    args = parser.parse_args()
+    server, url = start_stub_server(args.port, args.delay)
+    print(f"桩服务器已启动: {url}  (Ctrl+C 退出)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量构建
+每个生成物（hr_news_data.json、search_index.json、data/ 周分片、页面、feed.xml、发布文件）声明自己的输入：
+规范化后的文章集合哈希、页面模板（去掉数据槽内容）哈希、生成它的代码文件哈希等。
+与 .build_manifest.json 里上次记录的输入哈希比较，只重新生成输入变了或文件缺失的输出；
+文章内容不变时，两个脚本都不会改写任何发布的文件，也就不会触发部署和缓存失效。
+dry_run=True 时只报告哪些输出会重新生成（以及原因），不写任何文件
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import article_store
+import feeds
+import publish as publisher
+import search_index
+import site_renderer
+import week_index
+import week_shards
+from publish import ASSETS_SLOT
+from site_renderer import CARDS_SLOT, DATA_SLOT, write_atomic
+from week_index import week_code, week_label
+
+BUILD_MANIFEST = '.build_manifest.json'
+# 存档不超过这么多篇时页面内嵌所有周：直接用浏览器打开（file://）取不到分片，也能看到更早的周
+EMBED_ALL_LIMIT = 500
+# 各输出的状态 -> (标记, 说明)，打印构建结果用
+BUILD_STATUS = {
+    'built': ('[OK]', '已生成'),
+    'unchanged': ('[SKIP]', '未变化'),
+    'would-build': ('[DRY]', '将重新生成'),
+    'failed': ('[WARN]', '生成失败'),
+    'skipped': ('[SKIP]', '上游失败，跳过'),
+}
+
+
+def digest_bytes(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_digest(path):
+    """文件内容哈希，文件不存在时为 None"""
+    try:
+        with open(path, 'rb') as f:
+            return digest_bytes(f.read())
+    except OSError:
+        return None
+
+
+def template_digest(path, slots=(DATA_SLOT, CARDS_SLOT, ASSETS_SLOT)):
+    """页面模板哈希：数据槽里的内容是生成的，不算模板的一部分"""
+    with open(path, 'r', encoding='utf-8') as f:
+        page = f.read()
+    for start_marker, end_marker in slots:
+        start = page.find(start_marker)
+        end = page.find(end_marker, start + len(start_marker)) if start != -1 else -1
+        if start != -1 and end != -1:
+            page = page[:start + len(start_marker)] + page[end:]
+    return digest_bytes(page.encode('utf-8'))
+
+
+def source_digest(*modules):
+    """生成器代码（可以是几个模块）的哈希，改了导出逻辑也会触发重新生成"""
+    return '+'.join(file_digest(module.__file__) for module in modules)
+
+
+class BuildGraph:
+    """按顺序执行的构建节点；节点的输入可以是字典，也可以是在轮到它时才计算的函数（依赖上游产物）"""
+
+    def __init__(self, manifest_path=BUILD_MANIFEST, dry_run=False, metrics=None):
+        self.manifest_path = manifest_path
+        self.dry_run = dry_run
+        self.metrics = metrics
+        self.nodes = []
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.changed = False
+
+    def add(self, name, inputs, build, outputs=(), deps=()):
+        """build(changed) 生成输出并返回一句说明；changed 为变化的输入名集合（首次构建时为 None）"""
+        self.nodes.append({'name': name, 'inputs': inputs, 'build': build,
+                           'outputs': list(outputs), 'deps': list(deps)})
+
+    def run(self):
+        """返回 [(节点名, 状态, 说明)]，状态为 built / unchanged / would-build / failed / skipped"""
+        results = []
+        status_of = {}
+        for node in self.nodes:
+            name = node['name']
+            upstream = [status_of.get(dep) for dep in node['deps']]
+            if 'failed' in upstream or 'skipped' in upstream:
+                status, detail = 'skipped', '上游生成失败'
+            elif self.dry_run and 'would-build' in upstream:
+                status, detail = 'would-build', f"上游 {', '.join(node['deps'])} 会重新生成"
+            else:
+                try:
+                    status, detail = self._run_node(node)
+                except Exception as e:
+                    # 失败的输出不记入清单，下次运行会重试；不依赖它的输出照常生成
+                    status, detail = 'failed', str(e)
+            status_of[name] = status
+            results.append((name, status, detail))
+            if self.metrics is not None:
+                self.metrics.inc('build_outputs_total', status=status)
+        return results
+
+    def _run_node(self, node):
+        name = node['name']
+        inputs = node['inputs']() if callable(node['inputs']) else node['inputs']
+        previous = self.manifest.get(name, {}).get('inputs')
+        missing = [path for path in node['outputs'] if not os.path.exists(path)]
+        if previous is None:
+            changed, reason = None, '首次构建'
+        else:
+            changed = {key for key in set(inputs) | set(previous) if inputs.get(key) != previous.get(key)}
+            reason = f"输入变化: {', '.join(sorted(changed))}" if changed else ''
+        if missing:
+            reason = '；'.join(filter(None, [reason, f"输出缺失: {', '.join(missing)}"]))
+            changed = None
+        if not reason:
+            return 'unchanged', ''
+        if self.dry_run:
+            return 'would-build', reason
+
+        if self.metrics is not None:
+            with self.metrics.span('build', hot=True, output=name):
+                detail = node['build'](changed)
+        else:
+            detail = node['build'](changed)
+        self.manifest[name] = {'inputs': inputs, 'built': datetime.now().isoformat(timespec='seconds')}
+        self.changed = True
+        return 'built', detail or reason
+
+    def save(self):
+        if self.dry_run or not self.changed:
+            return
+        write_atomic(self.manifest_path, json.dumps(self.manifest, ensure_ascii=False, indent=2, sort_keys=True))
+
+
+def site_graph(store, page, data_file='hr_news_data.json', index_file=search_index.INDEX_FILE,
+               shard_dir='data', feed_file=feeds.FEED_FILE, dry_run=False, metrics=None,
+               manifest_path=BUILD_MANIFEST):
+    """两个脚本共用的构建图：导出JSON、搜索索引、周分片、页面、RSS，最后发布"""
+    graph = BuildGraph(manifest_path, dry_run=dry_run, metrics=metrics)
+    articles = store.digest()
+    latest = week_shards.latest_week(store)
+    manifest_file = os.path.join(shard_dir, week_shards.MANIFEST)
+
+    def build_shards(changed):
+        # 只有文章变了时按本次触及的周增量导出；代码变了或首次构建时全部重新导出
+        weeks = store.touched_weeks if changed == {'articles'} and store.touched_weeks else None
+        written = week_shards.export_shards(store, shard_dir, weeks=weeks)
+        store.touched_weeks.clear()
+        if metrics is not None:
+            metrics.inc('shards_written_total', written)
+        return f"改写 {written} 个分片"
+
+    embed_all = store.count() <= EMBED_ALL_LIMIT
+
+    def build_page(changed):
+        # 只预渲染最新一周，更早的周由页面按需加载分片；存档不大时内嵌全部周，取不到分片时使用
+        latest_items = store.query(week=latest)
+        if embed_all:
+            site_renderer.render_page(page, store.query(), cards=latest_items)
+            return f"最新一周 {week_label(latest)}，内嵌全部 {store.count()} 篇"
+        site_renderer.render_page(page, latest_items)
+        return f"最新一周 {week_label(latest)}"
+
+    def build_feed(changed):
+        # 订阅源只放最新一周，与页面内嵌的数据一致
+        feeds.write_feed(store.query(week=latest), feed_file)
+        return f"最新一周 {week_label(latest)}"
+
+    def build_publish(changed):
+        # 只更新本次渲染的页面的资源表，另一个页面的数据槽和资源表保持一致
+        stats = publisher.publish(shard_dir, pages=[page])
+        if metrics is not None:
+            metrics.inc('published_bytes_total', stats['raw'], encoding='identity')
+            metrics.inc('published_bytes_total', stats['.gz'], encoding='gzip')
+        return publisher.summary(stats)
+
+    graph.add(data_file, {'articles': articles, 'code': source_digest(article_store, week_index)},
+              lambda changed: store.export_json(data_file, force=True) and '已导出',
+              outputs=[data_file])
+    graph.add(index_file, {'articles': articles, 'code': source_digest(search_index)},
+              lambda changed: f"{search_index.write_index(store, index_file)} 篇",
+              outputs=[index_file])
+    graph.add(manifest_file, {'articles': articles, 'code': source_digest(week_shards, week_index)},
+              build_shards, outputs=[manifest_file])
+    latest_articles = store.digest(latest)
+    graph.add(page, {'articles': articles if embed_all else latest_articles, 'week': week_code(latest),
+                     'template': template_digest(page), 'code': source_digest(site_renderer, week_index)},
+              build_page, outputs=[page])
+    graph.add(feed_file, {'articles': latest_articles, 'week': week_code(latest), 'site': feeds.SITE_URL,
+                          'code': source_digest(feeds)},
+              build_feed, outputs=[feed_file])
+    # 每个页面一个发布节点：两个脚本（两个页面）共用构建清单，各自记录自己的页面上次发布时的输入
+    graph.add(f"publish {page}", lambda: {'data': file_digest(data_file), 'search': file_digest(index_file),
+                                          'manifest': file_digest(manifest_file),
+                                          'code': source_digest(publisher)},
+              build_publish, deps=[data_file, index_file, manifest_file])
+    return graph
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享关键词分类器
+分类关键词和AI关键词合并成一张表，两个脚本共用；整张表编译成一个正则交替式，
+一次扫描即可同时得到分类、AI相关性和命中关键词
+"""
+
+import re
+from collections import namedtuple
+
+# 分类关键词表（按优先级排列，命中多个分类时排在前面的胜出）。
+# 不收 '发展'：它是 '组织发展' 的一部分，会让组织类文章被更靠前的人才发展抢走
+CATEGORY_KEYWORDS = {
+    '薪酬福利': ['薪酬', '福利', '绩效', '激励', '工资', '奖金'],
+    '人才发展': ['招聘', '面试', '人才', '培训', '学习', '离职', '继任', '晋升'],
+    '组织发展': ['组织', '架构', '变革', '效能', 'OD', '转型', '数字化'],
+    '企业文化': ['文化', '价值观', '员工体验', '雇主品牌'],
+    'SSC': ['SSC', 'HRSSC', '共享服务', '自助服务', 'RPA', '自动化', '流程'],
+}
+
+AI_KEYWORDS = ['AI', '人工智能', '机器学习', '自动化', 'ChatGPT',
+               'GPT', '算法', '智能', '大数据', 'RPA']
+
+DEFAULT_CATEGORY = '人才发展'
+
+Classification = namedtuple('Classification', ['category', 'ai_related', 'keywords'])
+
+
+def _atom(ch):
+    """英文字母不区分大小写"""
+    return '[' + ch + ch.upper() + ']' if 'a' <= ch <= 'z' else re.escape(ch)
+
+
+def _branches(node, word):
+    """前缀树的一个节点 -> 正则片段；更长的延续排在前面，同一位置取最长的词"""
+    branches = [_atom(ch) + _branches(child, word) for ch, child in sorted(node.items()) if ch]
+    if '' in node:
+        branches.append('(?![a-zA-Z])' if word else '')
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+
+def _alternation(keywords):
+    """关键词按前缀树编译成一个交替式：同一首字的词共用一个分支，每个位置最多尝试一个分支。
+    每个分支都以字面字符开头，re 会据此先跳过不可能匹配的位置（re.IGNORECASE 会让这一步失效，
+    所以英文首字母的大小写各写一个分支）；英文关键词要求是完整单词，边界检查放在第一个字母之后"""
+    root = {}
+    for kw in keywords:
+        node = root
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    branches = []
+    for ch, child in sorted(root.items()):
+        if 'a' <= ch <= 'z':
+            rest = '(?<![a-zA-Z].)' + _branches(child, True)
+            branches += [ch + rest, ch.upper() + rest]
+        else:
+            branches.append(re.escape(ch) + _branches(child, False))
+    return re.compile('|'.join(branches))
+
+
+class KeywordClassifier:
+    """关键词表只编译一次，单篇和批量分类共用。
+
+    categorize / is_ai_related 直接搜索原文，命中即停；classify 把文本转成小写后
+    findall 一次扫描得到每个位置上最长的关键词；被长词包含的关键词（'人工智能' 中的 '智能'）
+    和与前一个词重叠、因而被跳过的关键词（'绩效能' 中的 '效能'）在编译时算好，命中触发词时补查。
+    """
+
+    def __init__(self, category_keywords=None, ai_keywords=None, default=DEFAULT_CATEGORY):
+        self.category_keywords = category_keywords or CATEGORY_KEYWORDS
+        self.ai_keywords = ai_keywords or AI_KEYWORDS
+        self.default = default
+
+        self.table = [(category, [kw.lower() for kw in keywords])
+                      for category, keywords in self.category_keywords.items()]
+        self.ai = [kw.lower() for kw in self.ai_keywords]
+        self.ascii = {kw for _, keywords in self.table for kw in keywords if kw.isascii()}
+        self.ascii.update(kw for kw in self.ai if kw.isascii())
+        self.vocab = list(dict.fromkeys([kw for _, keywords in self.table for kw in keywords] + self.ai))
+        self.category_of = {}
+        for category, keywords in self.table:
+            for kw in keywords:
+                self.category_of.setdefault(kw, category)
+        self.rank = {category: i for i, (category, _) in enumerate(self.table)}
+        self.ai_set = set(self.ai)
+
+        self.pattern = _alternation(self.vocab)
+        # 只要分类或只判断AI相关时用的单独交替式，命中即停
+        self.category_patterns = [(category, _alternation(keywords)) for category, keywords in self.table]
+        self.ai_pattern = _alternation(self.ai)
+
+        cjk = [kw for kw in self.vocab if kw not in self.ascii]
+        # 扫描取走某个词后还要补查的词（英文按完整单词匹配，不存在包含或重叠）：
+        # 被它包含的短词，以及开头和它的结尾重叠、因而被跳过的词
+        self.followers = {}
+        for a in cjk:
+            for b in cjk:
+                if a != b and (b in a or any(a[-k:] == b[:k] for k in range(1, min(len(a), len(b))))):
+                    self.followers.setdefault(a, []).append(b)
+        # 关键词 -> 分类优先级；只在AI表里的词排在所有分类之后
+        self.keyword_rank = {kw: self.rank[self.category_of[kw]] if kw in self.category_of else len(self.table)
+                             for kw in self.vocab}
+        self.categories = [category for category, _ in self.table] + [self.default]
+
+    def _keywords(self, content):
+        """一次扫描，返回命中关键词：扫描到的按首次出现顺序，补查到的排在后面"""
+        found = dict.fromkeys(self.pattern.findall(content))
+        for kw, others in self.followers.items():
+            if kw in found:
+                for other in others:
+                    if other not in found and other in content:
+                        found[other] = None
+        return list(found)
+
+    def categorize(self, title, description=''):
+        """只返回分类：按优先级逐个分类搜索，命中即停（不必先把长正文转成小写）"""
+        content = title + ' ' + description
+        for category, pattern in self.category_patterns:
+            if pattern.search(content):
+                return category
+        return self.default
+
+    def is_ai_related(self, text):
+        """判断文本是否与AI相关，命中一个关键词就停止"""
+        return self.ai_pattern.search(text) is not None
+
+    def _classify_text(self, content):
+        keywords = self._keywords(content)
+        if not keywords:
+            return Classification(self.default, False, keywords)
+        category = self.categories[min(map(self.keyword_rank.__getitem__, keywords))]
+        return Classification(category, not self.ai_set.isdisjoint(keywords), keywords)
+
+    def classify(self, title, description=''):
+        """单篇完整分类，返回 Classification(category, ai_related, keywords)"""
+        return self._classify_text((title + ' ' + description).lower())
+
+    def classify_many(self, items):
+        """批量分类：items 为 (title, description) 序列，返回同样顺序的结果列表"""
+        classify_text = self._classify_text
+        return [classify_text((title + ' ' + (description or '')).lower())
+                for title, description in items]
+
+
+default_classifier = KeywordClassifier()
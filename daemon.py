@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻更新模式
+一个进程常驻：连接池、HTTP缓存、摘要进程池、编译好的分类器和打开的存档在各轮之间复用，不必每次冷启动；
+只在 stop()/退出时关闭一次。
+每个来源按自己的间隔抓取（间隔带随机抖动，避免总在同一时刻打到同一站点），到期的来源一起并发抓取；
+有新文章时写入存档，构建图只重新生成输入变了的输出（增量导出本周分片），没有新文章时什么都不写。
+精选文章仍由每周的一次性运行添加。
+本地状态接口（默认 127.0.0.1:8787）：
+  /healthz   JSON 状态；有来源超过 3 个间隔没有成功抓取时返回 503
+  /metrics   Prometheus 格式的指标（与 reports/<job>.prom 内容相同）
+"""
+
+import heapq
+import json
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from article_summary import SummaryPool
+
+# 来源 -> (抓取器上返回目标列表的方法, 间隔秒数)
+SCHEDULE = {
+    'feeds': ('targets_feeds', 30 * 60),
+    '36kr': ('targets_36kr', 6 * 3600),
+    'zhihu': ('targets_zhihu', 6 * 3600),
+}
+# 间隔上下浮动的比例
+JITTER = 0.1
+# 连续这么多个间隔没有成功抓取，健康检查报告失败
+STALE_INTERVALS = 3
+DEFAULT_PORT = 8787
+
+
+class Scheduler:
+    """按下次到期时间排队的来源；每个来源抓取后按自己的间隔（带抖动）重新排队"""
+
+    def __init__(self, intervals, jitter=JITTER, now=None, rng=None):
+        self.intervals = intervals
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        now = time.time() if now is None else now
+        # 启动时把各来源的首次抓取错开一点，不同时打出去
+        self.queue = [(now + self.rng.uniform(0, min(60, interval * jitter)), name)
+                      for name, interval in intervals.items()]
+        heapq.heapify(self.queue)
+
+    def next_due(self):
+        return self.queue[0][0]
+
+    def next_run(self, name):
+        return next((due for due, queued in self.queue if queued == name), None)
+
+    def pop_due(self, now):
+        """取出所有已到期的来源，并按 now + 抖动后的间隔重新排队"""
+        due = []
+        while self.queue and self.queue[0][0] <= now:
+            _, name = heapq.heappop(self.queue)
+            due.append(name)
+        for name in due:
+            interval = self.intervals[name]
+            delay = interval * (1 + self.rng.uniform(-self.jitter, self.jitter))
+            heapq.heappush(self.queue, (now + delay, name))
+        return due
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    daemon = None
+
+    def _send(self, code, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/healthz':
+            healthy, status = self.daemon.health()
+            self._send(200 if healthy else 503, json.dumps(status, ensure_ascii=False, indent=2),
+                       'application/json; charset=utf-8')
+        elif path == '/metrics':
+            self._send(200, self.daemon.metrics.prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UpdateDaemon:
+    """常驻的 RealArticleScraper：按计划抓取各来源，增量更新输出，并提供状态接口"""
+
+    def __init__(self, scraper, schedule=None, host='127.0.0.1', port=DEFAULT_PORT, jitter=JITTER):
+        self.scraper = scraper
+        self.metrics = scraper.metrics
+        # 整个进程共用一个摘要进程池，不必每轮重新启动工作进程
+        self.pool = SummaryPool()
+        scraper.summary_pool = self.pool
+        self.schedule = schedule or SCHEDULE
+        self.scheduler = Scheduler({name: interval for name, (_, interval) in self.schedule.items()}, jitter)
+        self.host = host
+        self.port = port
+        self.server = None
+        self.stop_event = threading.Event()
+        self.running = False
+        self.closed = False
+        # 状态由主循环更新，HTTP线程只读（存档连接不能跨线程使用）
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.cycles = 0
+        self.articles = 0
+        self.sources = {name: {'interval': interval, 'last_run': None, 'last_ok': None, 'last_error': None}
+                        for name, (_, interval) in self.schedule.items()}
+
+    def start_server(self):
+        """在后台线程启动状态接口，返回实际监听的端口（port=0 时由系统分配）"""
+        handler = type('Handler', (StatusHandler,), {'daemon': self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address[1]
+
+    def health(self):
+        """返回 (是否健康, 状态字典)"""
+        now = time.time()
+        with self.lock:
+            sources = {}
+            stale = []
+            for name, state in self.sources.items():
+                if (state['last_ok'] or self.started) < now - STALE_INTERVALS * state['interval']:
+                    stale.append(name)
+                next_run = self.scheduler.next_run(name)
+                sources[name] = dict(state, **{key: _iso(state[key]) for key in ('last_run', 'last_ok')},
+                                     next_run=_iso(next_run))
+            status = {'ok': not stale, 'stale': stale, 'uptime_seconds': round(now - self.started),
+                      'cycles': self.cycles, 'articles': self.articles, 'sources': sources}
+        return not stale, status
+
+    def run_cycle(self, names):
+        """抓取一批到期的来源；有新文章时保存并增量生成输出"""
+        scraper = self.scraper
+        targets = {name: getattr(scraper, self.schedule[name][0])() for name in names}
+        print(f"\n[CYCLE] {datetime.now():%Y-%m-%d %H:%M:%S} {', '.join(names)}")
+        self.metrics.ok = True
+        # 上一轮熔断的主机不再整轮跳过，是否放行由冷却期决定
+        scraper.health.new_run()
+        started = time.time()
+        error = None
+        try:
+            with self.metrics.span('cycle'):
+                failed = set(scraper.fetch_and_parse([t for name in names for t in targets[name]]))
+                found = len(scraper.articles)
+                if found:
+                    scraper.save_and_update()
+                    if not scraper.dry_run:
+                        scraper.feed_state.save()
+                else:
+                    print("  [SKIP] 没有新文章，输出保持不变")
+        except Exception as e:
+            self.metrics.fail()
+            error = str(e)
+            failed = {url for name in names for _, url, _ in targets[name]}
+            found = 0
+            print(f"  [FAIL] 本轮更新失败: {e}")
+        finally:
+            scraper.articles = []
+            scraper.cache.save()
+            scraper.health.save()
+            self.metrics.write(scraper.report_dir)
+
+        with self.lock:
+            self.cycles += 1
+            self.articles += found
+            for name in names:
+                state = self.sources[name]
+                state['last_run'] = started
+                urls = [url for _, url, _ in targets[name]]
+                if error is None and not failed.intersection(urls):
+                    state['last_ok'] = started
+                    state['last_error'] = None
+                else:
+                    state['last_error'] = error or f"抓取失败: {', '.join(u for u in urls if u in failed)}"
+        print(f"  [OK] 本轮耗时 {time.time() - started:.2f}s，下次: " + '，'.join(
+            f"{name} {_iso(self.scheduler.next_run(name))}" for name in self.schedule))
+
+    def stop(self, *args):
+        """结束主循环；主循环没有在运行时直接释放资源，否则由主循环退出时释放"""
+        self.stop_event.set()
+        if not self.running:
+            self.close()
+
+    def close(self):
+        """关闭状态接口、摘要进程池、抓取引擎和存档；可重复调用"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.pool.close()
+        self.scraper.close()
+
+    def run(self):
+        """主循环，直到 SIGTERM/SIGINT"""
+        port = self.start_server()
+        signal.signal(signal.SIGTERM, self.stop)
+        print(f"[DAEMON] 已启动，状态接口 http://{self.host}:{port}/healthz 和 /metrics")
+        self.running = True
+        try:
+            while not self.stop_event.is_set():
+                if self.stop_event.wait(max(0.0, self.scheduler.next_due() - time.time())):
+                    break
+                with self.lock:
+                    names = self.scheduler.pop_due(time.time())
+                self.run_cycle(names)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.running = False
+            self.close()
+            print("[DAEMON] 已退出")
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else None
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复检测
+标题和描述分别做字符二元组（适合中文）的MinHash签名，用LSH分桶找候选，
+再用精确的Jaccard相似度确认；分桶存在文章库的SQLite里，对大存档的查询是亚线性的。
+占位描述（抓取时填的固定文案）不参与分桶和比较，否则任意两篇占位文章都会被判为重复
+"""
+
+import hashlib
+import random
+import re
+import struct
+
+from article_store import article_key
+
+NUM_PERM = 32
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.4
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260301)  # 固定种子，签名跨运行稳定
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_NON_WORD = re.compile(r'[\W_]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash_buckets (
+    bucket INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    UNIQUE(bucket, key)
+);
+CREATE INDEX IF NOT EXISTS idx_minhash_buckets_key ON minhash_buckets(key);
+"""
+
+
+def shingles(text, k=2):
+    """去掉标点空白后的字符k元组"""
+    text = _NON_WORD.sub('', (text or '').lower())
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set):
+    """MinHash签名：每个排列下shingle哈希的最小值"""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+              for s in shingle_set]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def bucket_keys(field, signature):
+    """签名切成 BANDS 段，每段哈希成一个64位有符号整数（SQLite INTEGER）"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        packed = field.encode('utf-8') + struct.pack(f'>B{ROWS}Q', band, *rows)
+        keys.append(int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), 'big', signed=True))
+    return keys
+
+
+def _fields(article, placeholders):
+    """参与比较的 (标题, 描述)；占位描述当作空"""
+    description = article.get('description')
+    if description in placeholders:
+        description = None
+    return {'title': article.get('title'), 'description': description}
+
+
+def article_buckets(article, placeholders=frozenset()):
+    keys = []
+    for field, text in _fields(article, placeholders).items():
+        signature = minhash(shingles(text))
+        if signature:
+            keys.extend(bucket_keys(field, signature))
+    return keys
+
+
+def similarity(a, b, placeholders=frozenset()):
+    """标题和描述各自的Jaccard取较大值；占位描述不计"""
+    a, b = _fields(a, placeholders), _fields(b, placeholders)
+    return max(jaccard(shingles(a['title']), shingles(b['title'])),
+               jaccard(shingles(a['description']), shingles(b['description'])))
+
+
+class Deduplicator:
+    """保存前的去重阶段：新文章与存档及本批已接受的文章比对；
+    placeholders 为占位描述文案，这些描述不参与比较"""
+
+    def __init__(self, store, threshold=THRESHOLD, placeholders=()):
+        self.store = store
+        self.conn = store.conn
+        self.threshold = threshold
+        self.placeholders = frozenset(placeholders)
+        # 旧版本按 link 分桶；分桶可以从存档重建，直接丢掉
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(minhash_buckets)')}
+        if 'link' in columns:
+            self.conn.execute('DROP TABLE minhash_buckets')
+        self.conn.executescript(SCHEMA)
+        self._backfill()
+
+    def _backfill(self):
+        """存档里还没分桶的文章补建索引（通常只在第一次运行时发生）"""
+        rows = self.conn.execute(
+            'SELECT link, title, description FROM articles '
+            'WHERE key NOT IN (SELECT DISTINCT key FROM minhash_buckets)').fetchall()
+        if rows:
+            self.add([dict(row) for row in rows])
+
+    def add(self, articles):
+        """把文章加入LSH索引"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO minhash_buckets (bucket, key) VALUES (?, ?)',
+                [(bucket, article_key(article['link'], article.get('title')))
+                 for article in articles if article.get('link')
+                 for bucket in article_buckets(article, self.placeholders)])
+
+    def _archived(self, keys):
+        """按存档主键取文章，返回 {key: 文章}"""
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        rows = self.conn.execute(
+            f'SELECT key, link, title, description FROM articles WHERE key IN ({placeholders})', list(keys))
+        return {row['key']: dict(row) for row in rows}
+
+    def report(self, duplicates):
+        """重复报告的文本行"""
+        return [f"  [DUP] {dup.get('title')} -> {kept.get('title')} ({kept.get('link')}, 相似度 {score})"
+                for dup, kept, score in duplicates]
+
+    def filter(self, articles):
+        """返回 (保留的文章, 重复报告)；报告每项为 (重复文章, 被并入的文章, 相似度)"""
+        kept = []
+        duplicates = []
+        batch_buckets = {}
+        keys = [article_key(a['link'], a.get('title')) if a.get('link') else None for a in articles]
+        archived = set(self._archived({key for key in keys if key}))
+
+        for article, key in zip(articles, keys):
+            # 已存档的文章是更新而不是新文章，交给 upsert 处理
+            buckets = [] if key in archived else article_buckets(article, self.placeholders)
+            if not buckets:
+                kept.append(article)
+                continue
+
+            # 候选：存档中同桶的文章 + 本批已保留的同桶文章
+            placeholders = ','.join('?' * len(buckets))
+            candidates = {row[0] for row in self.conn.execute(
+                f'SELECT DISTINCT key FROM minhash_buckets WHERE bucket IN ({placeholders})', buckets)}
+            candidates.discard(key)
+            batch_candidates = {}
+            for bucket in buckets:
+                for other_key, other in batch_buckets.get(bucket, ()):
+                    if other_key != key:
+                        batch_candidates[other_key] = other
+
+            best = None
+            for other in list(batch_candidates.values()) + list(self._archived(candidates - set(batch_candidates)).values()):
+                score = similarity(article, other, self.placeholders)
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (other, score)
+
+            if best is None:
+                kept.append(article)
+                for bucket in buckets:
+                    batch_buckets.setdefault(bucket, []).append((key, article))
+            else:
+                duplicates.append((article, best[0], round(best[1], 2)))
+
+        return kept, duplicates
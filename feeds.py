@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RSS/Atom 订阅源
+读取：用 xml.etree.iterparse 流式解析 RSS 2.0 / RSS 1.0 / Atom，每个条目处理完就从树上摘掉，
+内存占用与订阅源长度无关；不晚于上次运行的条目跳过，订阅源一般按新到旧排列，
+连续 STALE_RUN 条都是旧条目才停止解析（个别乱序的条目不会让后面的新条目被漏掉）。
+条件请求（ETag/Last-Modified）由 FetchEngine 的 HTTPCache 完成，各源上次见到的最新条目时间记在 .feed_state.json。
+生成：把最新一周的文章写成 feed.xml（RSS 2.0），订阅者轮询这个小文件即可，不必下载完整的JSON
+"""
+
+import html
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from site_renderer import write_atomic
+
+FEED_STATE = '.feed_state.json'
+FEED_FILE = 'feed.xml'
+# 首次读取一个订阅源时只取最近这么久的条目
+MAX_AGE = timedelta(days=7)
+SITE_URL = os.environ.get('SITE_URL', 'https://echogao0913.github.io/ai-hr-weekly/')
+FEED_TITLE = 'AI在HR领域的每周应用'
+FEED_DESCRIPTION = '每周精选AI在人力资源领域的应用文章'
+# 页面上的日期按北京时间
+CST = timezone(timedelta(hours=8))
+
+# 连续这么多条不晚于上次运行的条目后停止读取
+STALE_RUN = 5
+
+ENTRY_TAGS = {'item', 'entry'}
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+
+def _local(tag):
+    """去掉命名空间：{http://www.w3.org/2005/Atom}entry -> entry"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def clean_text(text):
+    """订阅源里的摘要常是转义后的HTML：去标签、反转义、合并空白"""
+    if '<' in text:
+        text = TAG_RE.sub(' ', text)
+    return SPACE_RE.sub(' ', html.unescape(text)).strip()
+
+
+def parse_date(value):
+    """RFC 822（RSS）或 ISO 8601（Atom）时间，统一为带时区的 datetime；解析不了返回 None"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _entry(elem):
+    """条目元素 -> {title, link, summary, published}"""
+    fields = {}
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'link':
+            href = child.get('href')
+            if href is None:
+                fields.setdefault('link', (child.text or '').strip())
+            elif child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', href)
+        elif name not in fields:
+            fields[name] = ''.join(child.itertext()).strip()
+    link = fields.get('link') or ''
+    if not link and fields.get('guid', '').startswith('http'):
+        link = fields['guid']
+    summary = (fields.get('description') or fields.get('summary') or fields.get('encoded')
+               or fields.get('content') or '')
+    published = (fields.get('pubDate') or fields.get('published') or fields.get('updated')
+                 or fields.get('date'))
+    return {'title': clean_text(fields.get('title', '')), 'link': link,
+            'summary': clean_text(summary), 'published': parse_date(published)}
+
+
+def iter_entries(source, since=None, limit=None, stale_run=STALE_RUN):
+    """流式读取订阅源条目；source 为文件名或二进制文件对象。
+
+    逐条产出 {title, link, summary, published, source}，source 为订阅源标题；
+    发布时间不晚于 since 的条目跳过，连续 stale_run 条这样的条目后停止（不假定订阅源严格按新到旧排列），
+    最多 limit 条
+    """
+    stack = []
+    feed_title = ''
+    count = 0
+    stale = 0
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        name = _local(elem.tag)
+        if name == 'title' and not feed_title and stack and _local(stack[-1].tag) in ('channel', 'feed'):
+            feed_title = clean_text(''.join(elem.itertext()))
+        if name not in ENTRY_TAGS:
+            continue
+        entry = _entry(elem)
+        # 处理完的条目从父元素上摘掉，树不会随订阅源变长
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+        if since is not None and entry['published'] is not None and entry['published'] <= since:
+            stale += 1
+            if stale >= stale_run:
+                return
+            continue
+        stale = 0
+        if not entry['title'] or not entry['link']:
+            continue
+        entry['source'] = feed_title
+        yield entry
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+class FeedState:
+    """各订阅源上次运行时见到的最新条目时间"""
+
+    def __init__(self, path=FEED_STATE, max_age=MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        self.changed = False
+
+    def since(self, url):
+        """只读取这个时间之后发布的条目"""
+        seen = parse_date(self.state.get(url))
+        return seen or datetime.now(timezone.utc) - self.max_age
+
+    def update(self, url, newest, oldest=None, truncated=False):
+        """记录这次读到的最新条目时间。truncated 表示因为条数上限提前停止、后面还有没读的条目，
+        它们不一定比读到的旧：这时只推进到读到的最旧条目，比它新的条目下次还会读到"""
+        if truncated:
+            newest = oldest
+        if newest is None:
+            return
+        seen = parse_date(self.state.get(url))
+        if seen is None or newest > seen:
+            self.state[url] = newest.isoformat()
+            self.changed = True
+
+    def save(self):
+        """文章入库之后再保存，运行中途失败时下次还会重新读取这些条目"""
+        if self.changed:
+            write_atomic(self.path, json.dumps(self.state, ensure_ascii=False, indent=2, sort_keys=True))
+            self.changed = False
+
+
+def article_date(article):
+    """文章的 '2026年10月12日' 日期，按北京时间零点"""
+    try:
+        return datetime.strptime(article.get('date') or '', '%Y年%m月%d日').replace(tzinfo=CST)
+    except ValueError:
+        return None
+
+
+def render_feed(articles, site_url=SITE_URL, title=FEED_TITLE, description=FEED_DESCRIPTION):
+    """生成 RSS 2.0；lastBuildDate 取文章的最新日期，文章不变时输出逐字节不变"""
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = title
+    ET.SubElement(channel, 'link').text = site_url
+    ET.SubElement(channel, 'description').text = description
+    ET.SubElement(channel, 'language').text = 'zh-CN'
+    dates = [d for d in map(article_date, articles) if d is not None]
+    if dates:
+        ET.SubElement(channel, 'lastBuildDate').text = format_datetime(max(dates))
+
+    for article in articles:
+        link = article.get('link') or ''
+        item = ET.SubElement(channel, 'item')
+        ET.SubElement(item, 'title').text = article.get('title') or ''
+        ET.SubElement(item, 'link').text = link
+        ET.SubElement(item, 'description').text = article.get('description') or ''
+        if article.get('category'):
+            ET.SubElement(item, 'category').text = article['category']
+        if article.get('source') and link:
+            parts = urlsplit(link)
+            ET.SubElement(item, 'source', url=f"{parts.scheme}://{parts.netloc}/").text = article['source']
+        ET.SubElement(item, 'guid', isPermaLink='true').text = link
+        published = article_date(article)
+        if published is not None:
+            ET.SubElement(item, 'pubDate').text = format_datetime(published)
+
+    ET.indent(rss)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(rss, encoding='unicode') + '\n'
+
+
+def write_feed(articles, path=FEED_FILE, **kwargs):
+    """写 feed.xml；内容没变时不改写，返回是否写入"""
+    return write_atomic(path, render_feed(articles, **kwargs))
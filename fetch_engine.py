@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享抓取引擎
+线程池 + 复用连接的 requests.Session，按主机限制并发并用令牌桶限速；
+配置了 HostHealth 时按主机自适应超时、退避重试，并跳过已熔断的主机
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from host_health import FAILURE_STATUS, RETRY_STATUS, CircuitOpenError
+
+
+class TokenBucket:
+    """令牌桶限速器：rate 为每秒补充的令牌数，capacity 为突发上限"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，不足时等待"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchEngine:
+    """并发抓取引擎，供各爬虫共享"""
+
+    def __init__(self, headers=None, timeout=10, max_workers=8,
+                 per_host=4, rate=0.5, burst=4, cache=None, metrics=None, health=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics
+        self.health = health
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+
+        # 一个连接池，keep-alive 复用
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host_limits(self, url):
+        """获取主机对应的并发信号量和令牌桶"""
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.per_host),
+                                     TokenBucket(self.rate, self.burst))
+            return self._hosts[host]
+
+    def _send(self, url, method='GET', **kwargs):
+        """发出请求；有 health 时熔断的主机直接跳过，失败按退避重试"""
+        if self.health is None:
+            return self._attempt(url, method, **kwargs)
+
+        host = urlsplit(url).netloc
+        fixed_timeout = 'timeout' in kwargs
+        attempt = 0
+        while True:
+            if not self.health.allow(host):
+                self._count('http_circuit_skipped_total', host)
+                raise CircuitOpenError(host, self.health.open_until(host))
+            if not fixed_timeout:
+                kwargs['timeout'] = self.health.timeout_for(host)
+
+            response = retry_after = None
+            try:
+                response = self._attempt(url, method, **kwargs)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                failure = e
+            except BaseException:
+                self.health.release(host)
+                raise
+            else:
+                if response.status_code not in FAILURE_STATUS:
+                    # elapsed 是发出请求到收到响应头的时间，不含排队限速
+                    self.health.record_success(host, response.elapsed.total_seconds())
+                    return response
+                failure = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After')
+
+            if self.health.record_failure(host, failure):
+                self._count('http_circuit_tripped_total', host)
+            # 超时不重试（再等一轮超时正是要避免的开销），连接被拒和 429/5xx 退避后重试
+            if response is None:
+                retryable = not isinstance(failure, requests.Timeout)
+            else:
+                retryable = response.status_code in RETRY_STATUS
+            if not retryable or attempt >= self.health.max_retries or self.health.is_open(host):
+                if response is not None:
+                    return response
+                raise failure
+            self._count('http_retries_total', host)
+            time.sleep(self.health.backoff(attempt, retry_after))
+            attempt += 1
+
+    def _attempt(self, url, method='GET', **kwargs):
+        """发出一次请求，遵守主机并发和限速"""
+        semaphore, bucket = self._host_limits(url)
+        kwargs.setdefault('timeout', self.timeout)
+        bucket.acquire()
+        with semaphore:
+            if self.metrics is None:
+                return self.session.request(method, url, **kwargs)
+            return self._send_measured(url, method, **kwargs)
+
+    def _send_measured(self, url, method='GET', **kwargs):
+        """记录请求延迟（不含排队限速的时间）、下载字节数和状态码"""
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            self.metrics.inc('http_errors_total', host=host, error=type(e).__name__)
+            raise
+        finally:
+            self.metrics.observe('http_request_seconds', time.perf_counter() - start, host=host)
+        self.metrics.inc('http_responses_total', host=host, status=response.status_code)
+        if not kwargs.get('stream'):
+            self.metrics.inc('http_downloaded_bytes_total', len(response.content), host=host)
+        return response
+
+    def head(self, url, **kwargs):
+        """HEAD请求（跟随重定向），不经过缓存"""
+        return self._send(url, 'HEAD', **kwargs)
+
+    def get(self, url, **kwargs):
+        """同步GET；配置了缓存时先查缓存，过期条目用条件请求重新验证"""
+        if self.cache is None or kwargs.get('stream'):
+            return self._send(url, **kwargs)
+
+        entry, fresh = self.cache.lookup(url)
+        if entry is not None and fresh:
+            cached = self.cache.load(url, entry, revalidated=False)
+            if cached is not None:
+                self._count_cache(url, 'hit')
+                return cached
+            entry = None  # 正文刚被淘汰，按未命中处理
+
+        plain_headers = kwargs.get('headers')
+        if entry is not None:
+            headers = dict(plain_headers or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs['headers'] = headers
+
+        response = self._send(url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cached = self.cache.load(url, entry, revalidated=True)
+            if cached is not None:
+                self._count_cache(url, 'revalidated')
+                return cached
+            # 重新验证期间正文被淘汰：不带条件头重新下载
+            kwargs['headers'] = plain_headers
+            response = self._send(url, **kwargs)
+
+        self._count_cache(url, 'miss')
+        self.cache.store(url, response)
+        response.from_cache = False
+        return response
+
+    def _count_cache(self, url, result):
+        if self.metrics is not None:
+            self.metrics.inc('http_cache_total', host=urlsplit(url).netloc, result=result)
+
+    def _count(self, name, host):
+        if self.metrics is not None:
+            self.metrics.inc(name, host=host)
+
+    def fetch_all(self, urls, **kwargs):
+        """并发抓取多个URL，按输入顺序返回 (url, response, error)"""
+        futures = [(url, self.executor.submit(self.get, url, **kwargs)) for url in urls]
+        results = []
+        for url, future in futures:
+            try:
+                results.append((url, future.result(), None))
+            except Exception as e:
+                results.append((url, None, e))
+        return results
+
+    def close(self):
+        """关闭线程池和连接，并保存缓存索引和主机健康状态"""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.save()
+        if self.health is not None:
+            self.health.save()
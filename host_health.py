@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主机健康状态
+按主机跟踪响应延迟和连续失败：
+  - 超时按延迟自适应（与TCP的RTO算法相同：srtt + 4 * rttvar，限制在上下限之间）
+  - 429/5xx 和连接错误用带抖动的指数退避重试，尊重 Retry-After；超时不重试
+  - 连续失败达到阈值后熔断：本次运行剩余时间内直接跳过该主机，并在冷却期内（跨运行）继续跳过；
+    冷却期过后只放一个试探请求（其余请求在结果出来前仍跳过），成功则恢复，失败则重新熔断
+  常驻模式每轮开始时调用 new_run()，“本次运行”即当前这一轮
+状态保存在磁盘上，下次运行直接沿用
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+# 需要退避重试的状态码；403 多半是被反爬拦截，计入失败但不重试
+RETRY_STATUS = {429, 500, 502, 503, 504}
+FAILURE_STATUS = RETRY_STATUS | {403}
+
+
+class CircuitOpenError(Exception):
+    """主机处于熔断状态，请求未发出"""
+
+    def __init__(self, host, until):
+        self.host = host
+        self.until = until
+        remaining = max(0, until - time.time())
+        super().__init__(f"{host} 已熔断，{remaining / 60:.0f} 分钟后重试")
+
+
+class HostHealth:
+    """各主机的延迟统计、自适应超时、退避和熔断器"""
+
+    def __init__(self, path='.host_health.json', failure_threshold=3, cooldown=6 * 3600,
+                 min_timeout=2.0, max_timeout=10.0, max_retries=2, base_backoff=0.5, max_backoff=30.0,
+                 read_only=False):
+        self.path = path
+        self.read_only = read_only  # --dry-run：读取已保存的状态，但不写回
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+        self.tripped = set()  # 本次运行中熔断过的主机，冷却期为0时也跳过到运行结束
+        self.probing = set()  # 冷却期已过、试探请求尚未返回的主机
+        self.stats = {'success': 0, 'failure': 0, 'retry': 0, 'skipped': 0, 'tripped': 0}
+
+        self.hosts = {}
+        if path:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.hosts = json.load(f)
+            except (OSError, ValueError):
+                self.hosts = {}
+
+    def _state(self, host):
+        return self.hosts.setdefault(host, {'srtt': None, 'rttvar': None, 'failures': 0,
+                                            'open_until': 0, 'last_error': None})
+
+    def timeout_for(self, host):
+        """该主机的请求超时：没有样本时用上限"""
+        with self.lock:
+            state = self._state(host)
+            if state['srtt'] is None:
+                return self.max_timeout
+            return min(self.max_timeout, max(self.min_timeout, state['srtt'] + 4 * state['rttvar']))
+
+    def is_open(self, host):
+        """熔断器是否打开（本次运行中已熔断，或仍在冷却期内）"""
+        with self.lock:
+            return host in self.tripped or self._state(host)['open_until'] > time.time()
+
+    def allow(self, host):
+        """是否允许请求该主机；熔断中返回 False 并计入跳过次数。
+        冷却期已过但还没恢复时只放行一个试探请求"""
+        with self.lock:
+            state = self._state(host)
+            if host in self.tripped or host in self.probing or state['open_until'] > time.time():
+                self.stats['skipped'] += 1
+                return False
+            if state['failures'] >= self.failure_threshold:
+                self.probing.add(host)
+            return True
+
+    def release(self, host):
+        """请求因与主机无关的错误（如重定向过多、URL无效）没有结果：不计成功或失败，
+        只放掉试探名额，否则该主机在本轮剩余时间里一直被当成试探中而跳过"""
+        with self.lock:
+            self.probing.discard(host)
+
+    def new_run(self):
+        """开始新一轮运行：清掉上一轮的熔断记录和未返回的试探，冷却期仍按 open_until 计算"""
+        with self.lock:
+            self.tripped.clear()
+            self.probing.clear()
+
+    def open_until(self, host):
+        with self.lock:
+            return self._state(host)['open_until']
+
+    def record_success(self, host, latency):
+        """成功响应：更新平滑延迟，清零连续失败并关闭熔断"""
+        with self.lock:
+            state = self._state(host)
+            if state['srtt'] is None:
+                state['srtt'], state['rttvar'] = latency, latency / 2
+            else:
+                state['rttvar'] = 0.75 * state['rttvar'] + 0.25 * abs(state['srtt'] - latency)
+                state['srtt'] = 0.875 * state['srtt'] + 0.125 * latency
+            state['failures'] = 0
+            state['open_until'] = 0
+            self.probing.discard(host)
+            self.stats['success'] += 1
+
+    def record_failure(self, host, reason):
+        """失败（超时、连接错误、429/5xx/403）：达到阈值时熔断，返回是否刚刚熔断"""
+        with self.lock:
+            state = self._state(host)
+            state['failures'] += 1
+            state['last_error'] = str(reason)[:200]
+            self.probing.discard(host)
+            self.stats['failure'] += 1
+            # 冷却期过后的试探请求失败会立即重新熔断
+            if state['failures'] >= self.failure_threshold and host not in self.tripped:
+                state['open_until'] = time.time() + self.cooldown
+                self.tripped.add(host)
+                self.stats['tripped'] += 1
+                return True
+            return False
+
+    def backoff(self, attempt, retry_after=None):
+        """第 attempt 次重试前的等待：full jitter 指数退避；服务器给了 Retry-After 时取其值"""
+        self.stats['retry'] += 1
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP日期格式的 Retry-After 不解析，按指数退避处理
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def save(self):
+        """保存到磁盘（先写临时文件再替换）"""
+        if not self.path or self.read_only:
+            return
+        with self.lock:
+            data = json.dumps(self.hosts, ensure_ascii=False, indent=2)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        """打印用的健康摘要"""
+        now = time.time()
+        with self.lock:
+            down = [host for host, state in self.hosts.items() if state['open_until'] > now]
+        line = (f"[HEALTH] 成功 {self.stats['success']}，失败 {self.stats['failure']}，"
+                f"重试 {self.stats['retry']}，熔断 {self.stats['tripped']}，跳过 {self.stats['skipped']}")
+        if down:
+            line += f"，熔断中: {', '.join(sorted(down))}"
+        return line
@@ -5,56 +5,67 @@ AI在HR领域应用新闻爬虫 - 真实数据版本
 抓取真实的HR资讯网站内容
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-from datetime import datetime, timedelta
-import time
-import re
+import os
+import argparse
+
+from article_model import Article
+from article_store import ArticleStore
+from build_graph import BUILD_STATUS, site_graph
+from classifier import default_classifier
+from dedup import Deduplicator
+from host_health import HostHealth
+from http_cache import HTTPCache
+from link_checker import LinkChecker, flag_links
+from run_metrics import RunMetrics
+from search_index import INDEX_FILE
+from week_index import week_info
+
 
 class RealHRNewsScraper:
-    def __init__(self):
+    def __init__(self, profile=False, report_dir='reports', check_links=False, dry_run=False):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
         }
         self.news_data = []
-
-        # HR领域关键词
-        self.category_keywords = {
-            '薪酬福利': ['薪酬', '福利', '绩效', '激励', '工资', '奖金'],
-            '人才发展': ['培训', '学习', '发展', '晋升', '招聘', '人才'],
-            '组织发展': ['组织', '架构', '变革', '转型', '数字化'],
-            '企业文化': ['文化', '价值观', '员工体验', '雇主品牌'],
-            'SSC': ['共享服务', 'SSC', 'HRSSC', '自助服务']
-        }
-
-        # AI相关关键词
-        self.ai_keywords = ['AI', '人工智能', '机器学习', '自动化', 'ChatGPT',
-                           'GPT', '算法', '智能', '大数据', 'RPA']
+        self.data_file = 'hr_news_data.json'
+        # --dry-run：在存档的内存副本上运行，只报告哪些输出会变化；缓存和主机健康状态只读
+        self.dry_run = dry_run
+        self.store = ArticleStore(read_only=dry_run)
+        self.dedup = Deduplicator(self.store)
+        # 与 auto_update_articles 共用的抓取引擎，新增爬虫请用 self.fetcher.get / fetch_all
+        self.cache = HTTPCache(read_only=dry_run)
+        self.metrics = RunMetrics('hr_news', profile=profile)
+        self.report_dir = report_dir
+        self.health = HostHealth(read_only=dry_run)
+        self._fetcher = None
+        # 链接检查默认关闭（--check-links 打开），只指向网站首页的泛链接总会标出
+        self.check_links = check_links
+
+        # 分类和AI关键词表统一在 classifier 模块中维护
+        self.classifier = default_classifier
+
+    @property
+    def fetcher(self):
+        """抓取引擎在第一次联网时才创建，生成精选新闻时不导入 requests"""
+        if self._fetcher is None:
+            from fetch_engine import FetchEngine
+            self._fetcher = FetchEngine(headers=self.headers, cache=self.cache, metrics=self.metrics,
+                                        health=self.health)
+        return self._fetcher
 
     def is_ai_related(self, text):
         """判断文本是否与AI相关"""
-        return any(keyword in text for keyword in self.ai_keywords)
+        return self.classifier.is_ai_related(text)
 
     def categorize_content(self, title, description=''):
         """根据内容分类到HR领域"""
-        content = (title + ' ' + description).lower()
-
-        for category, keywords in self.category_keywords.items():
-            if any(keyword in content for keyword in keywords):
-                return category
-        return '人才发展'
+        return self.classifier.categorize(title, description)
 
     def get_week_info(self):
-        """获取当前周信息"""
-        today = datetime.now()
-        week_start = today - timedelta(days=today.weekday())
-        week_num = week_start.isocalendar()[1]
-        week_str = f"{today.year}年第{week_num}周"
-        date_str = week_start.strftime('%Y年%m月%d日')
-        return week_str, date_str
+        """获取当前周信息，日期取本周一"""
+        return week_info(week_start=True)
 
     def create_realistic_data(self):
         """创建更真实的示例数据（带真实网站域名）"""
@@ -136,8 +147,8 @@ class RealHRNewsScraper:
                 'date': date_str
             },
             {
-                'title': '智能继任计划：AI识别高潜人才和未来领导者',
-                'description': 'AI技术可以综合分析员工能力、绩效、潜力等多维度数据，为企业识别高潜人才，建立领导力梯队。',
+                'title': '智能继任计划：AI如何识别和培养未来领导者',
+                'description': '介绍如何运用AI技术综合分析员工能力、绩效、潜力等多维度数据，构建科学的继任计划和人才梯队。',
                 'category': '人才发展',
                 'source': '德勤人力资本',
                 'link': 'https://www2.deloitte.com/cn/zh/pages/human-capital/articles/human-capital.html',
@@ -173,47 +184,86 @@ class RealHRNewsScraper:
             }
         ]
 
-        self.news_data.extend(realistic_news)
+        self.news_data.extend(Article.from_dict(item) for item in realistic_news)
+        self.metrics.inc('articles_accepted_total', len(realistic_news), source='curated')
         print(f"  已生成 {len(realistic_news)} 条新闻")
 
     def save_to_json(self, filename='hr_news_data.json'):
         """保存数据到JSON文件"""
         print(f"\n保存数据到 {filename}...")
 
-        self.news_data.sort(key=lambda x: (x['week'], x['category']), reverse=True)
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.news_data, f, ensure_ascii=False, indent=2)
-
-        print(f"  成功保存 {len(self.news_data)} 条新闻")
+        # 近似重复的新闻先并入已有文章
+        with self.metrics.span('dedup'):
+            self.news_data, duplicates = self.dedup.filter(self.news_data)
+        self.metrics.inc('duplicates_merged_total', len(duplicates))
+        if duplicates:
+            print(f"  去重合并 {len(duplicates)} 条:")
+            for line in self.dedup.report(duplicates):
+                print(line)
+
+        # 增量写入存档（按周、分类排序由存档查询完成）
+        with self.metrics.span('save', hot=True):
+            inserted, updated = self.store.upsert(self.news_data)
+            self.dedup.add(self.news_data)
+        print(f"  新增 {inserted} 条，更新 {updated} 条，存档共 {self.store.count()} 条")
+        self.metrics.inc('articles_inserted_total', inserted)
+        self.metrics.inc('articles_updated_total', updated)
+        if self.store.retitled:
+            print(f"  更正了 {len(self.store.retitled)} 条新闻的标题:")
+            for line in self.store.retitle_report():
+                print(line)
+        self.metrics.inc('articles_retitled_total', len(self.store.retitled))
+        self.data_file = filename
 
     def update_html_file(self, html_file='ai_hr_weekly.html'):
-        """直接更新HTML文件中的内嵌数据"""
-        print(f"\n更新HTML文件中的数据...")
+        """由存档生成JSON、搜索索引、周分片和页面并发布；只重新生成输入有变化的输出"""
+        print(f"\n更新输出文件...")
 
+        index_file = os.path.join(os.path.dirname(self.data_file), INDEX_FILE)
+        graph = site_graph(self.store, html_file, data_file=self.data_file, index_file=index_file,
+                           dry_run=self.dry_run, metrics=self.metrics)
         try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-
-            # 找到 embeddedData 的位置并替换
-            import re
-            pattern = r'const embeddedData = \[.*?\];'
-
-            # 生成新的数据字符串
-            data_str = "const embeddedData = " + json.dumps(self.news_data, ensure_ascii=False, indent=10) + ";"
-
-            # 替换
-            new_html = re.sub(pattern, data_str, html_content, flags=re.DOTALL)
-
-            # 写回文件
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(new_html)
-
-            print(f"  HTML文件已更新！")
+            results = graph.run()
+        finally:
+            graph.save()
+        for name, status, detail in results:
+            if status == 'failed':
+                self.metrics.fail()
+            print(f"  {name}: {BUILD_STATUS[status][1]}" + (f"（{detail}）" if detail else ''))
+        if any(status == 'built' for _, status, _ in results):
             print(f"  请刷新浏览器查看最新内容")
 
-        except Exception as e:
-            print(f"  更新HTML失败: {e}")
+    def validate_links(self):
+        """检查存档中的新闻链接，有问题的写入运行报告"""
+        print(f"\n检查新闻链接...")
+        articles = self.store.query()
+        results = None
+        if self.check_links:
+            checker = LinkChecker(headers=self.headers, metrics=self.metrics, read_only=self.dry_run)
+            try:
+                with self.metrics.span('links'):
+                    results = checker.check_all(article['link'] for article in articles)
+            finally:
+                checker.close()
+            print(f"  {checker.summary()}")
+
+        flagged = flag_links(articles, results)
+        self.metrics.attach('links', flagged)
+        for reason, items in flagged.items():
+            self.metrics.inc('links_flagged_total', len(items), reason=reason)
+        print(f"  泛链接 {len(flagged['generic'])} 条，失效 {len(flagged['dead'])} 条，"
+              f"无法访问 {len(flagged['unreachable'])} 条，被重定向到首页 {len(flagged['redirected_to_root'])} 条"
+              f"（明细见运行报告）")
+
+    def close(self):
+        """关闭连接和存档，写出运行报告，返回报告路径"""
+        if self._fetcher is not None:
+            self._fetcher.close()
+        else:
+            self.cache.save()
+            self.health.save()
+        self.store.close()
+        return self.metrics.write(self.report_dir)
 
     def run(self):
         """运行爬虫"""
@@ -221,24 +271,47 @@ class RealHRNewsScraper:
         print("AI在HR领域应用 - 真实新闻生成器")
         print("="*60)
 
-        # 生成真实化数据
-        self.create_realistic_data()
+        try:
+            # 生成真实化数据
+            self.create_realistic_data()
+
+            # 保存到JSON
+            self.save_to_json()
 
-        # 保存到JSON
-        self.save_to_json()
+            # 更新JSON、搜索索引、周分片和HTML文件（只改写有变化的）
+            self.update_html_file()
 
-        # 直接更新HTML文件
-        self.update_html_file()
+            # 检查链接
+            self.validate_links()
+        except Exception:
+            self.metrics.fail()
+            raise
+        finally:
+            report_file = self.close()
 
         print("\n" + "="*60)
+        if self.dry_run:
+            print("试运行结束，除运行报告外没有写入任何文件")
+        elif not self.metrics.ok:
+            print("部分输出生成失败，详见运行报告")
         print("完成！现在可以：")
         print("1. 刷新浏览器查看更新后的内容")
         print("2. 点击链接会跳转到真实的HR资讯网站")
+        print(self.cache.report())
+        print(self.health.report())
+        print(self.metrics.summary())
+        print(f"运行报告: {report_file}")
         print("="*60)
 
 
 def main():
-    scraper = RealHRNewsScraper()
+    parser = argparse.ArgumentParser(description='AI在HR领域应用 - 真实新闻生成器')
+    parser.add_argument('--dry-run', action='store_true', help='只报告哪些输出会重新生成，不写文件')
+    parser.add_argument('--check-links', action='store_true', help='检查所有新闻链接（会请求每个外部站点）')
+    parser.add_argument('--profile', action='store_true', help='对热点阶段做 cProfile/tracemalloc 采样')
+    args = parser.parse_args()
+
+    scraper = RealHRNewsScraper(profile=args.profile, check_links=args.check_links, dry_run=args.dry_run)
     scraper.run()
 
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式链接提取
+基于标准库 HTMLParser 的事件流，只关心 <a> 和标题标签，不建文档树；
+通过标题过滤的候选够数后立即停止解析
+"""
+
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Enough(Exception):
+    """候选已够数，提前结束解析"""
+
+
+class LinkExtractor(HTMLParser):
+    """收集 (标题, 链接) 候选；标题标签取其内部第一个带 href 的 <a> 作为链接"""
+
+    def __init__(self, accept, limit=3, tags=('a',)):
+        super().__init__(convert_charrefs=True)
+        self.accept = accept
+        self.limit = limit
+        self.tags = set(tags)
+        self.open = []
+        self.seen = set()
+        self.candidates = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in self.tags and tag != 'a':
+            return
+        href = dict(attrs).get('href') if tag == 'a' else None
+        if tag == 'a' and href:
+            # 外层标题标签还没有链接时，用第一个内部链接
+            for elem in self.open:
+                if elem['href'] is None:
+                    elem['href'] = href
+        if tag in self.tags:
+            self.open.append({'tag': tag, 'href': href, 'text': []})
+
+    def handle_data(self, data):
+        for elem in self.open:
+            elem['text'].append(data)
+
+    def handle_endtag(self, tag):
+        if tag not in self.tags:
+            return
+        # 容忍未闭合的标签：弹出到最近的同名元素为止
+        for i in range(len(self.open) - 1, -1, -1):
+            if self.open[i]['tag'] == tag:
+                elem = self.open.pop(i)
+                del self.open[i:]
+                self._finish(elem)
+                return
+
+    def _finish(self, elem):
+        href = elem['href']
+        if not href or href in self.seen:
+            return
+        title = ''.join(elem['text']).strip()
+        candidate = self.accept(title, href)
+        if candidate is not None:
+            self.seen.add(href)
+            self.candidates.append(candidate)
+            if len(self.candidates) >= self.limit:
+                raise _Enough()
+
+
+def extract_links(html, accept, limit=3, tags=('a',)):
+    """从HTML（字符串或文本块的可迭代对象）中提取候选。
+
+    accept(title, href) 返回候选（如 [标题, 链接]）或 None 表示不通过过滤；
+    返回最多 limit 个候选，够数后不再解析剩余内容。
+    """
+    if isinstance(html, str):
+        chunks = (html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE))
+    else:
+        chunks = html
+
+    parser = LinkExtractor(accept, limit=limit, tags=tags)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    except _Enough:
+        pass
+    return parser.candidates
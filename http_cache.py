@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+磁盘HTTP缓存
+保存响应正文及 ETag/Last-Modified，下次用 If-None-Match/If-Modified-Since 重新验证；
+按总大小做LRU淘汰，并支持按来源（主机）覆盖TTL
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class CachedResponse:
+    """从缓存返回的响应，接口与 requests.Response 常用部分一致"""
+
+    def __init__(self, url, content, headers, encoding, revalidated):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding or 'utf-8'
+        self.from_cache = True
+        self.revalidated = revalidated
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+
+class HTTPCache:
+    """持久化响应缓存，供 FetchEngine 使用；read_only=True（--dry-run）时只读取已有缓存，不写磁盘"""
+
+    def __init__(self, cache_dir='.http_cache', max_bytes=50 * 1024 * 1024,
+                 default_ttl=0, ttl_overrides=None, read_only=False):
+        self.cache_dir = cache_dir
+        self.read_only = read_only
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_overrides = ttl_overrides or {}
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.stats = {'hit': 0, 'revalidated': 0, 'miss': 0, 'stored': 0, 'evicted': 0}
+
+        if not read_only:
+            os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def ttl_for(self, url):
+        """取URL所属来源的TTL（秒）"""
+        return self.ttl_overrides.get(urlsplit(url).netloc, self.default_ttl)
+
+    def lookup(self, url):
+        """返回 (缓存条目, 是否仍在TTL内)；无缓存时条目为 None"""
+        with self.lock:
+            entry = self.index.get(url)
+            if entry is None or not os.path.exists(self._body_path(url)):
+                return None, False
+            return entry, time.time() - entry['stored_at'] < self.ttl_for(url)
+
+    def conditional_headers(self, entry):
+        """构造重新验证用的条件请求头"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url, entry, revalidated):
+        """读取缓存正文；revalidated 表示经过了一次304往返。
+        正文已被并发的淘汰删掉时去掉条目并返回 None，按未命中处理"""
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                content = f.read()
+        except OSError:
+            with self.lock:
+                if self.index.get(url) is entry:
+                    del self.index[url]
+            return None
+        with self.lock:
+            entry['last_used'] = time.time()
+            if revalidated:
+                entry['stored_at'] = entry['last_used']
+                self.stats['revalidated'] += 1
+            else:
+                self.stats['hit'] += 1
+        return CachedResponse(url, content, entry.get('headers', {}), entry.get('encoding'), revalidated)
+
+    def store(self, url, response):
+        """记录一次完整下载；只保存有验证器或有TTL的200响应"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self.lock:
+            self.stats['miss'] += 1
+            if self.read_only:
+                return
+            if response.status_code != 200 or not (etag or last_modified or self.ttl_for(url)):
+                if self.index.pop(url, None) is not None:
+                    self._remove_body(url)
+                return
+
+        content = response.content
+        with open(self._body_path(url), 'wb') as f:
+            f.write(content)
+        now = time.time()
+        with self.lock:
+            self.index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'encoding': response.encoding or response.apparent_encoding,
+                'size': len(content),
+                'stored_at': now,
+                'last_used': now,
+            }
+            self.stats['stored'] += 1
+            self._evict()
+
+    def get_derived(self, url):
+        """取与当前缓存正文对应的解析结果（未变化的页面可跳过解析）"""
+        with self.lock:
+            entry = self.index.get(url)
+            return entry.get('derived') if entry else None
+
+    def set_derived(self, url, value):
+        """保存解析结果，正文更新时随条目一起失效"""
+        with self.lock:
+            if url in self.index:
+                self.index[url]['derived'] = value
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小不超过上限（调用方持有锁）"""
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for url in sorted(self.index, key=lambda u: self.index[u]['last_used']):
+            entry = self.index.pop(url)
+            self._remove_body(url)
+            total -= entry['size']
+            self.stats['evicted'] += 1
+            if total <= self.max_bytes:
+                break
+
+    def _remove_body(self, url):
+        try:
+            os.remove(self._body_path(url))
+        except OSError:
+            pass
+
+    def save(self):
+        """把索引写回磁盘"""
+        if self.read_only:
+            return
+        with self.lock:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+
+    def report(self):
+        """缓存命中情况的一行摘要"""
+        s = self.stats
+        requests_total = s['hit'] + s['revalidated'] + s['miss']
+        reused = s['hit'] + s['revalidated']
+        rate = reused / requests_total * 100 if requests_total else 0
+        return (f"[CACHE] 命中 {s['hit']}，304重验证 {s['revalidated']}，未命中 {s['miss']}，"
+                f"复用率 {rate:.0f}%，新存 {s['stored']}，淘汰 {s['evicted']}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+链接健康检查
+对文章链接并发发 HEAD 请求（服务器不支持 HEAD 时改用 GET，只读响应头），跟随重定向；
+每个主机的并发和速率由 FetchEngine 限制，连接复用。
+结果按 TTL 缓存在磁盘上，未过期的链接不会每周重复检查；
+失效链接、网络不通的链接和指向网站首页的泛链接汇总后写入运行报告。
+requests 和抓取引擎在第一次检查时才导入，只做泛链接标记时不加载
+"""
+
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from site_renderer import write_atomic
+
+LINK_CACHE = '.link_cache.json'
+# HEAD 返回这些状态码时改用 GET 再确认：很多站点不支持或直接拦截 HEAD
+HEAD_FALLBACK_STATUS = {400, 403, 405, 501}
+# 视为网站首页的路径
+ROOT_PATHS = ('', '/index.html', '/index.htm', '/index.php')
+
+
+def is_generic_root(url):
+    """链接是否只指向网站首页（而不是具体文章）"""
+    parts = urlsplit(url)
+    return parts.path.rstrip('/').lower() in ROOT_PATHS and not parts.query
+
+
+def link_state(status):
+    """按状态码归类：ok 正常，dead 失效（4xx），error 暂时性故障（429/5xx，不缓存）"""
+    if status < 400:
+        return 'ok'
+    if status == 429 or status >= 500:
+        return 'error'
+    return 'dead'
+
+
+def flag_links(articles, results=None):
+    """汇总需要处理的链接：泛链接（首页）总会检查，results 给出时再加上失效/不通/被重定向到首页的"""
+    flagged = {'generic': [], 'dead': [], 'unreachable': [], 'redirected_to_root': []}
+    for article in articles:
+        link = article.get('link') or ''
+        item = {'title': article.get('title'), 'link': link}
+        if is_generic_root(link):
+            flagged['generic'].append(item)
+        result = (results or {}).get(link)
+        if result is None:
+            continue
+        item = dict(item, status=result['status'], final_url=result['final_url'])
+        if result['state'] == 'dead':
+            flagged['dead'].append(item)
+        elif result['state'] == 'error':
+            flagged['unreachable'].append(dict(item, error=result['error']))
+        elif not is_generic_root(link) and is_generic_root(result['final_url']):
+            # 文章页被重定向到首页，通常是文章已下线
+            flagged['redirected_to_root'].append(item)
+    return flagged
+
+
+class LinkChecker:
+    """并发链接检查器，结果缓存在 cache_path"""
+
+    def __init__(self, engine=None, headers=None, cache_path=LINK_CACHE, ttl=7 * 86400,
+                 dead_ttl=86400, timeout=8, metrics=None, read_only=False):
+        self.cache_path = cache_path
+        self.read_only = read_only  # --dry-run：使用已有缓存，但不写回
+        self.ttl = ttl
+        self.dead_ttl = dead_ttl  # 失效链接更快复查，站点恢复后能及时取消标记
+        self.timeout = timeout
+        self.metrics = metrics
+        self.owns_engine = engine is None
+        if engine is None:
+            from fetch_engine import FetchEngine
+            # 链接分散在很多主机上，每个主机仍只允许少量并发、低速率
+            engine = FetchEngine(headers=headers, timeout=timeout, max_workers=16,
+                                 per_host=2, rate=2, burst=4, metrics=metrics)
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.stats = {'checked': 0, 'cached': 0, 'ok': 0, 'dead': 0, 'error': 0}
+
+        self.cache = {}
+        if cache_path:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, ValueError):
+                self.cache = {}
+
+    def _fresh(self, result, now):
+        ttl = self.ttl if result['state'] == 'ok' else self.dead_ttl
+        return result['state'] != 'error' and now - result['checked'] < ttl
+
+    def check(self, url):
+        """检查一个链接，返回 {state, status, final_url, redirects, error, checked}"""
+        import requests
+        result = {'state': 'error', 'status': None, 'final_url': url, 'redirects': 0,
+                  'error': None, 'checked': time.time()}
+        try:
+            response = self.engine.head(url, timeout=self.timeout)
+            if response.status_code in HEAD_FALLBACK_STATUS:
+                response.close()
+                response = self.engine.get(url, timeout=self.timeout, stream=True)
+            response.close()
+        except requests.RequestException as e:
+            result['error'] = f"{type(e).__name__}: {e}"[:200]
+            return result
+        result.update(state=link_state(response.status_code), status=response.status_code,
+                      final_url=response.url, redirects=len(response.history))
+        return result
+
+    def check_all(self, urls):
+        """并发检查多个链接（去重），缓存未过期的直接复用；返回 {url: 结果}"""
+        now = time.time()
+        results, pending = {}, []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url)
+            if cached is not None and self._fresh(cached, now):
+                results[url] = cached
+                self._count(cached['state'], cached=True)
+            else:
+                pending.append(url)
+
+        futures = [(url, self.engine.executor.submit(self.check, url)) for url in pending]
+        for url, future in futures:
+            result = future.result()
+            results[url] = result
+            self._count(result['state'], cached=False)
+            if result['state'] != 'error':
+                with self.lock:
+                    self.cache[url] = result
+        return results
+
+    def _count(self, state, cached):
+        with self.lock:
+            self.stats[state] += 1
+            self.stats['cached' if cached else 'checked'] += 1
+        if self.metrics is not None:
+            self.metrics.inc('links_total', state=state, cached=cached)
+
+    def save(self):
+        """保存缓存（顺带清掉过期条目）"""
+        if not self.cache_path or self.read_only:
+            return
+        now = time.time()
+        with self.lock:
+            self.cache = {url: r for url, r in self.cache.items() if self._fresh(r, now)}
+            data = json.dumps(self.cache, ensure_ascii=False, indent=2)
+        write_atomic(self.cache_path, data)
+
+    def close(self):
+        self.save()
+        if self.owns_engine:
+            self.engine.close()
+
+    def summary(self):
+        """打印用的检查摘要"""
+        return (f"[LINKS] 检查 {self.stats['checked']}，缓存 {self.stats['cached']}，"
+                f"正常 {self.stats['ok']}，失效 {self.stats['dead']}，出错 {self.stats['error']}")
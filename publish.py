@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布静态资源
+数据文件（文章JSON、搜索索引、周分片清单）压缩成最小JSON，按内容哈希命名写进 data/，
+并在构建时生成 .gz 旁路文件（装了可选依赖 brotli 时再生成 .br，没装时摘要里会注明跳过）；
+本次构建渲染的页面里的 hr-assets 槽记录哈希后的文件名：
+  /*<hr-assets>*/{"data": "data/hr_news_data.<哈希>.json", ...}/*</hr-assets>*/
+带哈希的文件内容永不改变，静态服务器可以对 data/ 设置
+  Cache-Control: public, max-age=31536000, immutable
+并直接发送预压缩的字节（nginx gzip_static/brotli_static、Caddy precompressed），不必每次请求时压缩。
+页面本身和不带哈希的源文件仍应使用短缓存或 no-cache
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from site_renderer import fill_slot, write_atomic
+
+try:
+    import brotli
+except ImportError:  # 可选依赖：没装时只生成 .gz
+    brotli = None
+
+ASSETS_SLOT = ('/*<hr-assets>*/', '/*</hr-assets>*/')
+PAGES = ('index.html', 'ai_hr_weekly.html')
+# 页面中的资源名 -> 源文件
+SOURCES = {
+    'data': 'hr_news_data.json',
+    'search': 'search_index.json',
+    'manifest': os.path.join('data', 'manifest.json'),
+}
+# 小于这个字节数的文件压缩收益太小，不生成旁路文件
+MIN_COMPRESS = 256
+# 每种资源保留的历史版本数（含当前），已缓存旧页面的访客还能取到对应的文件
+KEEP = 2
+
+
+def minify(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(source, data):
+    """hr_news_data.json -> hr_news_data.<sha256前12位>.json"""
+    stem, ext = os.path.splitext(os.path.basename(source))
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _write_bytes(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def write_sidecars(path, data):
+    """生成 .gz/.br 旁路文件（内容由文件名哈希决定，已存在就不重写），返回 {后缀: 字节数}"""
+    sizes = {}
+    if len(data) < MIN_COMPRESS:
+        return sizes
+    encoders = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, encode in encoders:
+        sidecar = path + suffix
+        if not os.path.exists(sidecar):
+            compressed = encode(data)
+            if len(compressed) >= len(data):
+                continue
+            _write_bytes(sidecar, compressed)
+        sizes[suffix] = os.path.getsize(sidecar)
+    return sizes
+
+
+def page_assets(page):
+    """页面 hr-assets 槽里的资源表；页面不存在或没有槽时为空"""
+    try:
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+    except OSError:
+        return {}
+    start = html.find(ASSETS_SLOT[0])
+    end = html.find(ASSETS_SLOT[1], start + len(ASSETS_SLOT[0])) if start != -1 else -1
+    if start == -1 or end == -1:
+        return {}
+    try:
+        return json.loads(html[start + len(ASSETS_SLOT[0]):end] or '{}')
+    except ValueError:
+        return {}
+
+
+def _prune(out_dir, stem, current, referenced=()):
+    """删掉同一资源较旧的哈希版本，只保留最新的 KEEP 个；referenced 中的文件名（其他页面还在用）不删"""
+    pattern = re.compile(rf'{re.escape(stem)}\.[0-9a-f]{{12}}\.json')
+    versions = [name for name in os.listdir(out_dir)
+                if pattern.fullmatch(name) and name != current and name not in referenced]
+    versions.sort(key=lambda name: os.path.getmtime(os.path.join(out_dir, name)), reverse=True)
+    for name in versions[KEEP - 1:]:
+        for suffix in ('', '.gz', '.br'):
+            try:
+                os.remove(os.path.join(out_dir, name + suffix))
+            except OSError:
+                pass
+
+
+def _remove_orphans(out_dir):
+    """源文件已被删除（如旧的周分片）的旁路文件"""
+    for name in os.listdir(out_dir):
+        base, ext = os.path.splitext(name)
+        if ext in ('.gz', '.br') and not os.path.exists(os.path.join(out_dir, base)):
+            os.remove(os.path.join(out_dir, name))
+
+
+def publish(out_dir='data', pages=PAGES):
+    """发布数据文件并更新 pages（本次构建渲染的页面）中的资源表；返回 {'assets', 'files', 'raw', '.gz', '.br'} 统计。
+    其他页面（PAGES 中不在 pages 里的）不改写，它们引用的旧版本文件也不清理"""
+    os.makedirs(out_dir, exist_ok=True)
+    referenced = {os.path.basename(path) for page in PAGES if page not in pages
+                  for path in page_assets(page).values()}
+    assets = {}
+    for name, source in SOURCES.items():
+        if not os.path.exists(source):
+            continue
+        data = minify(source)
+        filename = hashed_name(source, data)
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            _write_bytes(path, data)
+        os.utime(path)  # 当前版本视为最新，旧版本按修改时间清理
+        _prune(out_dir, os.path.splitext(os.path.basename(source))[0], filename, referenced)
+        assets[name] = f"{out_dir}/{filename}"
+    _remove_orphans(out_dir)
+
+    # 周分片文件名本来就带哈希，一起生成旁路文件
+    stats = {'assets': assets, 'files': 0, 'raw': 0, '.gz': 0, '.br': 0}
+    for name in sorted(os.listdir(out_dir)):
+        if not name.endswith('.json') or name == os.path.basename(SOURCES['manifest']):
+            continue
+        path = os.path.join(out_dir, name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        stats['files'] += 1
+        stats['raw'] += len(data)
+        for suffix, size in write_sidecars(path, data).items():
+            stats[suffix] += size
+
+    serialized = json.dumps(assets, ensure_ascii=False, separators=(',', ':'))
+    for page in pages:
+        if not os.path.exists(page):
+            continue
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if ASSETS_SLOT[0] not in html:
+            continue
+        updated = fill_slot(html, ASSETS_SLOT, serialized, page)
+        if updated != html:
+            write_atomic(page, updated)
+    return stats
+
+
+def summary(stats):
+    """打印用的发布摘要"""
+    line = f"{stats['files']} 个文件 {stats['raw'] / 1024:.1f}KB，gzip {stats['.gz'] / 1024:.1f}KB"
+    if brotli is not None:
+        line += f"，brotli {stats['.br'] / 1024:.1f}KB"
+    else:
+        line += "，未安装 brotli，跳过 .br"
+    return line
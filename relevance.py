@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+相关度打分和 Top-K 选择
+在分类器的共享关键词表上按 TF-IDF 给一批候选打分（标题命中加权，AI关键词加权），
+每个 (来源, 周, 分类) 用堆只保留得分最高的 K 篇，而不是页面上最先出现的几篇。
+每篇文本用分类器编译好的交替式扫描一遍，每个位置只取最长的关键词、命中互不重叠
+（'人工智能' 不会再算一次 '智能'），不再逐个关键词循环；装了 numpy 时用 bincount 和矩阵运算打分，
+否则用纯Python实现，结果相同
+"""
+
+import heapq
+import math
+
+from classifier import default_classifier
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：没装时用纯Python实现
+    np = None
+
+TITLE_WEIGHT = 2.0   # 标题里的命中比描述里的重要
+AI_WEIGHT = 1.5      # AI关键词比HR分类关键词重要
+
+
+def top_k(items, scores, k, group=None):
+    """每组保留得分最高的 k 个（大小为 k 的最小堆，O(n log k)），同分时保留靠前的。
+
+    group(item) 返回分组键，None 表示不分组；返回选中的下标，按组首次出现的顺序、组内得分从高到低
+    """
+    heaps = {}
+    for i, (item, score) in enumerate(zip(items, scores)):
+        heap = heaps.setdefault(group(item) if group else None, [])
+        entry = (score, -i)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    selected = []
+    for heap in heaps.values():
+        selected.extend(-i for _, i in sorted(heap, reverse=True))
+    return selected
+
+
+class RelevanceScorer:
+    """共享关键词表上的批量 TF-IDF 打分"""
+
+    def __init__(self, classifier=default_classifier, title_weight=TITLE_WEIGHT, ai_weight=AI_WEIGHT,
+                 use_numpy=True):
+        self.vocab = classifier.vocab
+        self.row_of = {kw: row for row, kw in enumerate(self.vocab)}
+        self.is_ai = [kw in classifier.ai_set for kw in self.vocab]
+        # 与分类器同一个交替式：英文关键词要求是完整单词（避免 'od' 命中 'model'），每个位置取最长的词
+        self.pattern = classifier.pattern
+        self.weights = [ai_weight if ai else 1.0 for ai in self.is_ai]
+        self.title_weight = title_weight
+        self.use_numpy = use_numpy and np is not None
+
+    def hits(self, texts):
+        """词频：每个关键词一行，每篇文本一列（互不重叠的命中）"""
+        n = len(texts)
+        row_of = self.row_of
+        findall = self.pattern.findall
+        if self.use_numpy:
+            rows, docs = [], []
+            for doc, text in enumerate(texts):
+                found = [row_of[kw] for kw in findall(text.lower())]
+                rows += found
+                docs += [doc] * len(found)
+            flat = np.asarray(rows, dtype=np.int64) * n + np.asarray(docs, dtype=np.int64)
+            return np.bincount(flat, minlength=len(self.vocab) * n).reshape(len(self.vocab), n).astype(float)
+
+        counts = [{} for _ in self.vocab]
+        for doc, text in enumerate(texts):
+            for kw in findall(text.lower()):
+                row = counts[row_of[kw]]
+                row[doc] = row.get(doc, 0) + 1
+        return counts
+
+    def score(self, titles, descriptions=None):
+        """返回 (得分列表, 是否命中AI关键词的列表)，与输入顺序一致"""
+        titles = list(titles)
+        n = len(titles)
+        if n == 0:
+            return [], []
+        title_hits = self.hits(titles)
+        desc_hits = self.hits(list(descriptions)) if descriptions is not None else None
+        if self.use_numpy:
+            return self._score_numpy(n, title_hits, desc_hits)
+        return self._score_python(n, title_hits, desc_hits)
+
+    def _score_numpy(self, n, title_hits, desc_hits):
+        tf = self.title_weight * title_hits
+        if desc_hits is not None:
+            tf += desc_hits
+        present = tf > 0
+        # 平滑IDF：log((1+N)/(1+df)) + 1；次线性词频：1 + log(tf)
+        idf = np.log((1 + n) / (1 + present.sum(axis=1))) + 1
+        weighted = np.where(present, 1 + np.log(np.where(present, tf, 1)), 0.0)
+        scores = (np.asarray(self.weights) * idf) @ weighted
+        ai = present[np.asarray(self.is_ai)].any(axis=0)
+        return scores.tolist(), ai.tolist()
+
+    def _score_python(self, n, title_hits, desc_hits):
+        scores = [0.0] * n
+        ai = [False] * n
+        for row, counts in enumerate(title_hits):
+            tf = {doc: self.title_weight * c for doc, c in counts.items()}
+            if desc_hits is not None:
+                for doc, c in desc_hits[row].items():
+                    tf[doc] = tf.get(doc, 0) + c
+            if not tf:
+                continue
+            factor = self.weights[row] * (math.log((1 + n) / (1 + len(tf))) + 1)
+            for doc, value in tf.items():
+                scores[doc] += factor * (1 + math.log(value))
+                if self.is_ai[row]:
+                    ai[doc] = True
+        return scores, ai
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标
+按阶段/来源记录耗时区间（span）、计数器和观测值（如请求延迟），运行结束时写到 report_dir：
+  <job>.json   完整的运行报告
+  <job>.prom   Prometheus textfile collector 格式（把 report_dir 配成 node_exporter 的
+               --collector.textfile.directory，或者软链过去）
+profile=True 时，标记为热点的阶段额外用 cProfile 采样并用 tracemalloc 记录内存峰值
+（cProfile/pstats 只在 profile 模式下导入）
+"""
+
+import io
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from site_renderer import write_atomic
+
+PREFIX = 'hr_weekly'
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _prom_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _filename_part(value):
+    """标签值放进文件名前去掉路径分隔符等字符（如 output='data/manifest.json'）"""
+    return re.sub(r'[^\w.-]', '_', str(value))
+
+
+def _metric_name(name):
+    return PREFIX + '_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+class RunMetrics:
+    """一次运行的指标，线程安全（抓取引擎在线程池里上报）"""
+
+    def __init__(self, job, profile=False, profile_dir='reports/profiles'):
+        self.job = job
+        self.started = time.time()
+        self.finished = None
+        self.ok = True
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+        self.observations = {}
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.profiles = {}
+        self.details = {}
+
+    def inc(self, name, value=1, **labels):
+        """计数器加 value"""
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """记录一个观测值（次数/总和/最大值）"""
+        key = _key(name, labels)
+        with self.lock:
+            stat = self.observations.setdefault(key, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += value
+            stat[2] = max(stat[2], value)
+
+    @contextmanager
+    def span(self, name, hot=False, **labels):
+        """计时区间；异常照常抛出，但会记为一次失败。hot=True 的阶段在 profile 模式下被采样，
+        采样本身出错只打印警告，不影响阶段的结果"""
+        profiler = None
+        if hot and self.profile:
+            try:
+                import cProfile
+                profiler = cProfile.Profile()
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+                profiler.enable()
+            except Exception as e:
+                # 例如已有另一个 profiler 在运行
+                print(f"  [WARN] {name} 无法采样: {e}")
+                profiler = None
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                try:
+                    self._save_profile(name, labels, profiler)
+                except Exception as e:
+                    print(f"  [WARN] {name} 的采样结果保存失败: {e}")
+            key = _key(name, labels)
+            with self.lock:
+                stat = self.spans.setdefault(key, [0, 0.0, 0.0, 0])
+                stat[0] += 1
+                stat[1] += elapsed
+                stat[2] = max(stat[2], elapsed)
+                stat[3] += failed
+
+    def _save_profile(self, name, labels, profiler):
+        """保存 .prof 文件，报告里附上累计耗时最高的函数和内存峰值"""
+        import pstats
+        os.makedirs(self.profile_dir, exist_ok=True)
+        suffix = ''.join(f"_{_filename_part(v)}" for _, v in _key(name, labels)[1])
+        path = os.path.join(self.profile_dir, f"{self.job}_{_filename_part(name)}{suffix}.prof")
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(10)
+        _, peak = tracemalloc.get_traced_memory()
+        self.profiles[path] = {
+            'span': name,
+            'labels': dict(labels),
+            'tracemalloc_peak_mb': round(peak / 1024 / 1024, 2),
+            'top': [line for line in out.getvalue().splitlines() if line.strip()][-12:],
+        }
+
+    def attach(self, name, data):
+        """在报告里附加一节明细（如失效链接列表），只写入JSON报告"""
+        with self.lock:
+            self.details[name] = data
+
+    def fail(self):
+        """标记本次运行失败"""
+        self.ok = False
+
+    def report(self):
+        """运行报告（可直接写成JSON）"""
+        finished = self.finished or time.time()
+        with self.lock:
+            return {
+                'job': self.job,
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'finished': datetime.fromtimestamp(finished).isoformat(timespec='seconds'),
+                'duration_seconds': round(finished - self.started, 4),
+                'ok': self.ok,
+                'spans': [{'name': n, 'labels': dict(l), 'count': s[0], 'seconds': round(s[1], 6),
+                           'max_seconds': round(s[2], 6), 'errors': s[3]}
+                          for (n, l), s in sorted(self.spans.items())],
+                'counters': [{'name': n, 'labels': dict(l), 'value': v}
+                             for (n, l), v in sorted(self.counters.items())],
+                'observations': [{'name': n, 'labels': dict(l), 'count': s[0], 'sum': round(s[1], 6),
+                                  'max': round(s[2], 6)}
+                                 for (n, l), s in sorted(self.observations.items())],
+                'profiles': self.profiles,
+                'details': self.details,
+            }
+
+    def prometheus(self):
+        """textfile collector 格式的文本"""
+        job = (('job', self.job),)
+        lines = []
+        finished = self.finished or time.time()
+        for name, value, help_text in [
+                ('last_run_timestamp_seconds', finished, '最近一次运行结束的时间'),
+                ('last_run_duration_seconds', finished - self.started, '最近一次运行的总耗时'),
+                ('last_run_success', int(self.ok), '最近一次运行是否成功')]:
+            metric = _metric_name(name)
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge",
+                      f"{metric}{_prom_labels(job)} {value}"]
+
+        with self.lock:
+            spans = sorted(self.spans.items())
+            counters = sorted(self.counters.items())
+            observations = sorted(self.observations.items())
+
+        if spans:
+            metric = _metric_name('stage_seconds')
+            lines += [f"# HELP {metric} 各阶段耗时", f"# TYPE {metric} summary"]
+            for (name, labels), stat in spans:
+                labels = _prom_labels(job + (('stage', name),) + labels)
+                lines += [f"{metric}_sum{labels} {stat[1]:.6f}", f"{metric}_count{labels} {stat[0]}"]
+            metric = _metric_name('stage_errors_total')
+            lines += [f"# TYPE {metric} counter"]
+            lines += [f"{metric}{_prom_labels(job + (('stage', name),) + labels)} {stat[3]}"
+                      for (name, labels), stat in spans]
+
+        for name in sorted({name for (name, _), _ in counters}):
+            metric = _metric_name(name if name.endswith('_total') else name + '_total')
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{metric}{_prom_labels(job + labels)} {value}"
+                      for (n, labels), value in counters if n == name]
+
+        for name in sorted({name for (name, _), _ in observations}):
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric} summary")
+            for (n, labels), stat in observations:
+                if n == name:
+                    labels = _prom_labels(job + labels)
+                    lines += [f"{metric}_sum{labels} {stat[1]:.6f}", f"{metric}_count{labels} {stat[0]}"]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, report_dir='reports'):
+        """写出运行报告和 Prometheus 文件（原子替换，采集器不会读到半个文件），返回报告路径"""
+        self.finished = time.time()
+        os.makedirs(report_dir, exist_ok=True)
+        report_file = os.path.join(report_dir, f"{self.job}.json")
+        write_atomic(report_file, json.dumps(self.report(), ensure_ascii=False, indent=2))
+        write_atomic(os.path.join(report_dir, f"{self.job}.prom"), self.prometheus())
+        return report_file
+
+    def summary(self):
+        """打印用的阶段耗时摘要"""
+        with self.lock:
+            spans = sorted(self.spans.items(), key=lambda item: -item[1][1])
+        parts = []
+        for (name, labels), stat in spans:
+            label = name + ''.join(f"[{v}]" for _, v in labels)
+            parts.append(f"{label} {stat[1]:.2f}s")
+        return '[METRICS] ' + ('，'.join(parts) if parts else '无记录')
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+全文搜索索引
+标题和描述按中文二元组 + 英文/数字单词切词，建倒排索引；倒排表存差值（delta）编码。
+文档号就是文章在导出顺序（hr_news_data.json / store.query()）中的位置，
+同时记录所在周（WeekKey.code，与周分片清单的 key 一致）和周内位置，页面可以只拉取命中的周分片。
+从存档写索引时每周的切词结果（片段）缓存在存档里，只有变了的周重新切词，再按导出顺序拼接
+"""
+
+import json
+import re
+
+from week_index import WeekKey, week_code
+
+INDEX_FILE = 'search_index.json'
+
+_CJK_RUN = re.compile(r'[㐀-鿿豈-﫿]+')
+_ASCII_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """中文连续片段切成二元组（单字保留单字），英文数字按单词，统一小写"""
+    text = (text or '').lower()
+    tokens = []
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    tokens.extend(_ASCII_WORD.findall(text))
+    return tokens
+
+
+def delta_encode(ids):
+    previous = 0
+    encoded = []
+    for doc_id in ids:
+        encoded.append(doc_id - previous)
+        previous = doc_id
+    return encoded
+
+
+def delta_decode(gaps):
+    total = 0
+    decoded = []
+    for gap in gaps:
+        total += gap
+        decoded.append(total)
+    return decoded
+
+
+def build_index(articles):
+    """按导出顺序给文章编号并建索引，返回可直接写成JSON的字典"""
+    weeks, categories = [], []
+    week_ids, category_ids = {}, {}
+    doc_week, doc_category, doc_pos = [], [], []
+    week_counts = {}
+    postings = {}
+
+    for doc_id, article in enumerate(articles):
+        week = week_code(WeekKey.parse(article.get('week')))
+        category = article.get('category') or ''
+        if week not in week_ids:
+            week_ids[week] = len(weeks)
+            weeks.append(week)
+        if category not in category_ids:
+            category_ids[category] = len(categories)
+            categories.append(category)
+        doc_week.append(week_ids[week])
+        doc_category.append(category_ids[category])
+        doc_pos.append(week_counts.get(week, 0))
+        week_counts[week] = week_counts.get(week, 0) + 1
+
+        for token in set(tokenize(article.get('title')) + tokenize(article.get('description'))):
+            postings.setdefault(token, []).append(doc_id)
+
+    return {
+        'version': 1,
+        'count': len(doc_week),
+        'weeks': weeks,
+        'categories': categories,
+        'doc_week': doc_week,
+        'doc_category': doc_category,
+        'doc_pos': doc_pos,
+        'postings': {token: delta_encode(ids) for token, ids in sorted(postings.items())},
+    }
+
+
+def week_segment(articles):
+    """一周文章的索引片段（JSON文本）：每篇的分类和 token -> 周内位置（已做差值编码）"""
+    postings = {}
+    for pos, article in enumerate(articles):
+        for token in set(tokenize(article.get('title')) + tokenize(article.get('description'))):
+            postings.setdefault(token, []).append(pos)
+    return json.dumps({'categories': [article.get('category') or '' for article in articles],
+                       'postings': {token: delta_encode(positions) for token, positions in postings.items()}},
+                      ensure_ascii=False, separators=(',', ':'))
+
+
+def merge_segments(segments):
+    """按导出顺序拼接 (周code, 片段) 得到与 build_index 相同的索引：文档号 = 之前各周的篇数 + 周内位置。
+    片段里的倒排表已是差值编码，拼接时只需改每段的第一个差值"""
+    weeks, categories = [], []
+    category_ids = {}
+    doc_week, doc_category, doc_pos = [], [], []
+    postings = {}
+    last = {}
+
+    for code, segment in segments:
+        offset = len(doc_week)
+        week_id = len(weeks)
+        weeks.append(code)
+        for pos, category in enumerate(segment['categories']):
+            if category not in category_ids:
+                category_ids[category] = len(categories)
+                categories.append(category)
+            doc_week.append(week_id)
+            doc_category.append(category_ids[category])
+            doc_pos.append(pos)
+        for token, gaps in segment['postings'].items():
+            first = offset + gaps[0]
+            encoded = postings.get(token)
+            if encoded is None:
+                postings[token] = encoded = []
+            encoded.append(first - last.get(token, 0))
+            encoded.extend(gaps[1:])
+            last[token] = first + sum(gaps) - gaps[0]
+
+    return {
+        'version': 1,
+        'count': len(doc_week),
+        'weeks': weeks,
+        'categories': categories,
+        'doc_week': doc_week,
+        'doc_category': doc_category,
+        'doc_pos': doc_pos,
+        'postings': dict(sorted(postings.items())),
+    }
+
+
+def write_index(store, filename=INDEX_FILE):
+    """由存档中按周缓存的片段拼出索引并写到导出的JSON旁边（只有变了的周重新切词），返回文档数"""
+    from article_store import code_version
+    from site_renderer import write_atomic
+
+    version = code_version(__file__)
+    index = merge_segments((week_code(key), json.loads(store.week_output(key, 'search', week_segment, version)))
+                           for key in store.weeks())
+    write_atomic(filename, json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+    return index['count']
+
+
+class SearchIndex:
+    """离线查询接口；search() 返回文档号（导出顺序中的位置）"""
+
+    def __init__(self, data):
+        self.data = data
+        self.weeks = data['weeks']
+        self.categories = data['categories']
+        self.doc_week = data['doc_week']
+        self.doc_category = data['doc_category']
+        self.postings = data['postings']
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, filename=INDEX_FILE):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_articles(cls, articles):
+        return cls(build_index(articles))
+
+    def _ids(self, token):
+        if token not in self._decoded:
+            if token in self.postings:
+                ids = set(delta_decode(self.postings[token]))
+            elif len(token) == 1 and _CJK_RUN.match(token):
+                # 单个汉字：合并以它开头或结尾的二元组
+                ids = set()
+                for term, gaps in self.postings.items():
+                    if token in term:
+                        ids.update(delta_decode(gaps))
+            else:
+                ids = set()
+            self._decoded[token] = ids
+        return self._decoded[token]
+
+    def _clause(self, word):
+        """查询中的一个词：它的所有切词都要命中（近似短语匹配）"""
+        tokens = tokenize(word)
+        if not tokens:
+            return None
+        ids = set(self._ids(tokens[0]))
+        for token in tokens[1:]:
+            ids &= self._ids(token)
+            if not ids:
+                break
+        return ids
+
+    def search(self, query, mode='and', category=None, week=None):
+        """按空白分词；mode='and' 要求所有词都命中，'or' 命中任一即可；
+        category 为分类名，week 为 WeekKey、周标签或 code（都可传列表）。结果按文档号升序"""
+        clauses = [ids for ids in map(self._clause, query.split()) if ids is not None]
+        if not clauses:
+            result = set(range(self.data['count']))
+        elif mode == 'or':
+            result = set().union(*clauses)
+        elif mode == 'and':
+            result = set.intersection(*clauses)
+        else:
+            raise ValueError(f"未知的查询模式: {mode}")
+
+        if category is not None:
+            wanted = self._lookup(self.categories, category)
+            result = {i for i in result if self.doc_category[i] in wanted}
+        if week is not None:
+            weeks = [week] if isinstance(week, (str, WeekKey)) else week
+            wanted = self._lookup(self.weeks, [week_code(WeekKey.parse(w)) for w in weeks])
+            result = {i for i in result if self.doc_week[i] in wanted}
+        return sorted(result)
+
+    @staticmethod
+    def _lookup(names, value):
+        values = [value] if isinstance(value, str) else value
+        return {names.index(v) for v in values if v in names}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面渲染
+index.html / ai_hr_weekly.html 中用注释标记出数据槽，渲染时只替换槽内内容：
+  /*<hr-data>*/ ... /*</hr-data>*/         内嵌的文章JSON（压缩格式）
+  <!--<hr-cards>--> ... <!--</hr-cards>-->  服务端预渲染的周/卡片HTML（可选）
+  /*<hr-assets>*/ ... /*</hr-assets>*/     发布后带哈希的数据文件名（由 publish 模块写入）
+写入先落到临时文件再原子替换，中途失败不会留下半个页面
+"""
+
+import html
+import json
+import os
+import tempfile
+
+from week_index import sort_key
+
+DATA_SLOT = ('/*<hr-data>*/', '/*</hr-data>*/')
+CARDS_SLOT = ('<!--<hr-cards>-->', '<!--</hr-cards>-->')
+LOADING_HTML = '<div class="loading">正在加载最新内容...</div>'
+
+# 与页面中 categoryClasses 保持一致
+CATEGORY_CLASSES = {
+    '薪酬福利': 'category-salary',
+    '人才发展': 'category-talent',
+    '组织发展': 'category-org',
+    '企业文化': 'category-culture',
+    'SSC': 'category-ssc'
+}
+
+
+def serialize(articles):
+    """压缩JSON；转义 </ 以免提前结束 <script>"""
+    return json.dumps(articles, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def fill_slot(page, slot, content, name=''):
+    """替换标记之间的内容；找不到标记时报错，而不是悄悄什么都不做"""
+    start_marker, end_marker = slot
+    start = page.find(start_marker)
+    end = page.find(end_marker, start + len(start_marker)) if start != -1 else -1
+    if start == -1 or end == -1:
+        raise ValueError(f"{name or '页面'}中没有找到数据槽 {start_marker}...{end_marker}")
+    return page[:start + len(start_marker)] + content + page[end:]
+
+
+def render_cards(articles):
+    """按周分组生成卡片HTML，与页面 displayData() 的输出一致"""
+    week_groups = {}
+    for item in articles:
+        week_groups.setdefault(item.get('week') or '未分类', []).append(item)
+
+    parts = []
+    for week in sorted(week_groups, key=sort_key, reverse=True):
+        items = week_groups[week]
+        parts.append('<div class="week-section"><div class="week-header">'
+                     f'<h2>{html.escape(week)}</h2>'
+                     f'<div class="week-date">{html.escape(items[0].get("date") or "")}</div>'
+                     '</div><div class="cards-grid">')
+        for item in items:
+            link = item.get('link') or ''
+            category = item.get('category') or ''
+            category_class = CATEGORY_CLASSES.get(category, 'category-salary')
+            parts.append(
+                f'<div class="card" onclick="window.open({html.escape(json.dumps(link))}, \'_blank\')">'
+                f'<span class="card-category {category_class}">{html.escape(category)}</span>'
+                f'<h3 class="card-title">{html.escape(item.get("title") or "")}</h3>'
+                f'<p class="card-description">{html.escape(item.get("description") or "点击查看详细内容")}</p>'
+                '<div class="card-footer">'
+                f'<span class="card-source">📰 {html.escape(item.get("source") or "来源未知")}</span>'
+                f'<a href="{html.escape(link)}" class="card-link" target="_blank" '
+                'onclick="event.stopPropagation()">查看详情 →</a>'
+                '</div></div>')
+        parts.append('</div></div>')
+    return ''.join(parts)
+
+
+def write_atomic(path, text):
+    """写临时文件后 rename，读者要么看到旧文件，要么看到完整的新文件；内容相同时不改写，返回是否写入"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp 建的是 0600，沿用原文件权限（新文件用 0644），否则网页服务器读不到
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def render_page(path, articles, prerender=True, cards=None):
+    """把文章数据（以及预渲染的卡片）写进页面的数据槽；cards 为要预渲染的文章（默认同 articles）。
+    内容没变时不改写文件，返回是否写入"""
+    with open(path, 'r', encoding='utf-8') as f:
+        page = f.read()
+
+    page = fill_slot(page, DATA_SLOT, serialize(articles), path)
+    if CARDS_SLOT[0] in page:
+        cards = render_cards(articles if cards is None else cards) if prerender else LOADING_HTML
+        page = fill_slot(page, CARDS_SLOT, cards, path)
+
+    return write_atomic(path, page)
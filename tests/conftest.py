@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""测试共用：仓库根目录和 benchmarks/（桩服务器）加入导入路径，并提供本地桩服务器"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+from stub_server import start_stub_server  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def stub_instance():
+    server, base = start_stub_server(hang=3)
+    yield server, base
+    server.shutdown()
+
+
+@pytest.fixture(scope='module')
+def stub(stub_instance):
+    """本地桩服务器的根URL（挂起的请求 3 秒后放弃）"""
+    return stub_instance[1]
+
+
+@pytest.fixture
+def hits(stub_instance):
+    """桩服务器按路径（含查询串）统计的请求次数"""
+    return stub_instance[0].hits
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""ArticleStore：周和日期以首次收录为准，同链接换标题按更正处理（首页链接按标题区分）；旧库和旧JSON按日期重算ISO周"""
+
+import json
+import sqlite3
+
+import pytest
+
+from article_store import ArticleStore, article_key
+from week_index import WeekKey
+
+
+def article(title, link, week='2026年第9周', date='2026年02月23日', **fields):
+    return dict({'title': title, 'description': '描述', 'category': 'SSC', 'source': 'HRoot',
+                 'link': link, 'week': week, 'date': date}, **fields)
+
+
+@pytest.fixture
+def store():
+    store = ArticleStore(':memory:', seed_json=None)
+    yield store
+    store.close()
+
+
+def test_readding_keeps_first_seen_week(store):
+    assert store.upsert([article('A', 'https://x/a')]) == (1, 0)
+    store.touched_weeks.clear()
+
+    # 下一次运行把同一篇精选文章按本周重新添加
+    assert store.upsert([article('A', 'https://x/a', week='2026年第10周', date='2026年03月02日')]) == (0, 0)
+    assert store.weeks() == [WeekKey(2026, 9)]
+    assert store.query()[0]['date'] == '2026年02月23日'
+    assert not store.touched_weeks
+
+
+def test_content_update_stays_in_original_week(store):
+    store.upsert([article('A', 'https://x/a')])
+    store.touched_weeks.clear()
+    assert store.upsert([article('A', 'https://x/a', week='2026年第10周', description='新摘要')]) == (0, 1)
+    row = store.query()[0]
+    assert (row['week'], row['description']) == ('2026年第9周', '新摘要')
+    assert store.touched_weeks == {WeekKey(2026, 9)}
+
+
+def test_changed_title_is_a_correction(store):
+    store.upsert([article('A', 'https://x/a')])
+    store.touched_weeks.clear()
+    assert store.upsert([article('A（更正）', 'https://x/a', week='2026年第10周', date='2026年03月02日')]) == (0, 1)
+    [row] = store.query()
+    assert (row['title'], row['week'], row['date']) == ('A（更正）', '2026年第9周', '2026年02月23日')
+    assert store.retitled == [{'link': 'https://x/a', 'archived': 'A', 'title': 'A（更正）'}]
+    assert 'A（更正）' in store.retitle_report()[0]
+    assert store.touched_weeks == {WeekKey(2026, 9)}
+
+
+def test_shared_root_link_keeps_every_article(store):
+    batch = [article(title, 'https://www.hroot.com/') for title in ('A', 'B', 'C')]
+    assert store.upsert(batch) == (3, 0)
+    rows = store.query()
+    assert sorted(a['title'] for a in rows) == ['A', 'B', 'C']
+    # 发布的链接保持原样，区分用的哈希只在主键里
+    assert {a['link'] for a in rows} == {'https://www.hroot.com/'}
+    assert len({article_key(a['link'], a['title']) for a in rows}) == 3
+    assert not store.retitled
+    # 下一次运行重新添加：各自对应到已存的那行，不再新增
+    assert store.upsert(batch) == (0, 0)
+    assert store.count() == 3
+
+
+def test_rekey_strips_old_link_fragments(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE articles (link TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, '
+                 'category TEXT, source TEXT, week TEXT, iso_week INTEGER, date TEXT, '
+                 'first_seen REAL, updated_at REAL)')
+    fragment = article_key('https://www.hroot.com/', 'B')[len('https://www.hroot.com/'):]
+    conn.executemany('INSERT INTO articles (link, title, week, iso_week, date) VALUES (?, ?, ?, ?, ?)', [
+        ('https://www.hroot.com/', 'A', '2026年第9周', 202609, '2026年02月23日'),
+        ('https://www.hroot.com/' + fragment, 'B', '2026年第9周', 202609, '2026年02月23日'),
+        ('https://x/c#section', 'C', '2026年第9周', 202609, '2026年02月23日'),
+    ])
+    conn.commit()
+    conn.close()
+
+    store = ArticleStore(path, seed_json=None)
+    assert sorted((a['title'], a['link']) for a in store.query()) == [
+        ('A', 'https://www.hroot.com/'), ('B', 'https://www.hroot.com/'), ('C', 'https://x/c#section')]
+    assert store.upsert([article('B', 'https://www.hroot.com/')]) == (0, 1)  # 描述不同：更新原来那行
+    assert store.count() == 3
+    store.close()
+
+
+def test_migration_rekeys_legacy_weeks_from_date(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE articles (link TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, '
+                 'category TEXT, source TEXT, week TEXT, date TEXT, first_seen REAL, updated_at REAL)')
+    # 旧算法 days//7：2026-03-02（ISO第10周）记成了第9周；2025-12-30 属于 2026年第1周
+    conn.executemany('INSERT INTO articles (link, title, week, date) VALUES (?, ?, ?, ?)', [
+        ('https://x/a', 'A', '2026年第9周', '2026年03月02日'),
+        ('https://x/b', 'B', '2026年第9周', '2026年02月23日'),
+        ('https://x/c', 'C', '2025年第52周', '2025年12月30日'),
+        ('https://x/d', 'D', '2026年第8周', None),
+        ('https://x/e', 'E', '未分类', ''),
+    ])
+    conn.commit()
+    conn.close()
+
+    store = ArticleStore(path, seed_json=None)
+    rows = {link: (week, iso_week) for link, week, iso_week in
+            store.conn.execute('SELECT link, week, iso_week FROM articles')}
+    store.close()
+    assert rows == {
+        'https://x/a': ('2026年第10周', 202610),
+        'https://x/b': ('2026年第9周', 202609),
+        'https://x/c': ('2026年第1周', 202601),
+        'https://x/d': ('2026年第8周', 202608),  # 没有日期才按周文字
+        'https://x/e': ('未分类', None),
+    }
+
+
+def test_seed_json_weeks_follow_dates(tmp_path):
+    seed = tmp_path / 'hr_news_data.json'
+    seed.write_text(json.dumps([article('A', 'https://x/a', week='2026年第9周', date='2026年03月02日')],
+                               ensure_ascii=False), encoding='utf-8')
+    store = ArticleStore(':memory:', seed_json=str(seed))
+    assert store.weeks() == [WeekKey(2026, 10)]
+    store.close()
+
+
+def test_read_only_missing_archive_is_not_created(tmp_path):
+    path = tmp_path / 'hr_news_archive.db'
+    seed = tmp_path / 'hr_news_data.json'
+    seed.write_text(json.dumps([article('A', 'https://x/a')], ensure_ascii=False), encoding='utf-8')
+    store = ArticleStore(str(path), seed_json=str(seed), read_only=True)
+    assert [a['title'] for a in store.query()] == ['A']
+    store.close()
+    assert not path.exists()
+
+
+def test_read_only_archive_is_left_unchanged(tmp_path):
+    path = str(tmp_path / 'hr_news_archive.db')
+    store = ArticleStore(path, seed_json=None)
+    store.upsert([article('A', 'https://x/a')])
+    store.close()
+
+    copy = ArticleStore(path, seed_json=None, read_only=True)
+    assert copy.upsert([article('B', 'https://x/b')]) == (1, 0)
+    assert copy.count() == 2
+    copy.close()
+
+    store = ArticleStore(path, seed_json=None)
+    assert store.count() == 1
+    store.close()
+
+
+def test_weeks_are_keyed_on_iso_week(store):
+    store.upsert([article('A', 'https://x/a'), article('B', 'https://x/b', week='2026年第10周', date='2026年03月02日'),
+                  article('C', 'https://x/c', week='', date='')])
+    assert store.weeks() == [WeekKey(2026, 10), WeekKey(2026, 9), None]
+    assert [a['title'] for a in store.query(week=WeekKey(2026, 9))] == ['A']
+    assert [a['title'] for a in store.query(week='2026-W10')] == ['B']
+    assert [a['title'] for a in store.query(week='unknown')] == ['C']
+
+    index = store.time_index()
+    assert index is store.time_index()
+    assert index.latest().key == WeekKey(2026, 10) and index.unknown == 1
+    store.upsert([article('D', 'https://x/d', week='2026年第10周', date='2026年03月02日')])
+    assert store.time_index().get(WeekKey(2026, 10)).count == 2
+
+
+def test_export_json_reserializes_only_changed_weeks(store, tmp_path):
+    store.upsert([article('A', 'https://x/a'), article('B', 'https://x/b', week='2026年第10周', date='2026年03月02日')])
+    filename = str(tmp_path / 'hr_news_data.json')
+    assert store.export_json(filename)
+    digests = dict(store.conn.execute("SELECT week, digest FROM week_outputs WHERE kind = 'json'"))
+    whole = store.digest()
+
+    store.upsert([article('C', 'https://x/c')])
+    assert store.digest() != whole and store.digest('2026-W10') == digests['2026-W10'].split(':')[0]
+    assert store.export_json(filename)
+    after = dict(store.conn.execute("SELECT week, digest FROM week_outputs WHERE kind = 'json'"))
+    assert after['2026-W10'] == digests['2026-W10'] and after['2026-W09'] != digests['2026-W09']
+    with open(filename, 'r', encoding='utf-8') as f:
+        assert f.read() == json.dumps(store.query(), ensure_ascii=False, indent=2)
+
+
+def test_digest_is_backfilled_for_old_archives(tmp_path):
+    path = str(tmp_path / 'archive.db')
+    store = ArticleStore(path, seed_json=None)
+    store.upsert([article('A', 'https://x/a')])
+    whole = store.digest()
+    store.conn.execute('DELETE FROM week_digests')
+    store.conn.commit()
+    store.close()
+    store = ArticleStore(path, seed_json=None)
+    assert store.digest() == whole
+    store.close()
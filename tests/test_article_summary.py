@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""正文提取（文字密度 + class/id 权重）和 TextRank 摘要；进程池与逐页处理结果一致"""
+
+import os
+
+import pytest
+
+from article_summary import (BlockParser, SummaryPool, extract_main_text, split_sentences, summarize,
+                             summarize_page, summarize_pages, textrank)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARAGRAPH = '企业把大模型用在招聘初筛环节，候选人的等待时间从一周缩短到两天，招聘专员只复核临界分数。'
+
+PAGE = f"""<html><body>
+<div class="nav"><a href="/a">首页新闻资讯</a><a href="/b">企业服务频道</a><a href="/c">人工智能频道</a></div>
+<div class="sidebar"><p>相关推荐：这里有一段不短的推荐文字，也带着标点，但它在侧栏里。</p></div>
+<div class="article-content"><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p><script>var x = "不应出现";</script></div>
+<div class="comment-list"><p>网友评论：写得很好，学习了，期待后续的深度报道。</p></div>
+</body></html>"""
+
+
+def test_block_parser_records_link_text_and_class_weights():
+    parser = BlockParser()
+    parser.feed(PAGE)
+    parser.close()
+    nodes = {node.tag + ':' + str(i): node for i, node in enumerate(parser.nodes)}
+    nav = next(node for node in nodes.values() if node.weight < 0 and node.link_chars)
+    assert nav.link_chars == len(''.join(nav.text))
+    assert any(node.weight > 0 for node in parser.nodes)
+    assert not any('不应出现' in ''.join(node.text) for node in parser.nodes)
+
+
+def test_main_text_skips_navigation_sidebar_and_comments():
+    assert extract_main_text(PAGE) == f"{PARAGRAPH}\n{PARAGRAPH}"
+    assert extract_main_text('<html><body><a href="/">首页</a></body></html>') == ''
+
+
+def test_recorded_article_page():
+    with open(os.path.join(ROOT, 'benchmarks', 'fixtures', 'article_page.html'), 'r', encoding='utf-8') as f:
+        text = extract_main_text(f.read())
+    assert text.startswith('过去一年，这家互联网公司把AI面试官引入')
+    assert '快讯' not in text and '关注' not in text
+
+
+def test_textrank_favours_the_central_sentence():
+    sentences = ['招聘流程引入AI面试', 'AI面试提升招聘效率', '招聘效率与AI面试成本', '今天天气晴朗适合出游']
+    scores = textrank(sentences)
+    assert max(range(3), key=scores.__getitem__) in (1, 2)
+    assert scores[3] == pytest.approx(0.15)  # 孤立的句子只有 1 - damping
+
+
+def test_summary_keeps_original_order_and_length():
+    text = '。'.join(['招聘流程引入AI面试', '今天天气晴朗适合出游', 'AI面试提升招聘效率', '招聘效率与AI面试成本']) + '。'
+    summary = summarize(text)
+    first, second = (text.index(s) for s in split_sentences(summary))
+    assert first < second and '天气' not in summary
+    assert len(summarize(PARAGRAPH * 10, max_chars=30)) == 30
+    assert summarize('') == ''
+
+
+def test_shared_pool_matches_inline_processing():
+    pages = [PAGE] * 6
+    pool = SummaryPool(max_workers=2)
+    try:
+        first = summarize_pages(pages, pool=pool)
+        executor = pool.executor()
+        assert summarize_pages(pages, pool=pool) == first
+        assert pool.executor() is executor  # 第二批复用同一个进程池
+    finally:
+        pool.close()
+    assert first == [summarize_page(PAGE)] * 6
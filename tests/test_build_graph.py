@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""site_graph：存档不大时页面内嵌所有周（file:// 打开时取不到分片），只预渲染最新一周"""
+
+import json
+import os
+import shutil
+
+from article_store import ArticleStore
+from build_graph import site_graph
+from site_renderer import DATA_SLOT
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def article(title, week, date):
+    return {'title': title, 'description': '描述', 'category': 'SSC', 'source': 'HRoot',
+            'link': f'https://x/{title}', 'week': week, 'date': date}
+
+
+def test_page_embeds_every_week(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(ROOT, 'index.html'), tmp_path / 'index.html')
+    monkeypatch.chdir(tmp_path)
+    store = ArticleStore(':memory:', seed_json=None)
+    store.upsert([article('A', '2026年第9周', '2026年02月23日'),
+                  article('B', '2026年第10周', '2026年03月02日')])
+
+    results = site_graph(store, 'index.html').run()
+    assert all(status == 'built' for _, status, _ in results)
+    with open('index.html', 'r', encoding='utf-8') as f:
+        page = f.read()
+    store.close()
+
+    start = page.index(DATA_SLOT[0]) + len(DATA_SLOT[0])
+    embedded = json.loads(page[start:page.index(DATA_SLOT[1])])
+    assert [a['title'] for a in embedded] == ['B', 'A']
+    cards = page[page.index('<!--<hr-cards>-->'):page.index('<!--</hr-cards>-->')]
+    assert '2026年第10周' in cards and '2026年第9周' not in cards
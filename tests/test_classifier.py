@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""KeywordClassifier：与逐关键词扫描的写法结果一致；英文关键词按完整单词，互相包含/重叠的关键词都算命中"""
+
+import json
+import os
+
+import pytest
+
+from classifier import KeywordClassifier, default_classifier
+from corpus import make_corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def keyword_loop(clf, title, description=''):
+    """旧写法：对每个关键词做一次子串查找（英文关键词两侧不能紧挨英文字母），按分类表顺序取第一个命中的分类"""
+    content = (title + ' ' + description).lower()
+    found = set()
+    for kw in clf.vocab:
+        start = content.find(kw)
+        while start != -1:
+            end = start + len(kw)
+            if kw not in clf.ascii or not (content[start - 1:start].isascii() and content[start - 1:start].isalpha()
+                                           or content[end:end + 1].isascii() and content[end:end + 1].isalpha()):
+                found.add(kw)
+                break
+            start = content.find(kw, start + 1)
+    category = next((category for category, keywords in clf.table if found.intersection(keywords)), clf.default)
+    return category, not clf.ai_set.isdisjoint(found), found
+
+
+def fixture_corpus():
+    with open(os.path.join(ROOT, 'hr_news_data.json'), 'r', encoding='utf-8') as f:
+        archived = [(a['title'], a['description']) for a in json.load(f)]
+    return archived + make_corpus(2000) + make_corpus(50, sentences=(150, 250))
+
+
+def test_matches_keyword_loop_on_fixture_corpus():
+    clf = default_classifier
+    corpus = fixture_corpus()
+    for (title, description), result in zip(corpus, clf.classify_many(corpus)):
+        category, ai_related, keywords = keyword_loop(clf, title, description)
+        assert (result.category, result.ai_related, set(result.keywords)) == (category, ai_related, keywords), title
+        assert clf.classify(title, description) == result
+        assert clf.categorize(title, description) == category
+        assert clf.is_ai_related(title + ' ' + description) == ai_related
+
+
+@pytest.mark.parametrize('text, keywords', [
+    ('Thai market model', set()),            # 'ai' / 'od' 在单词中间
+    ('OpenAI发布新模型', set()),
+    ('AI-driven 招聘', {'ai', '招聘'}),
+    ('ChatGPT上线', {'chatgpt'}),           # 'gpt' 不是完整单词
+    ('GPT-4 面试', {'gpt', '面试'}),
+    ('Model OD转型', {'od', '转型'}),         # 汉字不算英文字母
+    ('RPA流程', {'rpa', '流程'}),
+])
+def test_english_keywords_match_whole_words(text, keywords):
+    result = default_classifier.classify(text)
+    assert set(result.keywords) == keywords
+    assert result.ai_related == default_classifier.is_ai_related(text) == bool(keywords & default_classifier.ai_set)
+
+
+def test_overlapping_keywords():
+    # '人工智能' 包含 '智能'，两个都算命中
+    assert set(default_classifier.classify('人工智能赋能HR').keywords) == {'人工智能', '智能'}
+    # '绩效能' 中 '效能' 与 '绩效' 重叠：分类取优先级更高的薪酬福利，效能也在命中列表里
+    result = default_classifier.classify('绩效能力模型')
+    assert result.category == '薪酬福利' and set(result.keywords) == {'绩效', '效能'}
+    # 表里只有长词时，单独出现的 '智能' 不算命中
+    clf = KeywordClassifier(ai_keywords=['人工智能'])
+    assert not clf.is_ai_related('智能排班') and clf.is_ai_related('人工智能排班')
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""常驻模式：抓取引擎、HTTP缓存和摘要进程池在各轮之间复用，stop() 时统一关闭"""
+
+import pytest
+
+from auto_update_articles import RealArticleScraper
+from daemon import UpdateDaemon
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = RealArticleScraper(report_dir=str(tmp_path / 'reports'), dry_run=True)
+    scraper.targets_none = lambda: []
+    return scraper
+
+
+def test_cycles_reuse_fetcher_cache_and_pool(scraper):
+    daemon = UpdateDaemon(scraper, schedule={'none': ('targets_none', 60)}, port=0)
+    daemon.run_cycle(['none'])
+    fetcher, cache, executor = scraper.fetcher, scraper.cache, daemon.pool.executor()
+    daemon.run_cycle(['none'])
+    assert scraper.fetcher is fetcher and fetcher.cache is cache
+    assert scraper.summary_pool is daemon.pool and daemon.pool.executor() is executor
+    assert daemon.cycles == 2
+
+
+def test_stop_closes_shared_resources_once(scraper, monkeypatch):
+    daemon = UpdateDaemon(scraper, schedule={'none': ('targets_none', 60)}, port=0)
+    daemon.start_server()
+    daemon.run_cycle(['none'])
+    closed = []
+    monkeypatch.setattr(scraper.fetcher, 'close', lambda: closed.append('fetcher'))
+    monkeypatch.setattr(scraper.store, 'close', lambda: closed.append('store'))
+    executor = daemon.pool.executor()
+
+    daemon.stop()
+    daemon.stop()
+    assert daemon.stop_event.is_set()
+    assert closed == ['fetcher', 'store']
+    assert daemon.pool._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(len, '')
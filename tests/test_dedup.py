@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Deduplicator：相近标题合并，占位描述不算相似"""
+
+import pytest
+
+from article_store import ArticleStore
+from auto_update_articles import DESC_36KR, PLACEHOLDERS
+from dedup import Deduplicator, similarity
+
+
+def article(title, link, description=DESC_36KR):
+    return {'title': title, 'description': description, 'category': 'SSC', 'source': '36氪',
+            'link': link, 'week': '2026年第9周', 'date': '2026年02月23日'}
+
+
+@pytest.fixture
+def store():
+    store = ArticleStore(':memory:', seed_json=None)
+    yield store
+    store.close()
+
+
+def test_placeholder_descriptions_do_not_merge(store):
+    dedup = Deduplicator(store, placeholders=PLACEHOLDERS)
+    batch = [article('薪酬管理系统上线智能核算', 'https://x/1'),
+             article('招聘机器人筛选简历的实践', 'https://x/2'),
+             article('员工培训平台引入大模型', 'https://x/3')]
+    kept, duplicates = dedup.filter(batch)
+    assert kept == batch
+    assert duplicates == []
+    assert similarity(batch[0], batch[1], PLACEHOLDERS) < dedup.threshold
+
+
+def test_near_duplicate_title_is_merged(store):
+    dedup = Deduplicator(store, placeholders=PLACEHOLDERS)
+    first = article('AI面试官正在改变校园招聘', 'https://x/1')
+    second = article('AI面试官正在改变校园招聘！', 'https://x/2')
+    kept, duplicates = dedup.filter([first, second])
+    assert kept == [first]
+    assert [(dup['link'], other['link']) for dup, other, _ in duplicates] == [('https://x/2', 'https://x/1')]
+
+
+def test_matches_archived_articles(store):
+    store.upsert([article('AI面试官正在改变校园招聘', 'https://x/1', description='真实摘要')])
+    dedup = Deduplicator(store, placeholders=PLACEHOLDERS)
+    kept, duplicates = dedup.filter([article('AI面试官正在改变校园招聘', 'https://x/2'),
+                                     article('无关的新文章', 'https://x/3')])
+    assert [a['link'] for a in kept] == ['https://x/3']
+    assert [(dup['link'], other['link']) for dup, other, _ in duplicates] == [('https://x/2', 'https://x/1')]
+
+
+def test_real_descriptions_still_compared(store):
+    dedup = Deduplicator(store)
+    a = article('标题一', 'https://x/1', description='企业用AI重构招聘流程的完整复盘')
+    b = article('完全不同的标题', 'https://x/2', description='企业用AI重构招聘流程的完整复盘')
+    kept, duplicates = dedup.filter([a, b])
+    assert kept == [a]
+    assert len(duplicates) == 1
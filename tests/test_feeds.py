@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""订阅源读取：乱序条目不截断读取，读满上限时水位只推进到读到的最旧条目"""
+
+import io
+from datetime import datetime, timedelta, timezone
+
+from feeds import FeedState, iter_entries
+
+BASE = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def rss(days):
+    items = ''.join(f'<item><title>t{d}</title><link>https://x/{d}</link>'
+                    f'<pubDate>{(BASE + timedelta(days=d)).strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate></item>'
+                    for d in days)
+    return io.BytesIO(f'<rss><channel><title>源</title>{items}</channel></rss>'.encode('utf-8'))
+
+
+def titles(entries):
+    return [e['title'] for e in entries]
+
+
+def test_out_of_order_entry_does_not_stop_reading():
+    # 第二条是旧条目，后面还有新条目
+    assert titles(iter_entries(rss([5, 0, 4, 3]), since=BASE)) == ['t5', 't4', 't3']
+
+
+def test_stops_after_a_run_of_old_entries():
+    entries = iter_entries(rss([3, 0, -1, -2, 2]), since=BASE, stale_run=3)
+    assert titles(entries) == ['t3']
+
+
+def test_truncated_read_only_advances_to_oldest(tmp_path):
+    state = FeedState(str(tmp_path / 'state.json'))
+    # 读满 3 条就停：没读到的第7天条目比读到的都新
+    entries = list(iter_entries(rss([6, 5, 4, 7, 1]), since=BASE, limit=3))
+    published = [e['published'] for e in entries]
+    state.update('u', max(published), min(published), truncated=True)
+    assert state.since('u') == BASE + timedelta(days=4)
+    assert titles(iter_entries(rss([6, 5, 4, 7, 1]), since=state.since('u'))) == ['t6', 't5', 't7']
+
+    state.update('u', BASE + timedelta(days=7), BASE + timedelta(days=5))
+    assert state.since('u') == BASE + timedelta(days=7)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""FetchEngine：结果顺序、并发、每主机并发上限、错误传递"""
+
+import socket
+import time
+
+import pytest
+import requests
+
+from fetch_engine import FetchEngine, TokenBucket
+
+
+@pytest.fixture
+def engine():
+    engine = FetchEngine(rate=1000, burst=1000)
+    yield engine
+    engine.close()
+
+
+def closed_port_url():
+    """一个没有进程监听的本地端口，连接会被拒绝"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/"
+
+
+def test_fetch_all_keeps_input_order(stub, engine):
+    # 第一个最慢，完成顺序与输入相反
+    urls = [f"{stub}/sleep/{delay}" for delay in (0.3, 0.2, 0.1, 0)]
+    results = engine.fetch_all(urls)
+    assert [url for url, _, _ in results] == urls
+    assert [response.text for _, response, _ in results] == [url[len(stub):] for url in urls]
+    assert all(error is None for _, _, error in results)
+
+
+def test_fetch_all_costs_about_the_slowest_request(stub, engine):
+    start = time.perf_counter()
+    results = engine.fetch_all([f"{stub}/sleep/0.3?n={i}" for i in range(4)])
+    elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for _, response, _ in results)
+    assert elapsed < 0.9  # 串行需要 1.2s
+
+
+def test_per_host_limit_serializes_requests(stub):
+    engine = FetchEngine(per_host=1, rate=1000, burst=1000)
+    try:
+        start = time.perf_counter()
+        engine.fetch_all([f"{stub}/sleep/0.2?n={i}" for i in range(3)])
+        assert time.perf_counter() - start >= 0.55
+    finally:
+        engine.close()
+
+
+def test_errors_are_returned_per_url(stub, engine):
+    refused = closed_port_url()
+    urls = [f"{stub}/article/1", refused, f"{stub}/status/404"]
+    results = engine.fetch_all(urls)
+
+    assert [url for url, _, _ in results] == urls
+    ok, failed, missing = results
+    assert ok[1].status_code == 200 and ok[2] is None
+    assert failed[1] is None and isinstance(failed[2], requests.ConnectionError)
+    # HTTP 错误码不是异常，原样返回给调用方判断
+    assert missing[1].status_code == 404 and missing[2] is None
+
+
+def test_get_raises_for_unreachable_host(engine):
+    with pytest.raises(requests.ConnectionError):
+        engine.get(closed_port_url())
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    # 突发2个，其余4个每个等 1/20 秒
+    assert time.perf_counter() - start >= 0.18
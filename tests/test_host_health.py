@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""HostHealth：熔断、冷却期后的单个试探请求、常驻模式每轮清除熔断记录；
+经 FetchEngine 对桩服务器的重试退避、Retry-After、自适应超时和跨运行熔断"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from daemon import UpdateDaemon
+from fetch_engine import FetchEngine
+from host_health import CircuitOpenError, HostHealth
+from run_metrics import RunMetrics
+
+HOST = 'example.com'
+
+
+def trip(health):
+    for _ in range(health.failure_threshold):
+        health.record_failure(HOST, 'HTTP 503')
+
+
+def expire(health):
+    """让冷却期提前结束"""
+    health.hosts[HOST]['open_until'] = time.time() - 1
+
+
+@pytest.fixture
+def health():
+    return HostHealth(path=None, failure_threshold=2, cooldown=60)
+
+
+def test_tripped_host_is_skipped_for_the_rest_of_the_run(health):
+    trip(health)
+    assert health.is_open(HOST) and not health.allow(HOST)
+    # 冷却期过了，本次运行里仍然跳过
+    expire(health)
+    assert not health.allow(HOST)
+    assert health.stats['tripped'] == 1 and health.stats['skipped'] == 2
+
+
+def test_new_run_clears_tripped_but_keeps_cooldown(health):
+    trip(health)
+    health.new_run()
+    assert health.is_open(HOST) and not health.allow(HOST)
+    expire(health)
+    assert not health.is_open(HOST)
+
+
+def test_only_one_probe_after_cooldown(health):
+    trip(health)
+    health.new_run()
+    expire(health)
+    assert health.allow(HOST)
+    # 试探请求还没返回，其余请求继续跳过
+    assert not health.allow(HOST) and not health.allow(HOST)
+    health.record_success(HOST, 0.1)
+    assert health.allow(HOST) and health.allow(HOST)
+    assert health.hosts[HOST]['failures'] == 0
+
+
+def test_probe_without_result_is_released(health):
+    trip(health)
+    health.new_run()
+    expire(health)
+    assert health.allow(HOST)
+    health.release(HOST)
+    # 试探没有结果：下一个请求可以再试探，失败次数不变
+    assert health.allow(HOST) and not health.allow(HOST)
+    assert health.hosts[HOST]['failures'] == health.failure_threshold
+
+
+def test_failed_probe_trips_again(health):
+    trip(health)
+    health.new_run()
+    expire(health)
+    assert health.allow(HOST)
+    assert health.record_failure(HOST, 'HTTP 503')
+    assert health.open_until(HOST) > time.time() + 30
+    assert not health.allow(HOST)
+    assert health.stats['tripped'] == 2
+
+
+def test_daemon_cycle_starts_a_new_run(tmp_path):
+    health = HostHealth(path=None, failure_threshold=1, cooldown=0)
+    scraper = SimpleNamespace(
+        metrics=RunMetrics('test'), health=health, cache=SimpleNamespace(save=lambda: None),
+        articles=[], report_dir=str(tmp_path), dry_run=True,
+        targets_feeds=lambda: [], fetch_and_parse=lambda targets: [])
+    daemon = UpdateDaemon(scraper, schedule={'feeds': ('targets_feeds', 60)}, port=0)
+
+    health.record_failure(HOST, 'timeout')
+    assert not health.allow(HOST)
+    daemon.run_cycle(['feeds'])
+    # 冷却期为0：下一轮放行一个试探请求，而不是一直跳过到进程退出
+    assert health.allow(HOST) and not health.allow(HOST)
+
+
+def fetch(health, urls):
+    """一次运行：用新的引擎并发请求，结束时保存健康状态"""
+    engine = FetchEngine(rate=1000, burst=1000, health=health)
+    try:
+        return engine.fetch_all(urls)
+    finally:
+        engine.close()
+
+
+def test_retries_with_backoff_then_returns_last_response(stub, hits):
+    health = HostHealth(path=None, failure_threshold=10, max_retries=2)
+    [(_, response, error)] = fetch(health, [f"{stub}/status/503?n=retry"])
+    assert error is None and response.status_code == 503
+    assert hits['/status/503?n=retry'] == 3
+    assert health.stats['retry'] == 2 and health.stats['failure'] == 3
+
+
+def test_client_errors_and_timeouts_are_not_retried(stub, hits):
+    health = HostHealth(path=None, failure_threshold=10, max_timeout=0.5)
+    (_, missing, _), (_, _, error) = fetch(health, [f"{stub}/status/404?n=once", f"{stub}/hang?n=once"])
+    assert missing.status_code == 404 and hits['/status/404?n=once'] == 1
+    assert isinstance(error, requests.Timeout) and hits['/hang?n=once'] == 1
+    assert health.stats['retry'] == 0
+
+
+def test_retry_after_is_honoured(stub, hits):
+    # 指数退避为0，等待时间只可能来自 Retry-After
+    health = HostHealth(path=None, failure_threshold=10, max_retries=2, base_backoff=0)
+    start = time.perf_counter()
+    fetch(health, [f"{stub}/status/429?retry_after=0.3"])
+    assert time.perf_counter() - start >= 0.55
+    assert hits['/status/429?retry_after=0.3'] == 3
+
+    start = time.perf_counter()
+    fetch(health, [f"{stub}/status/500?n=no-header"])
+    assert time.perf_counter() - start < 0.3
+
+
+def test_unexpected_error_releases_probe(health, monkeypatch):
+    trip(health)
+    health.new_run()
+    expire(health)
+    engine = FetchEngine(rate=1000, burst=1000, health=health)
+
+    def redirect_loop(method, url, **kwargs):
+        raise requests.TooManyRedirects('loop')
+
+    monkeypatch.setattr(engine.session, 'request', redirect_loop)
+    try:
+        with pytest.raises(requests.TooManyRedirects):
+            engine.get(f"http://{HOST}/a")
+        with pytest.raises(requests.TooManyRedirects):
+            engine.get(f"http://{HOST}/b")
+    finally:
+        engine.close()
+    assert HOST not in health.probing and health.stats['skipped'] == 0
+
+
+def test_backoff_bounds(health):
+    assert all(0 <= health.backoff(attempt) <= min(30, 0.5 * 2 ** attempt) for attempt in range(8))
+    assert health.backoff(0, '120') == health.max_backoff
+    assert 0 <= health.backoff(0, 'Wed, 21 Oct 2026 07:28:00 GMT') <= 0.5
+
+
+def test_timeout_adapts_to_latency(stub, hits):
+    health = HostHealth(path=None, min_timeout=0.5, max_timeout=5)
+    host = stub.split('//')[1]
+    assert health.timeout_for(host) == 5  # 没有样本时用上限
+    fetch(health, [f"{stub}/sleep/0.05?n={i}" for i in range(3)])
+    assert health.timeout_for(host) == 0.5
+
+    # 挂起的来源按自适应超时放弃，而不是等满上限
+    start = time.perf_counter()
+    [(_, _, error)] = fetch(health, [f"{stub}/hang?n=adaptive"])
+    assert isinstance(error, requests.Timeout)
+    assert time.perf_counter() - start < 2
+
+
+def test_breaker_stays_tripped_across_runs(stub, hits, tmp_path):
+    state = str(tmp_path / 'health.json')
+    health = HostHealth(state, failure_threshold=3, max_retries=2, base_backoff=0)
+    fetch(health, [f"{stub}/status/503?n=trip"])
+    assert hits['/status/503?n=trip'] == 3 and health.stats['tripped'] == 1
+
+    # 同一次运行和之后的运行（从状态文件读回）都不再发出请求
+    for run in range(2):
+        health = HostHealth(state, failure_threshold=3) if run else health
+        [(_, _, error)] = fetch(health, [f"{stub}/sleep/0?n=skipped"])
+        assert isinstance(error, CircuitOpenError)
+    assert hits['/sleep/0?n=skipped'] == 0
+    assert health.open_until(stub.split('//')[1]) > time.time() + 3000
+
+
+def test_breaker_closes_after_cooldown(stub, hits, tmp_path):
+    state = str(tmp_path / 'health.json')
+    health = HostHealth(state, failure_threshold=3, cooldown=0.5, max_retries=2, base_backoff=0)
+    fetch(health, [f"{stub}/status/503?n=cooldown"])
+    [(_, _, error)] = fetch(HostHealth(state), [f"{stub}/sleep/0?n=cooling"])
+    assert isinstance(error, CircuitOpenError)
+
+    time.sleep(0.6)
+    health = HostHealth(state)
+    # 只放一个试探请求；它返回之前其余请求仍跳过
+    results = fetch(health, [f"{stub}/sleep/0.2?n=probe{i}" for i in range(3)])
+    assert sorted('ok' if error is None else type(error).__name__ for _, _, error in results) == \
+        ['CircuitOpenError', 'CircuitOpenError', 'ok']
+    assert sum(hits[f"/sleep/0.2?n=probe{i}"] for i in range(3)) == 1
+
+    # 试探成功，熔断关闭，状态写回文件
+    [(_, response, error)] = fetch(HostHealth(state), [f"{stub}/sleep/0?n=closed"])
+    assert error is None and response.status_code == 200
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""HTTPCache：不再可缓存的响应连同正文一起删除，正文缺失按未命中处理"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from http_cache import HTTPCache
+
+URL = 'https://example.com/page'
+
+
+def response(status=200, etag='"v1"', content=b'<html></html>'):
+    headers = {'Content-Type': 'text/html'}
+    if etag:
+        headers['ETag'] = etag
+    return SimpleNamespace(status_code=status, headers=headers, content=content,
+                           encoding='utf-8', apparent_encoding='utf-8')
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(cache_dir=str(tmp_path / 'cache'))
+
+
+def test_uncacheable_response_removes_body(cache):
+    cache.store(URL, response())
+    body = cache._body_path(URL)
+    assert os.path.exists(body)
+
+    cache.store(URL, response(etag=None))
+    assert URL not in cache.index
+    assert not os.path.exists(body)
+
+
+def test_missing_body_is_a_miss(cache):
+    cache.store(URL, response())
+    entry, _ = cache.lookup(URL)
+    # 查到条目之后、读取之前正文被淘汰
+    os.remove(cache._body_path(URL))
+    assert cache.load(URL, entry, revalidated=False) is None
+    assert URL not in cache.index
+    assert cache.stats['hit'] == 0
+
+
+def test_load_returns_cached_body(cache):
+    cache.store(URL, response(content=b'hello'))
+    entry, _ = cache.lookup(URL)
+    cached = cache.load(URL, entry, revalidated=True)
+    assert cached.text == 'hello'
+    assert cache.stats['revalidated'] == 1
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""LinkChecker：状态码归类、泛链接/失效/不通/重定向到首页的标记、HEAD 回退和结果缓存"""
+
+import time
+
+import pytest
+
+from fetch_engine import FetchEngine
+from link_checker import LinkChecker, flag_links, is_generic_root, link_state
+
+# (路径, 期望状态, 期望状态码, 期望标记)
+CASES = [
+    ('/article/1', 'ok', 200, None),
+    ('/', 'ok', 200, 'generic'),
+    ('/status/404', 'dead', 404, 'dead'),
+    ('/status/410', 'dead', 410, 'dead'),
+    ('/redirect?to=/article/2', 'ok', 200, None),
+    ('/redirect?to=/', 'ok', 200, 'redirected_to_root'),
+    ('/nohead/3', 'ok', 200, None),
+    ('/status/503', 'error', 503, 'unreachable'),
+    ('/hang', 'error', None, 'unreachable'),
+]
+
+
+@pytest.mark.parametrize('status, state', [
+    (200, 'ok'), (204, 'ok'), (301, 'ok'), (304, 'ok'),
+    (400, 'dead'), (403, 'dead'), (404, 'dead'), (410, 'dead'),
+    (429, 'error'), (500, 'error'), (503, 'error'),
+])
+def test_link_state(status, state):
+    assert link_state(status) == state
+
+
+@pytest.mark.parametrize('url, generic', [
+    ('https://www.hroot.com', True),
+    ('https://www.hroot.com/', True),
+    ('https://www.hroot.com/index.html', True),
+    ('https://www.hroot.com/?id=3', False),
+    ('https://www.hroot.com/d-1234.html', False),
+])
+def test_is_generic_root(url, generic):
+    assert is_generic_root(url) == generic
+
+
+@pytest.fixture
+def checker(tmp_path):
+    # 桩服务器只有一个主机，放宽单主机限速
+    engine = FetchEngine(timeout=1, max_workers=16, per_host=8, rate=1000, burst=1000)
+    checker = LinkChecker(engine=engine, cache_path=str(tmp_path / 'links.json'), timeout=1)
+    yield checker
+    engine.close()
+
+
+def test_check_all_classifies_and_flags(stub, checker):
+    urls = [stub + path for path, _, _, _ in CASES]
+    results = checker.check_all(urls)
+    flagged = flag_links([{'title': url, 'link': url} for url in urls], results)
+    reasons = {item['link']: reason for reason, items in flagged.items() for item in items}
+
+    for path, state, status, flag in CASES:
+        result = results[stub + path]
+        assert (result['state'], result['status'], reasons.get(stub + path)) == (state, status, flag), path
+    assert results[stub + '/redirect?to=/article/2']['final_url'] == stub + '/article/2'
+    assert results[stub + '/redirect?to=/article/2']['redirects'] == 1
+    assert results[stub + '/hang']['error'].startswith(('ReadTimeout', 'ConnectionError'))
+    assert checker.stats == {'checked': len(CASES), 'cached': 0, 'ok': 5, 'dead': 2, 'error': 2}
+
+
+def test_head_not_allowed_falls_back_to_get(stub, hits, checker):
+    result = checker.check(stub + '/nohead/fallback')
+    assert (result['state'], result['status']) == ('ok', 200)
+    # HEAD 得到 405 后用 GET 确认
+    assert hits['/nohead/fallback'] == 2
+
+
+def test_flag_links_without_results_only_flags_generic():
+    articles = [{'title': 'A', 'link': 'https://x.com/'}, {'title': 'B', 'link': 'https://x.com/a/1'}]
+    flagged = flag_links(articles)
+    assert flagged['generic'] == [{'title': 'A', 'link': 'https://x.com/'}]
+    assert not flagged['dead'] and not flagged['unreachable'] and not flagged['redirected_to_root']
+
+
+def test_results_are_cached_except_errors(stub, hits, checker, tmp_path):
+    urls = [stub + '/article/cached', stub + '/status/404?n=cached', stub + '/status/503?n=cached']
+    checker.check_all(urls)
+    checker.save()
+
+    again = LinkChecker(engine=checker.engine, cache_path=str(tmp_path / 'links.json'), timeout=1)
+    results = again.check_all(urls)
+    assert [results[url]['state'] for url in urls] == ['ok', 'dead', 'error']
+    assert hits['/article/cached'] == 1 and hits['/status/404?n=cached'] == 1
+    # 暂时性故障不缓存，下次运行重新检查
+    assert hits['/status/503?n=cached'] == 2
+    assert again.stats['cached'] == 2 and again.stats['checked'] == 1
+
+
+def test_dead_links_expire_sooner(stub, checker):
+    ok, dead = stub + '/article/ttl', stub + '/status/404?n=ttl'
+    checker.check_all([ok, dead])
+    for url in (ok, dead):
+        checker.cache[url]['checked'] = time.time() - checker.dead_ttl - 1
+    checker.check_all([ok, dead])
+    assert checker.stats['cached'] == 1 and checker.stats['checked'] == 3
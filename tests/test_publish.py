@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""publish：哈希文件名、gzip 旁路文件、旧版本只保留 KEEP 个、只改写本次渲染的页面的资源表"""
+
+import gzip
+import json
+import os
+import shutil
+
+import pytest
+
+import publish
+from publish import ASSETS_SLOT, PAGES, page_assets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    for page in PAGES:
+        shutil.copy(os.path.join(ROOT, page), tmp_path / page)
+    (tmp_path / 'data').mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_data(n):
+    articles = [{'title': f'人力资源数字化案例{i}', 'description': '描述' * 20, 'link': f'https://x/{i}'}
+                for i in range(n)]
+    with open('hr_news_data.json', 'w', encoding='utf-8') as f:
+        json.dump(articles, f, ensure_ascii=False, indent=2)
+    return articles
+
+
+def versions():
+    return sorted(name for name in os.listdir('data') if name.startswith('hr_news_data.') and name.endswith('.json'))
+
+
+def test_gzip_sidecar_round_trips(site):
+    articles = write_data(20)
+    stats = publish.publish('data', pages=['index.html'])
+    path = stats['assets']['data']
+    with open(path, 'rb') as f:
+        raw = f.read()
+    with gzip.open(path + '.gz', 'rb') as f:
+        assert f.read() == raw
+    assert json.loads(raw) == articles
+    assert os.path.basename(path) == publish.hashed_name('hr_news_data.json', raw)
+    assert 0 < stats['.gz'] < stats['raw']
+
+
+def test_prune_keeps_current_and_previous_version(site):
+    published = []
+    for n in range(1, 5):
+        write_data(n * 5)
+        published.append(os.path.basename(publish.publish('data', pages=PAGES)['assets']['data']))
+        # 拉开各版本的修改时间，清理按修改时间判断新旧
+        os.utime(os.path.join('data', published[-1]), (n, n))
+    assert publish.KEEP == 2
+    assert versions() == sorted(published[-2:])
+    assert not os.path.exists(os.path.join('data', published[0] + '.gz'))
+
+
+def test_only_rendered_page_gets_new_assets(site):
+    write_data(5)
+    first = publish.publish('data', pages=PAGES)['assets']
+    assert page_assets('index.html') == page_assets('ai_hr_weekly.html') == first
+
+    for n in (10, 15):
+        write_data(n)
+        os.utime(first['data'], (0, 0))
+        latest = publish.publish('data', pages=['index.html'])['assets']
+    assert page_assets('index.html') == latest
+    # 另一个页面没有重新渲染：资源表不变，它引用的旧文件也没有被清理
+    assert page_assets('ai_hr_weekly.html') == first
+    assert os.path.exists(first['data'])
+    with open('ai_hr_weekly.html', 'r', encoding='utf-8') as f:
+        assert f.read().count(ASSETS_SLOT[0]) == 1
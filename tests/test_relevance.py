@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""RelevanceScorer：命中互不重叠、numpy 与纯Python结果一致、描述参与打分；top_k 同分时保留靠前的"""
+
+import math
+
+import pytest
+
+from corpus import make_corpus
+from relevance import RelevanceScorer, top_k
+
+
+def test_overlapping_keywords_count_once():
+    scorer = RelevanceScorer(use_numpy=False)
+    counts = scorer.hits(['人工智能', '智能'])
+    hit = {scorer.vocab[row]: docs for row, docs in enumerate(counts) if docs}
+    assert hit == {'人工智能': {0: 1}, '智能': {1: 1}}
+
+
+def test_description_contributes_to_score():
+    scorer = RelevanceScorer(use_numpy=False)
+    scores, ai = scorer.score(['招聘新规', '招聘新规'], ['', '用人工智能筛选简历'])
+    assert scores[1] > scores[0] and ai == [False, True]
+
+
+def test_numpy_matches_pure_python():
+    pytest.importorskip('numpy')
+    corpus = make_corpus(500)
+    titles = [title for title, _ in corpus]
+    descriptions = [description for _, description in corpus]
+    expected, expected_ai = RelevanceScorer(use_numpy=False).score(titles, descriptions)
+    scores, ai = RelevanceScorer(use_numpy=True).score(titles, descriptions)
+    assert ai == expected_ai
+    assert all(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9) for a, b in zip(scores, expected))
+
+
+def test_top_k_keeps_earlier_items_on_ties():
+    items = ['a', 'b', 'c', 'd', 'e']
+    assert top_k(items, [1, 2, 2, 2, 0], 2) == [1, 2]
+    assert top_k(items, [1, 1, 1, 1, 1], 3) == [0, 1, 2]
+    # 分组：按组首次出现的顺序，组内得分从高到低
+    groups = {'a': 'x', 'b': 'y', 'c': 'x', 'd': 'y', 'e': 'x'}
+    assert top_k(items, [3, 1, 3, 1, 5], 2, group=groups.get) == [4, 0, 1, 3]
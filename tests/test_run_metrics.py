@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""RunMetrics：profile 模式下标签里的路径不影响采样文件，采样失败不让阶段失败"""
+
+import os
+
+from run_metrics import RunMetrics
+
+
+def test_profile_filename_is_sanitized(tmp_path):
+    metrics = RunMetrics('job', profile=True, profile_dir=str(tmp_path))
+    with metrics.span('build', hot=True, output='data/manifest.json'):
+        sum(range(1000))
+    assert os.listdir(tmp_path) == ['job_build_data_manifest.json.prof']
+    assert metrics.report()['spans'][0]['errors'] == 0
+
+
+def test_profile_failure_does_not_fail_stage(tmp_path):
+    blocker = tmp_path / 'not_a_dir'
+    blocker.write_text('')
+    metrics = RunMetrics('job', profile=True, profile_dir=str(blocker))
+    with metrics.span('build', hot=True):
+        pass
+    assert metrics.ok
+    assert metrics.report()['spans'][0]['errors'] == 0
+    assert metrics.profiles == {}
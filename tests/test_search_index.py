@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""搜索索引：doc_pos 必须指向周分片中的同一篇文章"""
+
+import json
+import os
+
+from article_store import ArticleStore
+from search_index import SearchIndex, build_index, week_segment
+from week_shards import export_shards, load_manifest
+
+
+def test_doc_pos_points_into_week_shard(tmp_path):
+    store = ArticleStore(':memory:', seed_json=None)
+    # 一次 upsert 写入：同批文章的 first_seen 完全相同
+    batch = []
+    for i in range(12):
+        week, date = ('2026年第9周', '2026年02月23日') if i % 3 else ('2026年第10周', '2026年03月02日')
+        batch.append({'title': f'人力资源数字化案例{i}', 'description': '', 'category': ('SSC', 'HRBP')[i % 2],
+                      'source': 'HRoot', 'link': f'https://x/{(i * 7) % 12:02d}', 'week': week, 'date': date})
+    store.upsert(batch)
+
+    out_dir = str(tmp_path / 'data')
+    export_shards(store, out_dir)
+    shards = {}
+    for entry in load_manifest(out_dir)['weeks']:
+        with open(os.path.join(out_dir, entry['file']), 'r', encoding='utf-8') as f:
+            shards[entry['key']] = json.load(f)
+
+    articles = store.query()
+    index = build_index(articles)
+    for doc_id, article in enumerate(articles):
+        week = index['weeks'][index['doc_week'][doc_id]]
+        assert shards[week][index['doc_pos'][doc_id]] == article
+
+    hits = SearchIndex(index).search('案例3')
+    assert [articles[i]['title'] for i in hits] == ['人力资源数字化案例3']
+    assert SearchIndex(index).search('案例3', week='2026年第10周') == hits
+    assert SearchIndex(index).search('案例3', week='2026-W09') == []
+    store.close()
+
+
+def test_write_index_only_reindexes_changed_weeks(tmp_path, monkeypatch):
+    import search_index
+
+    store = ArticleStore(':memory:', seed_json=None)
+    store.upsert([{'title': f'招聘案例{i}', 'description': '智能面试', 'category': ('SSC', 'HRBP')[i % 2],
+                   'source': 'HRoot', 'link': f'https://x/{i}', 'week': f'2026年第{8 + i % 3}周',
+                   'date': ''} for i in range(9)])
+    filename = str(tmp_path / 'search_index.json')
+    search_index.write_index(store, filename)
+
+    store.upsert([{'title': '薪酬案例', 'description': '', 'category': 'SSC', 'source': 'HRoot',
+                   'link': 'https://x/new', 'week': '2026年第9周', 'date': ''}])
+    segmented = []
+    monkeypatch.setattr(search_index, 'week_segment',
+                        lambda articles: segmented.append(articles[0]['week']) or week_segment(articles))
+    assert search_index.write_index(store, filename) == 10
+    assert segmented == ['2026年第9周']
+    with open(filename, 'r', encoding='utf-8') as f:
+        assert json.load(f) == build_index(store.query())
+    store.close()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""WeekKey / TimeIndex：按数字键排序和区间查询，无法识别的端点报错"""
+
+import pytest
+
+from week_index import TimeIndex, WeekKey, week_code, week_label
+
+
+def test_week_key_round_trip():
+    key = WeekKey.parse('2026年第9周')
+    assert key == WeekKey.parse('2026-W09') == WeekKey.from_ordinal(202609)
+    assert (key.code, key.label) == ('2026-W09', '2026年第9周')
+    assert (week_code(None), week_label(None)) == ('unknown', '未分类')
+
+
+def test_range_spans_years_and_rejects_bad_endpoints():
+    index = TimeIndex()
+    for week in ('2025年第52周', '2026年第1周', '2026年第10周'):
+        index.add(week, 'SSC', 'HRoot')
+    assert [p.key for p in index.range('2025-W52', WeekKey(2026, 1))] == [WeekKey(2025, 52), WeekKey(2026, 1)]
+    assert len(index.range()) == 3
+    for bad in ('第9周', 202609):
+        with pytest.raises(ValueError):
+            index.range(bad, None)
+        with pytest.raises(ValueError):
+            index.range(None, bad)
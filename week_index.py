@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按周的时间索引
+WeekKey：(ISO年, ISO周) 数字键，比较和排序都按数字进行；'2026年第9周' 这样的显示文字由键生成，
+  不再直接拿字符串当键（字符串排序会把第10周排在第9周前面）
+  存档、周分片清单和搜索索引都按 WeekKey（存档里是 ordinal，文件里是 code）分组，显示文字只在渲染时生成；
+  无法识别周的文章归入 code 为 'unknown' 的一组
+TimeIndex：每周一个分区，预先算好篇数和分类/来源计数；按键 O(1) 取某一周，
+  在排好序的键上二分做跨年的区间扫描。存档的 time_index() 缓存一份，分片清单的计数和最新一周都从它取
+"""
+
+import bisect
+import re
+from collections import Counter, namedtuple
+from datetime import date, datetime
+
+_WEEK_LABEL = re.compile(r'(\d{4})年第(\d{1,2})周')
+_WEEK_CODE = re.compile(r'^(\d{4})-W(\d{2})$')
+UNKNOWN_CODE = 'unknown'
+UNKNOWN_LABEL = '未分类'
+
+
+class WeekKey(namedtuple('WeekKey', ['year', 'week'])):
+    """ISO 年和周序号；元组比较即时间先后"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_date(cls, day=None):
+        """某天所在的ISO周（年底/年初的几天可能属于相邻年份的周）"""
+        iso_year, iso_week, _ = (day or date.today()).isocalendar()
+        return cls(iso_year, iso_week)
+
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        """年*100+周 -> WeekKey；None（无法识别的周）原样返回 None"""
+        if ordinal is None:
+            return None
+        return cls(*divmod(int(ordinal), 100))
+
+    @classmethod
+    def parse(cls, value):
+        """'2026年第9周' / '2026-W09' / WeekKey -> WeekKey；无法识别时返回 None"""
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, str):
+            return None
+        match = _WEEK_LABEL.search(value) or _WEEK_CODE.match(value)
+        if not match or not 1 <= int(match.group(2)) <= 53:
+            return None
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    @property
+    def label(self):
+        """页面和数据中显示的文字"""
+        return f"{self.year}年第{self.week}周"
+
+    @property
+    def code(self):
+        """'2026-W09'，用作文件名前缀"""
+        return f"{self.year}-W{self.week:02d}"
+
+    @property
+    def ordinal(self):
+        """年*100+周，存档中的整数列，按数字比较与时间顺序一致"""
+        return self.year * 100 + self.week
+
+    def monday(self):
+        return date.fromisocalendar(self.year, self.week, 1)
+
+
+def week_info(now=None, week_start=False):
+    """当前周的 (显示文字, 日期)；week_start 为真时日期取本周一"""
+    now = now or datetime.now()
+    key = WeekKey.from_date(now.date() if isinstance(now, datetime) else now)
+    day = key.monday() if week_start else now
+    return key.label, day.strftime('%Y年%m月%d日')
+
+
+def date_week(text):
+    """'2026年03月02日' 这样的日期文字 -> 那天所在的ISO周；无法识别时返回 None"""
+    try:
+        return WeekKey.from_date(datetime.strptime(text, '%Y年%m月%d日').date())
+    except (TypeError, ValueError):
+        return None
+
+
+def week_code(key):
+    """WeekKey -> 文件名和清单用的 code；None 为 'unknown'"""
+    return key.code if key else UNKNOWN_CODE
+
+
+def week_label(key):
+    """WeekKey -> 显示文字；None 为 '未分类'"""
+    return key.label if key else UNKNOWN_LABEL
+
+
+def week_ordinal(label):
+    """显示文字 -> 整数键；无法识别时返回 None"""
+    key = WeekKey.parse(label)
+    return key.ordinal if key else None
+
+
+def sort_key(label):
+    """按时间排序的键；无法识别的周排在最前（降序时排在最后）"""
+    key = WeekKey.parse(label)
+    return (key is not None, key or ())
+
+
+class WeekPartition:
+    """一周的分区：篇数和分类/来源计数，随文章加入时更新"""
+
+    __slots__ = ('key', 'date', 'count', 'categories', 'sources')
+
+    def __init__(self, key, date=''):
+        self.key = key
+        self.date = date
+        self.count = 0
+        self.categories = Counter()
+        self.sources = Counter()
+
+    @property
+    def label(self):
+        return self.key.label
+
+    def add(self, category, source, date='', n=1):
+        self.count += n
+        self.categories[category or ''] += n
+        self.sources[source or ''] += n
+        if date and not self.date:
+            self.date = date
+
+    def __repr__(self):
+        return f"WeekPartition({self.key.code if self.key else None}, count={self.count})"
+
+
+class TimeIndex:
+    """WeekKey -> WeekPartition；keys 保持升序，用于区间扫描。无法识别周的文章只计数"""
+
+    def __init__(self):
+        self.partitions = {}
+        self.keys = []
+        self.unknown = 0
+
+    @classmethod
+    def from_articles(cls, articles):
+        index = cls()
+        for article in articles:
+            index.add(article.get('week'), article.get('category'), article.get('source'), article.get('date'))
+        return index
+
+    def add(self, week, category, source, date='', n=1):
+        key = WeekKey.parse(week)
+        if key is None:
+            self.unknown += n
+            return None
+        partition = self.partitions.get(key)
+        if partition is None:
+            partition = self.partitions[key] = WeekPartition(key)
+            bisect.insort(self.keys, key)
+        partition.add(category, source, date, n)
+        return partition
+
+    def get(self, week):
+        """按 WeekKey 或显示文字取一周的分区，没有时返回 None"""
+        key = WeekKey.parse(week)
+        return self.partitions.get(key) if key else None
+
+    def range(self, start=None, end=None):
+        """[start, end] 闭区间内的分区，从旧到新；端点可以是 WeekKey、显示文字或 code，None 表示不限"""
+        lo_key, hi_key = (None if w is None else WeekKey.parse(w) for w in (start, end))
+        if (start is not None and lo_key is None) or (end is not None and hi_key is None):
+            raise ValueError(f"无法识别的周区间: {(start, end)!r}")
+        lo = bisect.bisect_left(self.keys, lo_key) if lo_key is not None else 0
+        hi = bisect.bisect_right(self.keys, hi_key) if hi_key is not None else len(self.keys)
+        return [self.partitions[key] for key in self.keys[lo:hi]]
+
+    def latest(self):
+        return self.partitions[self.keys[-1]] if self.keys else None
+
+    def weeks(self):
+        """所有周的显示文字，从新到旧"""
+        return [key.label for key in reversed(self.keys)]
+
+    def total(self):
+        return sum(p.count for p in self.partitions.values()) + self.unknown
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, week):
+        return self.get(week) is not None
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按周分片导出
+每周一个压缩JSON分片（文件名带内容哈希）加一个小的 manifest.json，
+页面先加载最新一周，更早的周按需获取；没变化的分片文件名和哈希保持不变。
+清单按 WeekKey.code 记录每一周（无法识别的周为 'unknown'），篇数和分类/来源计数取自 store.time_index()
+"""
+
+import hashlib
+import json
+import os
+
+from site_renderer import write_atomic
+from week_index import UNKNOWN_CODE, WeekKey, WeekPartition, week_code, week_label
+
+MANIFEST = 'manifest.json'
+
+
+def week_key(label):
+    """'2026年第9周' -> '2026-W09'，用作分片文件名前缀"""
+    return week_code(WeekKey.parse(label))
+
+
+def latest_week(store):
+    """存档中最新的一周（WeekKey），没有可识别的周时为 None"""
+    latest = store.time_index().latest()
+    return latest.key if latest else None
+
+
+def shard_bytes(articles):
+    return json.dumps(articles, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_shards(store, out_dir='data', weeks=None):
+    """导出周分片。weeks 为需要重新导出的周（WeekKey，None 为无法识别的周；默认全部）；
+    返回实际改写的分片数"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    if manifest is None:
+        weeks = None
+    entries = {e['key']: e for e in (manifest or {}).get('weeks', [])}
+    archived = {week_code(key): key for key in store.weeks()}
+    targets = set(archived) if weeks is None else {week_code(WeekKey.parse(w)) for w in weeks}
+    index = store.time_index()
+
+    written = 0
+    for code in targets:
+        old = entries.pop(code, None)
+        if code not in archived:
+            if old:
+                _remove(out_dir, old['file'])
+            continue
+
+        key = archived[code]
+        articles = store.query(week=code)
+        data = shard_bytes(articles)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        filename = f"{code}.{digest}.json"
+        if not os.path.exists(os.path.join(out_dir, filename)):
+            with open(os.path.join(out_dir, filename + '.tmp'), 'wb') as f:
+                f.write(data)
+            os.replace(os.path.join(out_dir, filename + '.tmp'), os.path.join(out_dir, filename))
+            written += 1
+        if old and old['file'] != filename:
+            _remove(out_dir, old['file'])
+
+        counts = index.get(key) if key else None
+        if counts is None:
+            # 无法识别的周在时间索引里只有总数，分类/来源从分片文章里数
+            counts = WeekPartition(key)
+            for article in articles:
+                counts.add(article['category'], article['source'], article.get('date'))
+        entries[code] = {
+            'week': week_label(key),
+            'key': code,
+            'date': counts.date,
+            'count': counts.count,
+            'categories': dict(counts.categories),
+            'sources': dict(counts.sources),
+            'hash': digest,
+            'file': filename,
+        }
+
+    # 存档里已没有的周从清单中移除
+    for code in [c for c in entries if c not in archived]:
+        _remove(out_dir, entries.pop(code)['file'])
+
+    manifest = {
+        'version': 1,
+        'total': sum(e['count'] for e in entries.values()),
+        'weeks': sorted(entries.values(), key=lambda e: _order(e['key']), reverse=True),
+    }
+    write_atomic(os.path.join(out_dir, MANIFEST),
+                 json.dumps(manifest, ensure_ascii=False, separators=(',', ':')))
+    return written
+
+
+def _order(code):
+    """清单排序：按 WeekKey 从新到旧，'unknown' 排在最后"""
+    key = WeekKey.parse(code) if code != UNKNOWN_CODE else None
+    return (key is not None, key or ())
+
+
+def _remove(out_dir, filename):
+    try:
+        os.remove(os.path.join(out_dir, filename))
+    except OSError:
+        pass